@@ -0,0 +1,57 @@
+"""
+Benchmarks Ray cluster bring-up on one machine by emulating a SLURM allocation of
+N nodes with :class:`interop.utils.launcher.LocalLauncher`.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/cluster_bringup.py --nodes 1 2 4 --repeat 3 > bringup.jsonl
+
+Each run prints one JSON record with the number of nodes, the time until all nodes
+registered with the cluster (time_to_ready), and the teardown time (in seconds).
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from interop.utils.cluster import RayCluster
+from interop.utils.launcher import LocalLauncher
+
+
+def bringup(num_nodes: int, timeout: float) -> dict:
+    cluster = RayCluster(launcher=LocalLauncher(num_nodes), timeout=timeout)
+
+    start = time.perf_counter()
+    cluster.start()
+    ready = time.perf_counter()
+    cluster.shutdown()
+    down = time.perf_counter()
+
+    return {
+        "benchmark": "cluster_bringup",
+        "nodes": num_nodes,
+        "time_to_ready": ready - start,
+        "teardown": down - ready,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args(argv)
+
+    for num_nodes in args.nodes:
+        for _ in range(args.repeat):
+            print(json.dumps(bringup(num_nodes, args.timeout)), flush=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmarks the dispatch overhead of :meth:`ComponentRoot.compute`, i.e. the time spent
+outside the execute function of a component returning its input (an :class:`InputProc`).
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/compute_overhead.py --number 20000
+
+Prints one JSON record per case with the mean time per call (in microseconds), and the
+overhead over calling the execute function directly. Cases cover model and dict inputs,
+validated execution requirements, result cache hits and enabled instrumentation.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Callable, Dict
+
+from interop.models import InputProc
+from interop.utils.decorators import component
+from interop.utils.instrument import MemorySink, instrumented
+
+INPUT = {
+    "id": "job-0",
+    "keywords": {"method": "b3lyp", "basis": "6-31g", "maxiter": 100},
+    "engine": "psi4",
+}
+
+
+def execute(input_model: InputProc, exec_req=None, **kwargs) -> InputProc:
+    return input_model
+
+
+def measure(func: Callable, number: int) -> float:
+    func()  # warm up
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def make_cases() -> Dict[str, Callable]:
+    Comp = component(execute)
+    Cached = component(cache=True)(execute)
+    model = InputProc(**INPUT)
+    exec_req = {"fail_soft": True}
+
+    return {
+        "direct": lambda: execute(model),
+        "model": lambda: Comp.compute(model),
+        "dict": lambda: Comp.compute(INPUT),
+        "exec_req": lambda: Comp.compute(model, exec_req),
+        "cache_hit": lambda: Cached.compute(model),
+        "instrumented": lambda: Comp.compute(model),  # measured with a MemorySink
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    times = {}
+    for case, func in make_cases().items():
+        if case == "instrumented":
+            with instrumented(MemorySink(), payload_sizes=False):
+                times[case] = measure(func, args.number)
+        else:
+            times[case] = measure(func, args.number)
+
+        print(
+            json.dumps(
+                {
+                    "benchmark": "compute_overhead",
+                    "case": case,
+                    "unit": "us",
+                    "time": times[case],
+                    "overhead": times[case] - times["direct"],
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmarks ``import interop`` in fresh interpreters and checks it against a time budget.
+Heavy optional dependencies (Ray, NumPy) are imported lazily, so they must not be
+loaded by the import.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/import_time.py --repeat 5 --budget 0.5
+
+Prints one JSON record with the median and min import time (in seconds), the slowest
+modules reported by ``python -X importtime``, and any heavy module that was imported.
+Exits with code 1 if the median exceeds the budget or a heavy module was imported.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Modules that must only be imported when used
+HEAVY_MODULES = ("ray", "numpy")
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def import_once(module: str) -> Tuple[float, List[str]]:
+    script = SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, check=True)
+    elapsed, heavy = out.stdout.decode().splitlines()
+    return float(elapsed), [name for name in heavy.split(",") if name]
+
+
+def slowest_modules(module: str, top: int) -> List[Tuple[str, float]]:
+    """Returns the `top` modules with the largest cumulative import time (in seconds)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+    )
+    times = []
+    for line in out.stderr.decode().splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        times.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(times, key=lambda item: item[1], reverse=True)[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="interop")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.5, help="Max median time (s)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    runs = [import_once(args.module) for _ in range(args.repeat)]
+    times = [elapsed for elapsed, _ in runs]
+    heavy = sorted({name for _, names in runs for name in names})
+    median = statistics.median(times)
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "import_time",
+                "module": args.module,
+                "median": median,
+                "min": min(times),
+                "budget": args.budget,
+                "heavy_modules": heavy,
+                "slowest": slowest_modules(args.module, args.top),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+            }
+        ),
+        flush=True,
+    )
+    return int(median > args.budget or bool(heavy))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Measures the memory held per procedure record, for :class:`OutputProc` records nesting an
+:class:`InputProc` against their lean variants (:class:`LeanOutputProc`).
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/record_memory.py --records 100000
+
+Prints one JSON record per model with the bytes allocated per record (``tracemalloc``),
+and the reduction of the lean variant.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from typing import Type
+
+from interop.models import (
+    DataModel,
+    InputProc,
+    LeanInputProc,
+    LeanOutputProc,
+    OutputProc,
+)
+
+
+def bytes_per_record(Output: Type[DataModel], Input: Type[DataModel], records: int) -> float:
+    tracemalloc.start()
+    try:
+        data = [
+            Output(success=True, stdout="", proc_input=Input(id=str(index)))
+            for index in range(records)
+        ]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del data
+    return size / records
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    default = bytes_per_record(OutputProc, InputProc, args.records)
+    lean = bytes_per_record(LeanOutputProc, LeanInputProc, args.records)
+    for name, size in (("OutputProc", default), ("LeanOutputProc", lean)):
+        print(
+            json.dumps(
+                {
+                    "benchmark": "record_memory",
+                    "model": name,
+                    "records": args.records,
+                    "bytes_per_record": size,
+                    "reduction": 1 - size / default,
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmarks the task throughput of :meth:`ComponentRay.compute_remote` on a local Ray
+cluster, for trivial components fed with inputs carrying payloads of increasing size.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/remote_throughput.py --tasks 1000 --payload-bytes 0 1048576
+
+Prints one JSON record per submission mode and payload size with the wall time per task
+(in microseconds) and the throughput (tasks per second). Modes are ``compute_remote``
+(submit all, then wait) and ``compute_remote_iter`` (bounded submission window).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy
+import ray
+
+from interop.models import InputProc, OutputProc
+from interop.utils.decorators import component
+
+
+def execute(input_model: InputProc, exec_req=None, **kwargs) -> OutputProc:
+    return OutputProc(success=True)
+
+
+def make_inputs(tasks: int, payload_bytes: int) -> List[Dict[str, Any]]:
+    payload = numpy.zeros(payload_bytes, dtype=numpy.uint8)
+    return [{"id": str(index), "extras": {"payload": payload}} for index in range(tasks)]
+
+
+def run(mode: str, Comp: Any, inputs: List[Dict[str, Any]], window: int) -> float:
+    start = time.perf_counter()
+    if mode == "compute_remote":
+        outputs = ray.get([Comp.compute_remote(input_data) for input_data in inputs])
+    else:
+        outputs = list(Comp.compute_remote_iter(inputs, max_in_flight=window))
+    assert len(outputs) == len(inputs) and all(output.success for output in outputs)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--payload-bytes", type=int, nargs="+", default=[0, 1 << 20])
+    parser.add_argument("--num-cpus", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    ray.init(num_cpus=args.num_cpus, include_dashboard=False, log_to_driver=False)
+    try:
+        Comp = component(ctype="ray", num_cpus=1)(execute)
+        window = 2 * args.num_cpus
+        run("compute_remote", Comp, make_inputs(args.num_cpus, 0), window)  # start workers
+
+        for payload_bytes in args.payload_bytes:
+            inputs = make_inputs(args.tasks, payload_bytes)
+            for mode in ("compute_remote", "compute_remote_iter"):
+                elapsed = run(mode, Comp, inputs, window)
+                print(
+                    json.dumps(
+                        {
+                            "benchmark": "remote_throughput",
+                            "mode": mode,
+                            "payload_bytes": payload_bytes,
+                            "tasks": args.tasks,
+                            "num_cpus": args.num_cpus,
+                            "unit": "us",
+                            "time": elapsed / args.tasks * 1e6,
+                            "throughput": args.tasks / elapsed,
+                            "ray": ray.__version__,
+                            "python": platform.python_version(),
+                            "machine": platform.machine(),
+                        }
+                    ),
+                    flush=True,
+                )
+    finally:
+        ray.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Runs the benchmark suite, one process per benchmark, and collects their JSON records in
+one JSON lines file tagged with the commit and time of the run. Regressions are reported
+against the records of a previous run (e.g. of the last release) given as baseline.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/run.py --output results.jsonl
+   $ python benchmarks/run.py --baseline results.jsonl --tolerance 0.25
+
+Every benchmark runs offline on one machine, Ray benchmarks on a local cluster. Exits
+with status 1 if a benchmark failed or a metric regressed beyond the tolerance, i.e. is
+more than (1 + tolerance) times its baseline, all metrics being lower-is-better. Records
+are matched by benchmark and parameters, so baselines must come from the same machine
+and options (e.g. ``--quick``).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    Benchmark script run by the suite.
+
+    Parameters
+    ----------
+    name: str
+        Name of the script (without extension) and of its records.
+    keys: tuple[str]
+        Fields identifying a record of the benchmark, e.g. the case and payload size.
+    metrics: tuple[str]
+        Lower-is-better fields compared against the baseline.
+    args: tuple[str]
+        Command line args of the full run.
+    quick_args: tuple[str]
+        Command line args of the quick run (``--quick``).
+    """
+
+    name: str
+    keys: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    args: Tuple[str, ...] = ()
+    quick_args: Tuple[str, ...] = ()
+
+    def command(self, quick: bool) -> List[str]:
+        args = self.quick_args if quick else self.args
+        return [sys.executable, str(BENCHMARKS_DIR / f"{self.name}.py"), *args]
+
+    def key(self, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (self.name, *(record.get(key) for key in self.keys))
+
+
+SUITE = (
+    Benchmark("import_time", ("module",), ("median",), quick_args=("--repeat", "3")),
+    Benchmark("compute_overhead", ("case",), ("time",), quick_args=("--number", "2000")),
+    Benchmark(
+        "trusted_models",
+        ("case", "size"),
+        ("validated", "trusted"),
+        quick_args=("--number", "200", "--sizes", "0", "100"),
+    ),
+    Benchmark(
+        "record_memory", ("model",), ("bytes_per_record",), quick_args=("--records", "10000")
+    ),
+    Benchmark("serialize_arrays", ("atoms",), ("time",), quick_args=("--atoms", "10", "100")),
+    Benchmark(
+        "starmap_scaling",
+        ("workers", "tasks"),
+        ("time",),
+        quick_args=("--workers", "1", "2", "--tasks", "8", "--work", "50000"),
+    ),
+    Benchmark(
+        "remote_throughput",
+        ("mode", "payload_bytes", "tasks"),
+        ("time",),
+        quick_args=("--tasks", "100"),
+    ),
+    Benchmark(
+        "cluster_bringup",
+        ("nodes",),
+        ("time_to_ready",),
+        args=("--nodes", "1", "2"),
+        quick_args=("--nodes", "1"),
+    ),
+)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(benchmark: Benchmark, quick: bool, timeout: float) -> List[Dict[str, Any]]:
+    """Runs `benchmark`, returning its records, or a record with the error if it failed."""
+    try:
+        proc = subprocess.run(
+            benchmark.command(quick), capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return [{"benchmark": benchmark.name, "error": f"timed out after {timeout} s"}]
+
+    records = [json.loads(line) for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1:] or [f"exit status {proc.returncode}"]
+        records.append({"benchmark": benchmark.name, "error": error[0]})
+    return records
+
+
+def compare(
+    records: Iterable[Dict[str, Any]], baseline: Iterable[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Returns a description of the metrics of `records` that regressed from `baseline`."""
+    suite = {benchmark.name: benchmark for benchmark in SUITE}
+    previous = {
+        suite[record["benchmark"]].key(record): record
+        for record in baseline
+        if record.get("benchmark") in suite and "error" not in record
+    }
+
+    regressions = []
+    for record in records:
+        benchmark = suite.get(record.get("benchmark"))
+        base = benchmark and previous.get(benchmark.key(record))
+        if not base:
+            continue
+        for metric in benchmark.metrics:
+            value, reference = record.get(metric), base.get(metric)
+            if value is not None and reference and value > reference * (1 + tolerance):
+                regressions.append(
+                    f"{' '.join(map(str, benchmark.key(record)))} {metric}: "
+                    f"{reference:.4g} -> {value:.4g} (+{value / reference - 1:.0%})"
+                )
+    return regressions
+
+
+def read_jsonl(path: str) -> List[Dict[str, Any]]:
+    with open(path) as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    names = [benchmark.name for benchmark in SUITE]
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", nargs="+", choices=names, help="Benchmarks to run")
+    parser.add_argument("--skip", nargs="+", choices=names, default=[])
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes, e.g. for CI")
+    parser.add_argument("--output", help="JSON lines file to write (default stdout)")
+    parser.add_argument("--baseline", help="JSON lines file of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=1800, help="Per benchmark (s)")
+    args = parser.parse_args(argv)
+
+    run_info = {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+    output = open(args.output, "w") if args.output else sys.stdout
+    records = []
+    try:
+        for benchmark in SUITE:
+            if benchmark.name in args.skip or (args.only and benchmark.name not in args.only):
+                continue
+            print(f"Running {benchmark.name}...", file=sys.stderr, flush=True)
+            for record in run(benchmark, args.quick, args.timeout):
+                record = {**record, **run_info, "quick": args.quick}
+                records.append(record)
+                print(json.dumps(record), file=output, flush=True)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    failed = [record for record in records if "error" in record]
+    for record in failed:
+        print(f"FAILED {record['benchmark']}: {record['error']}", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        regressions = compare(records, read_jsonl(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Benchmarks :func:`interop.utils.serialization.serialize` on array-heavy outputs: an
+:class:`OutputProc` whose extras hold a geometry (N x 3 floats), charges (N ints) and a
+Hessian block (N x N floats capped at 1000 x 1000), e.g. the results of an engine run.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/serialize_arrays.py --atoms 10 1000 10000
+
+Prints one JSON record per number of atoms with the time to dump the model and serialize
+it to JSON (in milliseconds), the size of the JSON text (in bytes), and the throughput
+(in MB/s of array data).
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import numpy
+
+from interop.models import InputProc, OutputProc
+from interop.utils.serialization import serialize
+
+
+def make_output(atoms: int) -> OutputProc:
+    rng = numpy.random.default_rng(0)
+    block = min(atoms, 1000)
+    return OutputProc(
+        proc_input=InputProc(id="job-0", engine="psi4"),
+        success=True,
+        stdout="converged\n",
+        extras={
+            "geometry": rng.random((atoms, 3)),
+            "charges": rng.integers(0, 100, atoms),
+            "hessian": rng.random((block, block)),
+        },
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--atoms", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for atoms in args.atoms:
+        output = make_output(atoms)
+        array_bytes = sum(value.nbytes for value in output.extras.values())
+
+        def dump():
+            return serialize(output.model_dump(), "json")
+
+        text = dump()
+        number = max(1000 // atoms, 1)
+        time = min(timeit.repeat(dump, number=number, repeat=args.repeat)) / number
+        print(
+            json.dumps(
+                {
+                    "benchmark": "serialize_arrays",
+                    "atoms": atoms,
+                    "unit": "ms",
+                    "time": time * 1e3,
+                    "json_bytes": len(text),
+                    "throughput": array_bytes / time / 1e6,
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
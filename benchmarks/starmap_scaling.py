@@ -0,0 +1,74 @@
+"""
+Benchmarks the scaling of :func:`interop.utils.parallel.starmap_async` with the number of
+worker processes, on CPU-bound tasks that return a small array.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/starmap_scaling.py --workers 1 2 4 --tasks 64 --work 200000
+
+Prints one JSON record per number of workers with the wall time (in seconds), including
+the pool start-up, the speedup over the first number of workers (one by default), and
+the parallel efficiency. Speedups are bounded by the number of CPUs, reported as ``cpus``.
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+
+import numpy
+
+from interop.utils.parallel import starmap_async
+
+
+def task(seed: int, work: int) -> numpy.ndarray:
+    values = numpy.random.default_rng(seed).random(1000)
+    total = 0.0
+    for index in range(work):
+        total += index * 0.5
+    return values + total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--work", type=int, default=200000, help="Loop iterations per task")
+    args = parser.parse_args(argv)
+
+    inputs = [(seed,) for seed in range(args.tasks)]
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        outputs = starmap_async(task, inputs, num_workers=workers, work=args.work)
+        elapsed = time.perf_counter() - start
+        assert len(outputs) == args.tasks
+
+        baseline = baseline or (elapsed, workers)
+        speedup = baseline[0] / elapsed
+        print(
+            json.dumps(
+                {
+                    "benchmark": "starmap_scaling",
+                    "workers": workers,
+                    "tasks": args.tasks,
+                    "unit": "s",
+                    "time": elapsed,
+                    "speedup": speedup,
+                    "efficiency": speedup * baseline[1] / workers,
+                    "cpus": multiprocessing.cpu_count(),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Benchmarks building nested models such as :class:`OutputProc` with full validation against
+the trusted path (``DataModel.construct_trusted``), and the overhead of a trivial
+component fed with dicts with and without ``trusted``.
+
+Usage:
+
+.. code-block:: bash
+
+   $ python benchmarks/trusted_models.py --number 2000 --sizes 0 100 10000
+
+Prints one JSON record per case and payload size (number of keywords and extras) with
+the mean time per call (in microseconds) for the validated and trusted paths, and the
+speedup. Validation of small flat models is done natively by pydantic-core, so trusted
+construction pays off with nested models, copied defaults and large payloads.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Any, Callable, Dict
+
+from interop.models import InputProc, OutputProc, Provenance, ResourceUsage
+from interop.utils.decorators import component
+
+PROVENANCE = {"creator": "interop", "version": "1.0", "routine": "bench"}
+
+
+def make_fields(size: int) -> Dict[str, Any]:
+    payload = {f"key{index}": float(index) for index in range(size)}
+    return {
+        "proc_input": {
+            "id": "job-0",
+            "keywords": {"method": "b3lyp", "basis": "6-31g", **payload},
+            "provenance": PROVENANCE,
+            "engine": "psi4",
+        },
+        "stdout": "converged\n" * 100,
+        "resources": {"wall_time": 1.5, "user_time": 1.2, "max_rss": 1 << 20},
+        "success": True,
+        "provenance": PROVENANCE,
+        "extras": payload,
+    }
+
+
+def validated(fields: Dict[str, Any]) -> OutputProc:
+    return OutputProc(**fields)
+
+
+def trusted(fields: Dict[str, Any]) -> OutputProc:
+    proc_input = fields["proc_input"]
+    return OutputProc.construct_trusted(
+        **{
+            **fields,
+            "proc_input": InputProc.construct_trusted(
+                **{**proc_input, "provenance": Provenance.construct_trusted(**PROVENANCE)}
+            ),
+            "resources": ResourceUsage.construct_trusted(**fields["resources"]),
+            "provenance": Provenance.construct_trusted(**PROVENANCE),
+        }
+    )
+
+
+def compute(fields: Dict[str, Any], is_trusted: bool) -> Callable:
+    @component(in_model=InputProc, out_model=OutputProc, trusted=is_trusted)
+    def identity(input_model, exec_req=None, **kwargs):
+        return {"proc_input": input_model, "success": True}
+
+    return lambda: identity.compute(fields["proc_input"])
+
+
+def measure(func: Callable, number: int) -> float:
+    func()  # warm up
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 100, 10000])
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        fields = make_fields(size)
+        assert trusted(fields) == validated(fields)
+
+        cases: Dict[str, Dict[str, Callable]] = {
+            "output_proc": {
+                "validated": lambda: validated(fields),
+                "trusted": lambda: trusted(fields),
+            },
+            "compute": {"validated": compute(fields, False), "trusted": compute(fields, True)},
+        }
+        number = max(args.number // max(size // 100, 1), 10)
+        for case, funcs in cases.items():
+            times = {name: measure(func, number) for name, func in funcs.items()}
+            print(
+                json.dumps(
+                    {
+                        "benchmark": "trusted_models",
+                        "case": case,
+                        "size": size,
+                        "unit": "us",
+                        **times,
+                        "speedup": times["validated"] / times["trusted"],
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                    }
+                ),
+                flush=True,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,375 @@
+import functools
+import os
+import pickle
+import sys
+import threading
+from collections import Counter, OrderedDict
 from importlib import import_module
-from typing import Any, Callable, Dict, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from ..models import DataModel
-from ..models.req import ExecReq
+from ..models.req import ComputeReq, ExecReq, PlacementGroupReq
+from ..utils import instrument
+from ..utils.lazy import LazyModule, module_available
 from .component_root import ComponentRoot
 
-try:
-    import ray
-    import ray.dag
-except ModuleNotFoundError:
+# Ray takes seconds to import, so it is only imported once remote compute is used
+ray = LazyModule("ray", submodules=["dag", "experimental", "util.scheduling_strategies"])
+RAY_AVAILABLE = module_available("ray")
+
+if not RAY_AVAILABLE:
     import warnings
 
-    ray = None
     warnings.warn("Ray unavailable. Remote compute for ComponentRay is disabled.", stacklevel=1)
 
 
+# Min size (in bytes) of input objects on a node for locality to outweigh load balancing
+LOCALITY_MIN_BYTES = 1 << 20
+
+# Placement groups used by this process in the current Ray session, keyed by group spec
+# (bundles, strategy, name) so that tasks targeting different bundles share one group, with
+# whether this process created them
+_placement_groups: Dict[str, Tuple[Any, bool]] = {}
+_placement_groups_session: Optional[Tuple[str, str]] = None
+
+
+def _session_placement_groups() -> Dict[str, Tuple[Any, bool]]:
+    # handles of a previous session (e.g. before ray.shutdown()) are stale, so dropped
+    global _placement_groups_session
+    context = ray.get_runtime_context()
+    session = (context.get_node_id(), context.get_job_id())
+    if session != _placement_groups_session:
+        _placement_groups.clear()
+        _placement_groups_session = session
+    return _placement_groups
+
+
+def get_placement_group(spec: Union[PlacementGroupReq, Dict[str, Any]]) -> Any:
+    """
+    Returns the placement group matching `spec`, creating it on first use. Groups are reused
+    for identical bundles and strategy within a Ray session, and named groups are looked up
+    in the cluster first so that they can be shared across drivers. The group is not waited
+    on: tasks scheduled into it are queued until its bundles are reserved. Its bundles stay
+    reserved until :func:`release_placement_groups` or the end of the Ray job.
+    """
+    spec = PlacementGroupReq.model_validate(spec)
+    key = spec.model_dump_json(include={"bundles", "strategy", "name"})
+    groups = _session_placement_groups()
+
+    if key not in groups:
+        group, created = None, False
+        if spec.name:
+            try:
+                group = ray.util.get_placement_group(spec.name)
+            except ValueError:
+                pass
+        if group is None:
+            kwargs = {"name": spec.name} if spec.name else {}
+            group = ray.util.placement_group(spec.bundles, strategy=spec.strategy, **kwargs)
+            created = True
+        groups[key] = (group, created)
+
+    return groups[key][0]
+
+
+def release_placement_groups(
+    spec: Optional[Union[PlacementGroupReq, Dict[str, Any]]] = None,
+) -> int:
+    """
+    Removes the placement group matching `spec`, or all groups, created by this process in
+    the current Ray session (see :func:`get_placement_group`), which frees their bundles.
+    Named groups looked up in the cluster are forgotten but not removed, since other drivers
+    own them. Returns the number of removed groups.
+    """
+    groups = _session_placement_groups() if ray.is_initialized() else _placement_groups
+    if spec is None:
+        keys = list(groups)
+    else:
+        spec = PlacementGroupReq.model_validate(spec)
+        keys = [spec.model_dump_json(include={"bundles", "strategy", "name"})]
+
+    removed = 0
+    for key in keys:
+        group, created = groups.pop(key, (None, False))
+        if created and ray.is_initialized():
+            ray.util.remove_placement_group(group)
+            removed += 1
+    return removed
+
+
+def remote_options(compute_req: Union[ComputeReq, Dict[str, Any], None]) -> Dict[str, Any]:
+    """
+    Converts `compute_req` into options for ``ray.remote`` or ``.options``. A placement
+    group request becomes a scheduling strategy, which requires Ray to be initialized.
+    """
+    if compute_req is None:
+        return {}
+
+    compute_req = ComputeReq.model_validate(compute_req)
+    options = compute_req.model_dump(
+        exclude={"schema_name", "schema_version", "placement_group"}, exclude_unset=True
+    )
+
+    spec = compute_req.placement_group
+    if spec is not None:
+        strategies = ray.util.scheduling_strategies
+        options["scheduling_strategy"] = strategies.PlacementGroupSchedulingStrategy(
+            placement_group=get_placement_group(spec),
+            placement_group_bundle_index=spec.bundle_index,
+            placement_group_capture_child_tasks=spec.capture_child_tasks,
+        )
+    return options
+
+
+def locality_node(
+    refs: Sequence["ray.ObjectRef"], min_bytes: int = LOCALITY_MIN_BYTES
+) -> Optional[str]:
+    """
+    Returns the id of the node holding the most bytes of `refs`, or None if no node holds
+    at least `min_bytes` of them. Objects that are small enough to be inlined, or that
+    are not created yet, have no location and are ignored.
+    """
+    sizes = Counter()
+    for location in ray.experimental.get_object_locations(list(refs)).values():
+        for node_id in location.get("node_ids", []):
+            sizes[node_id] += location.get("object_size") or 0
+
+    if sizes:
+        node_id, size = sizes.most_common(1)[0]
+        if size >= min_bytes:
+            return node_id
+    return None
+
+
+def node_by_host(host: str) -> Optional[str]:
+    """Returns the id of the live node with hostname or IP address `host`, if any."""
+    for node in ray.nodes():
+        if node["Alive"] and host in (node["NodeManagerHostname"], node["NodeManagerAddress"]):
+            return node["NodeID"]
+    return None
+
+
+def affinity_options(exec_req: ExecReq, refs: Sequence["ray.ObjectRef"]) -> Dict[str, Any]:
+    """
+    Returns a soft node-affinity scheduling strategy targeting the node that holds `refs`,
+    or else the node of `exec_req.scratch_host`. Soft affinity falls back to any node if
+    the target node is dead or cannot fit the task.
+    """
+    node_id = locality_node(refs) if refs else None
+    if node_id is None and exec_req.scratch_host:
+        node_id = node_by_host(exec_req.scratch_host)
+
+    if node_id is None:
+        return {}
+    strategy = ray.util.scheduling_strategies.NodeAffinitySchedulingStrategy(node_id, soft=True)
+    return {"scheduling_strategy": strategy}
+
+
+def _nbytes(obj: Any) -> int:
+    """Returns the size of buffers (e.g. numpy arrays) or else of the pickled object."""
+    if isinstance(obj, (bytes, bytearray, memoryview, str)):
+        return len(obj)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def submit_bounded(
+    submit: Callable[[Any], "ray.ObjectRef"],
+    inputs: Iterable[Any],
+    *,
+    max_in_flight: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    sizeof: Callable[[Any], int] = _nbytes,
+    ordered: bool = False,
+) -> Iterator[Any]:
+    """
+    Submits `submit(item)` for each of `inputs` while keeping at most `max_in_flight`
+    tasks, holding at most `max_bytes` of inputs, pending at any time. Results are yielded
+    as tasks finish, and their refs are released right away, so driver and object store
+    memory stay bounded regardless of the number of inputs. `inputs` is consumed lazily.
+
+    Parameters
+    ----------
+    submit: Callable
+        Function submitting a single task and returning its ObjectRef.
+    inputs: Iterable
+        Inputs to submit, possibly a generator.
+    max_in_flight: int, optional
+        Max number of pending tasks. Defaults to twice the number of CPUs in the cluster.
+    max_bytes: int, optional
+        Max total size (in bytes) of the inputs of pending tasks, as measured by `sizeof`.
+        A single input larger than `max_bytes` is still submitted, on its own.
+    sizeof: Callable, optional
+        Returns the size of an input. Defaults to the size of buffers (e.g. numpy arrays)
+        or else of the pickled input.
+    ordered: bool, optional
+        Yield results in the order of `inputs` instead of completion order.
+
+    Returns
+    -------
+    Iterator
+        Results of the submitted tasks.
+
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * int(ray.cluster_resources().get("CPU", 1))
+
+    pending: Dict["ray.ObjectRef", int] = {}  # ref -> size, in submission order
+    pending_bytes = 0
+
+    def release() -> Any:
+        nonlocal pending_bytes
+        if ordered:
+            ref = next(iter(pending))
+        else:
+            (ref,), _ = ray.wait(list(pending), num_returns=1)
+        pending_bytes -= pending.pop(ref)
+        return ray.get(ref)
+
+    for item in inputs:
+        size = sizeof(item) if max_bytes else 0
+        while pending and (
+            len(pending) >= max_in_flight or (max_bytes and pending_bytes + size > max_bytes)
+        ):
+            yield release()
+        pending[submit(item)] = size
+        pending_bytes += size
+
+    while pending:
+        yield release()
+
+
+class WarmCache:
+    """
+    Thread-safe LRU cache of objects built in a (worker) process, e.g. component classes
+    and instances, bounded by number of entries and by (estimated) size in bytes.
+
+    Parameters
+    ----------
+    max_entries: int, optional
+        Max number of cached objects. Default 128.
+    max_bytes: int, optional
+        Max total size (in bytes) of cached objects, as measured by `sizeof`. Unbounded if
+        unset.
+    sizeof: Callable, optional
+        Returns the size of an object. Defaults to its pickled size, or ``sys.getsizeof``
+        for objects that cannot be pickled.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or self._sizeof
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: Any, factory: Callable[[], Any], sized: bool = True) -> Any:
+        """
+        Returns the object cached for `key`, building it with `factory` on a miss.
+        Objects created with `sized` False count as 0 bytes, e.g. classes shared with the
+        module that defines them.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+            self.misses += 1
+            value = factory()
+            size = self.sizeof(value) if sized and self.max_bytes is not None else 0
+            self._entries[key] = (value, size)
+            self._size += size
+            self._evict()
+            return value
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters, and the number and total size of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        # an entry larger than max_bytes is kept on its own until the next insertion
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_warm_cache() -> WarmCache:
+    """
+    Returns the per-process cache of meta components and their instances. Limits are read
+    from the env vars `INTEROP_WARM_CACHE_ENTRIES` and `INTEROP_WARM_CACHE_BYTES`, which
+    Ray workers can receive with ``runtime_env={"env_vars": {...}}``.
+    """
+    return WarmCache(
+        max_entries=_env_int("INTEROP_WARM_CACHE_ENTRIES") or 128,
+        max_bytes=_env_int("INTEROP_WARM_CACHE_BYTES"),
+    )
+
+
+def _trace_kwargs(cls: Type, input_data: Any, name: Optional[str] = None) -> Dict[str, Any]:
+    # traces the submission and passes the instrumentation context to the remote call
+    if not instrument.active_sinks():
+        return {}
+    if isinstance(input_data, ray.ObjectRef):
+        input_data = None  # not fetched on the driver
+    context = instrument.propagate(name or cls.trace_name, input_data)
+    return {"_trace_context": context}
+
+
 def compute_remote(
     cls: Type,
     exec_req: Optional[ExecReq] = None,
@@ -22,41 +377,49 @@ def compute_remote(
     def local_compute(
         input_data: cls.input,
         exec_req: Optional[ExecReq] = None,
+        _trace_context: Any = None,
         **kwargs: Optional[Dict[str, Any]],
     ) -> cls.output:
         """
         Ray does not support partial functions. So this
         function creates foo = partial(cls.compute, cls=cls).
         """
-        return cls.compute(input_data, exec_req, **kwargs)
+        with instrument.propagated(_trace_context):
+            return cls.compute(input_data, exec_req, **kwargs)
 
     exec_req = ExecReq.model_validate(exec_req)
 
-    remote_func = ray.remote(
-        **exec_req.compute_req.model_dump(
-            exclude={"schema_name", "schema_version"}, exclude_unset=True
-        )
-    )
+    # placement groups only exist once Ray is initialized, so they are applied per call
+    compute_req = exec_req.compute_req.model_copy(update={"placement_group": None})
+    remote_func = ray.remote(**remote_options(compute_req))
     return remote_func(local_compute)
 
 
 class ComponentRay(ComponentRoot):
+    # Execution requirements the remote function was created with
+    _exec_req: ClassVar[Optional[ExecReq]] = None
+
     @classmethod
     def compute_remote(  # pragma: no cover
         cls,
         input_data: Union[DataModel, Dict[str, Any]],
         exec_req: Optional[Union[ExecReq, Dict[str, Any]]] = None,
         **kwargs: Optional[Dict[str, Any]],
-    ) -> ray.ObjectRef:
+    ) -> "ray.ObjectRef":
         """
         Parameters
         ----------
         **kwargs: dict[str, any], optional
             Optional keyword args to pass to remote function
 
+        Notes
+        -----
+        With ``exec_req.locality`` set, the computation is pinned (softly) to the node that
+        holds the most bytes of the ObjectRefs passed as `input_data` or `kwargs`.
+
         """
 
-        if ray is None:
+        if not RAY_AVAILABLE:
             raise ModuleNotFoundError(
                 "Ray framework not installed. Solve by installing ray-default."
             )
@@ -66,17 +429,49 @@ class ComponentRay(ComponentRoot):
         ):  # no need for remote compute
             raise RuntimeError(f"_compute_remote method is not available in {cls.__name__}")
 
+        remote_func = cls._compute_remote
         if exec_req is not None:
             exec_req = ExecReq.model_validate(exec_req)
 
-            if exec_req.compute_req:
-                cls._compute_remote.options(
-                    **exec_req.compute_req.model_dump(
-                        exclude={"schema_name", "schema_version"}, exclude_unset=True
-                    )
-                )
+        refs = [arg for arg in (input_data, *kwargs.values()) if isinstance(arg, ray.ObjectRef)]
+        options = cls._remote_options(exec_req, refs)
+        if options:
+            remote_func = remote_func.options(**options)
 
-        return cls._compute_remote.remote(input_data, exec_req, **kwargs)
+        trace_kwargs = _trace_kwargs(cls, input_data)
+        return remote_func.remote(input_data, exec_req, **trace_kwargs, **kwargs)
+
+    @classmethod
+    def compute_remote_iter(
+        cls,
+        inputs: Iterable[Union[DataModel, Dict[str, Any]]],
+        exec_req: Optional[Union[ExecReq, Dict[str, Any]]] = None,
+        *,
+        max_in_flight: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ordered: bool = False,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> Iterator[DataModel]:
+        """
+        Computes `inputs` remotely through a bounded submission window, yielding outputs as
+        they finish. See :func:`submit_bounded` for the meaning of the window parameters.
+
+        Examples
+        --------
+        >>> for output in Comp.compute_remote_iter(inputs, max_in_flight=64):
+        ...     save(output)
+
+        """
+        if exec_req is not None:
+            exec_req = ExecReq.model_validate(exec_req)
+
+        return submit_bounded(
+            lambda input_data: cls.compute_remote(input_data, exec_req, **kwargs),
+            inputs,
+            max_in_flight=max_in_flight,
+            max_bytes=max_bytes,
+            ordered=ordered,
+        )
 
     def execute(
         self,
@@ -86,6 +481,23 @@ class ComponentRay(ComponentRoot):
     ) -> DataModel:
         raise NotImplementedError
 
+    @classmethod
+    def _remote_options(
+        cls, exec_req: Optional[ExecReq], refs: List["ray.ObjectRef"]
+    ) -> Dict[str, Any]:
+        options = {}
+        if exec_req is not None and exec_req.compute_req:
+            options = remote_options(exec_req.compute_req)
+        elif cls._exec_req is not None and cls._exec_req.compute_req.placement_group:
+            options = remote_options(
+                {"placement_group": cls._exec_req.compute_req.placement_group}
+            )
+
+        # placement groups take precedence over data locality
+        if exec_req is not None and exec_req.locality and "scheduling_strategy" not in options:
+            options.update(affinity_options(exec_req, refs))
+        return options
+
     @classmethod
     def _compute_remote(
         cls,
@@ -97,6 +509,13 @@ class ComponentRay(ComponentRoot):
 
 
 class MetaComponentRay(ComponentRay):  # pragma: no cover
+    # Remote functions keyed by execution requirements (JSON)
+    _remote_funcs: ClassVar[Dict[str, Callable]] = {}
+
+    def __init_subclass__(cls, **kwargs: Optional[Dict[str, Any]]) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._remote_funcs = {}
+
     @classmethod
     def _register(
         cls,
@@ -104,17 +523,32 @@ class MetaComponentRay(ComponentRay):  # pragma: no cover
     ) -> Callable:
         exec_req = ExecReq.model_validate(exec_req)
 
-        @ray.remote(
-            **exec_req.compute_req.model_dump(
-                exclude={"schema_name", "schema_version"}, exclude_unset=True
-            )
-        )
-        def dynamic_comp(input_data, exec_req, module, component, **kwargs):
-            # Create dynamic component from metaclass
-            mod = import_module(module)
-            comp = getattr(mod, component, None)
-            new_comp = cls._from_meta(cls=comp)
-            return new_comp.compute(input_data, exec_req, **kwargs)
+        # placement groups are bound to a Ray session, so their remote functions are not reused
+        if exec_req.compute_req is not None and exec_req.compute_req.placement_group:
+            return cls._build_remote(exec_req)
+
+        key = exec_req.model_dump_json()
+        if key not in cls._remote_funcs:
+            cls._remote_funcs[key] = cls._build_remote(exec_req)
+        return cls._remote_funcs[key]
+
+    @classmethod
+    def _build_remote(cls, exec_req: ExecReq) -> Callable:
+        @ray.remote(**remote_options(exec_req.compute_req))
+        def dynamic_comp(input_data, exec_req, module, component, _trace_context=None, **kwargs):
+            # Create dynamic component from metaclass, once per worker
+            def build():
+                comp = getattr(import_module(module), component, None)
+                return cls._from_meta(cls=comp)
+
+            warm_cache = get_warm_cache()
+            new_comp = warm_cache.get((cls, module, component), build)
+
+            instance = None
+            if exec_req is not None and ExecReq.model_validate(exec_req).reuse_instance:
+                instance = warm_cache.get((new_comp, "instance"), new_comp)
+            with instrument.propagated(_trace_context):
+                return new_comp.compute(input_data, exec_req, _instance=instance, **kwargs)
 
         return dynamic_comp
 
@@ -126,8 +560,11 @@ class MetaComponentRay(ComponentRay):  # pragma: no cover
         module: str = None,
         component: str = None,
         **kwargs: Optional[Dict[str, Any]],
-    ) -> ray.ObjectRef:
-        return cls._register(exec_req).remote(input_data, exec_req, module, component, **kwargs)
+    ) -> "ray.ObjectRef":
+        trace_kwargs = _trace_kwargs(cls, input_data, component)
+        return cls._register(exec_req).remote(
+            input_data, exec_req, module, component, **trace_kwargs, **kwargs
+        )
 
     @classmethod
     def bind(
@@ -137,5 +574,5 @@ class MetaComponentRay(ComponentRay):  # pragma: no cover
         module: str = None,
         component: str = None,
         **kwargs: Optional[Dict[str, Any]],
-    ) -> ray.dag.function_node.FunctionNode:
+    ) -> "ray.dag.function_node.FunctionNode":
         return cls._register(exec_req).bind(input_data, exec_req, module, component, **kwargs)
@@ -1,12 +1,31 @@
 import abc
-from typing import Any, Dict, Optional, Union
+import time
+import traceback
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type, Union
+
+from pydantic import ValidationError
 
 from ..common.decorators import classproperty
-from ..models import DataModel, RootModel
-from ..models.req import ExecReq
+from ..models import (
+    ComputeError,
+    DataModel,
+    FailedOperation,
+    RootModel,
+    debug_validation,
+)
+from ..models.req import ExecReq, RetryPolicy
+from ..utils import instrument
+from ..utils.hashing import content_hash
+from ..utils.memoize import ResultCache
 
 
 class ComponentRoot(RootModel, metaclass=abc.ABCMeta):
+    # Memoization of results, see ``@component(cache=...)``
+    _result_cache: ClassVar[Optional[ResultCache]] = None
+    _cache_id: ClassVar[Optional[str]] = None
+    # Skips validation of input and output data, see ``@component(trusted=...)``
+    _trusted: ClassVar[bool] = False
+
     @abc.abstractproperty
     @classproperty
     def input(cls):  # pragma: no cover
@@ -31,6 +50,8 @@ class ComponentRoot(RootModel, metaclass=abc.ABCMeta):
         cls,
         input_data: Union[DataModel, Dict[str, Any]],
         exec_req: Optional[ExecReq] = None,
+        *,
+        _instance: Optional["ComponentRoot"] = None,
         **kwargs: Optional[Dict[str, Any]],
     ) -> DataModel:
         """
@@ -55,7 +76,17 @@ class ComponentRoot(RootModel, metaclass=abc.ABCMeta):
         Returns
         -------
         output_data: DataModel
-            Validated output data object
+            Validated output data object, or a :class:`FailedOperation` record if the
+            computation failed and ``exec_req.fail_soft`` is set.
+
+        Notes
+        -----
+        Failed attempts are re-run according to ``exec_req.retry``. See :class:`RetryPolicy`.
+        Components with a result cache return cached outputs of identical (validated)
+        inputs and kwargs without executing. Trusted components, or ``exec_req.trusted``,
+        skip validation of dicts and model subclasses, see :meth:`DataModel.construct_trusted`.
+        Calls are timed by phase when instrumentation is enabled, see
+        :mod:`interop.utils.instrument`.
 
         """
 
@@ -63,18 +94,165 @@ class ComponentRoot(RootModel, metaclass=abc.ABCMeta):
             # pydantic always validates exec_req
             exec_req = ExecReq.model_validate(exec_req)
 
+        # internal: _instance is the (warm) instance of cls to execute, new by default
+        sinks = instrument.active_sinks()
+        if sinks:
+            return cls._compute_traced(sinks, input_data, exec_req, _instance, **kwargs)
+        return cls._compute_cached(input_data, exec_req, _instance, **kwargs)
+
+    @classproperty
+    def trace_name(cls) -> str:
+        """Name of the component in instrumentation traces."""
+        if cls._cache_id is None:
+            return cls.__qualname__
+        # without the version, nor the digest of local components
+        return cls._cache_id.rpartition(":")[0].partition("@")[0]
+
+    @classmethod
+    def _compute_traced(
+        cls,
+        _sinks: Tuple[instrument.Sink, ...],
+        input_data: Union[DataModel, Dict[str, Any]],
+        exec_req: Optional[ExecReq] = None,
+        _instance: Optional["ComponentRoot"] = None,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> DataModel:
+        with instrument.tracing(cls.trace_name, _sinks, input_data) as trace:
+            output_data = cls._compute_cached(input_data, exec_req, _instance, **kwargs)
+            trace.record_size("output", output_data)
+            if isinstance(output_data, FailedOperation):
+                trace.attributes["error"] = output_data.error.error_type
+            return output_data
+
+    @classmethod
+    def _compute_cached(
+        cls,
+        input_data: Union[DataModel, Dict[str, Any]],
+        exec_req: Optional[ExecReq] = None,
+        _instance: Optional["ComponentRoot"] = None,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> DataModel:
+        # returns cached outputs if the component has a result cache
+        cache = cls._result_cache
+        if cache is None:
+            return cls._compute_policy(input_data, exec_req, _instance, **kwargs)
+
+        try:
+            input_data = cls._parse(cls.input, input_data, exec_req)
+            key = content_hash(cls._cache_id or cls.__qualname__, input_data, kwargs)
+        except (ValidationError, TypeError):
+            # raised again, or captured in fail-soft mode, without caching
+            return cls._compute_policy(input_data, exec_req, _instance, **kwargs)
+
+        output_data = cache.get(key)
+        trace = instrument.current_trace()
+        if trace is not None:
+            trace.attributes["cache_hit"] = output_data is not None
+        if output_data is None:
+            output_data = cls._compute_policy(input_data, exec_req, _instance, **kwargs)
+            if not isinstance(output_data, FailedOperation):
+                cache.put(key, output_data)
+        return output_data
+
+    @classmethod
+    def _compute_policy(
+        cls,
+        input_data: Union[DataModel, Dict[str, Any]],
+        exec_req: Optional[ExecReq] = None,
+        _instance: Optional["ComponentRoot"] = None,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> DataModel:
+        # applies the retry policy and fail-soft mode of exec_req
+        if exec_req is None or not (exec_req.fail_soft or exec_req.retry):
+            return cls._compute(input_data, exec_req, _instance, **kwargs)
+
+        policy = exec_req.retry or RetryPolicy(max_attempts=1)
+        attempt = 1
+        while True:
+            try:
+                return cls._compute(input_data, exec_req, _instance, **kwargs)
+            except Exception as exc:
+                if policy.should_retry(exc, attempt):
+                    time.sleep(policy.wait_time(attempt))
+                    attempt += 1
+                    continue
+                if not exec_req.fail_soft:
+                    raise
+                return FailedOperation(
+                    input_data=input_data,
+                    error=ComputeError(
+                        error_type=type(exc).__name__, error_message=traceback.format_exc()
+                    ),
+                    extras={"attempts": attempt},
+                )
+
+    @classmethod
+    def _compute(
+        cls,
+        input_data: Union[DataModel, Dict[str, Any]],
+        exec_req: Optional[ExecReq] = None,
+        _instance: Optional["ComponentRoot"] = None,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> DataModel:
+        if instrument.current_trace() is not None:
+            return cls._compute_phased(input_data, exec_req, _instance, **kwargs)
+
         # validate input if required
-        if input_data.__class__ is not cls.input:
-            input_data = cls.input.model_validate(input_data)
+        input_data = cls._parse(cls.input, input_data, exec_req)
 
         # instantiate class
-        component = cls()
+        component = cls() if _instance is None else _instance
 
         # execute component
         output_data = component.execute(input_data, exec_req, **kwargs)
 
         # validate output if required
-        if output_data.__class__ is not cls.output:
-            output_data = cls.output.model_validate(output_data)
+        return cls._parse(cls.output, output_data, exec_req)
 
+    @classmethod
+    def _compute_phased(
+        cls,
+        input_data: Union[DataModel, Dict[str, Any]],
+        exec_req: Optional[ExecReq] = None,
+        _instance: Optional["ComponentRoot"] = None,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> DataModel:
+        # same as _compute, timing each phase including the one that fails
+        trace = instrument.current_trace()
+        trace.mark()
+        phase = "validate_input"
+        try:
+            input_data = cls._parse(cls.input, input_data, exec_req)
+            trace.lap(phase)
+            phase = "construct"
+            component = cls() if _instance is None else _instance
+            trace.lap(phase)
+            phase = "execute"
+            output_data = component.execute(input_data, exec_req, **kwargs)
+            trace.lap(phase)
+            phase = "validate_output"
+            output_data = cls._parse(cls.output, output_data, exec_req)
+        except BaseException:
+            trace.lap(phase)
+            raise
+        trace.lap(phase)
         return output_data
+
+    @classmethod
+    def _parse(
+        cls,
+        Model: Type[DataModel],
+        data: Union[DataModel, Dict[str, Any]],
+        exec_req: Optional[ExecReq] = None,
+    ) -> DataModel:
+        # validates data unless it is an instance of Model, or comes from a trusted producer
+        if data.__class__ is Model:
+            return data
+        if (
+            cls._trusted or (exec_req is not None and exec_req.trusted)
+        ) and not debug_validation():
+            if isinstance(data, Model):
+                return data
+            if isinstance(data, dict):
+                return Model.construct_trusted(**data)
+        return Model.model_validate(data)
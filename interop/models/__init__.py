@@ -1,6 +1,30 @@
-from .data import DataModel
-from .proc import InputProc, OutputProc, Provenance
+from .columns import ModelColumns
+from .data import DataModel, debug_validation
+from .proc import (
+    ComputeError,
+    FailedOperation,
+    InputProc,
+    LeanInputProc,
+    LeanOutputProc,
+    OutputProc,
+    Provenance,
+    ResourceUsage,
+)
 from .req import ExecReq
 from .root import RootModel
 
-__all__ = ["DataModel", "RootModel", "InputProc", "OutputProc", "Provenance", "ExecReq"]
+__all__ = [
+    "DataModel",
+    "RootModel",
+    "InputProc",
+    "OutputProc",
+    "LeanInputProc",
+    "LeanOutputProc",
+    "ComputeError",
+    "FailedOperation",
+    "Provenance",
+    "ResourceUsage",
+    "ExecReq",
+    "ModelColumns",
+    "debug_validation",
+]
@@ -0,0 +1,267 @@
+"""
+Provides a compact column-wise collection of data model records, for bulk results made of
+many small records (e.g. :class:`Provenance` or per-item outputs).
+"""
+
+import array
+import enum
+import functools
+import sys
+from collections.abc import Sequence
+from typing import (
+    Annotated,
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from ..utils.lazy import LazyModule
+from .data import DataModel
+
+numpy = LazyModule("numpy")
+
+__all__ = ["ModelColumns"]
+
+# Array typecodes of numeric fields, and of the codes of dictionary-encoded fields
+_TYPECODES = {bool: "b", int: "q", float: "d"}
+_CODE_TYPECODES = ("B", "H", "I", "Q")
+
+
+class _ArrayColumn:
+    """Numeric values in an array, with a null mask allocated on the first None."""
+
+    def __init__(self, typecode: str):
+        self.data = array.array(typecode)
+        self.nulls = None
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            if self.nulls is None:
+                self.nulls = bytearray(len(self.data))
+            self.data.append(0)
+            self.nulls.append(1)
+            return
+
+        self.data.append(value)  # raises TypeError or OverflowError before appending
+        if self.nulls is not None:
+            self.nulls.append(0)
+
+    def __getitem__(self, index: int) -> Any:
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        value = self.data[index]
+        return bool(value) if self.data.typecode == "b" else value
+
+    def to_list(self) -> List[Any]:
+        return [self[index] for index in range(len(self.data))]
+
+    def to_numpy(self) -> Any:
+        values = numpy.array(self.data)
+        if self.data.typecode == "b":
+            values = values.astype(bool)
+        if self.nulls is None:
+            return values
+        return numpy.ma.masked_array(values, mask=numpy.frombuffer(self.nulls, dtype=bool))
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data) + len(self.nulls or b"")
+
+
+class _DictColumn:
+    """Dictionary-encoded values, so repeated values (e.g. strings) are stored once."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.index: Dict[Any, int] = {}
+        self.codes = array.array(_CODE_TYPECODES[0])
+
+    def append(self, value: Any) -> None:
+        code = self.index.get(value)  # raises TypeError if unhashable
+        if code is None:
+            code = len(self.values)
+            if code >> (8 * self.codes.itemsize):
+                typecode = _CODE_TYPECODES[_CODE_TYPECODES.index(self.codes.typecode) + 1]
+                self.codes = array.array(typecode, self.codes)
+            self.index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[self.codes[index]]
+
+    def to_list(self) -> List[Any]:
+        return [self.values[code] for code in self.codes]
+
+    def to_numpy(self) -> Any:
+        values = numpy.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        return values[numpy.array(self.codes)]
+
+    @property
+    def nbytes(self) -> int:
+        values = sum(sys.getsizeof(value) for value in self.values)
+        return self.codes.itemsize * len(self.codes) + values + sys.getsizeof(self.index)
+
+
+class _ObjectColumn:
+    """Arbitrary Python objects, held by reference."""
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self.values = list(values)
+
+    def append(self, value: Any) -> None:
+        self.values.append(value)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[index]
+
+    def to_list(self) -> List[Any]:
+        return list(self.values)
+
+    def to_numpy(self) -> Any:
+        values = numpy.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        return values
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values)
+
+
+_Column = Union[_ArrayColumn, _DictColumn, _ObjectColumn]
+
+
+def _make_column(annotation: Any) -> _Column:
+    # unwraps Optional[...] and constrained types, then picks the column of the field type
+    if get_origin(annotation) is Annotated:
+        return _make_column(get_args(annotation)[0])
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _make_column(args[0]) if len(args) == 1 else _ObjectColumn()
+    if annotation in _TYPECODES:
+        return _ArrayColumn(_TYPECODES[annotation])
+    if (
+        annotation is str
+        or get_origin(annotation) is Literal
+        or (isinstance(annotation, type) and issubclass(annotation, enum.Enum))
+    ):
+        return _DictColumn()
+    return _ObjectColumn()
+
+
+class ModelColumns(Sequence):
+    """
+    Collection of `model` records stored column-wise: numeric fields in arrays, strings
+    and other categorical fields dictionary-encoded (interned), and other fields as
+    object references. Records are validated when added, and built on access with
+    :meth:`DataModel.construct_trusted`. The collection type of a model is generated by
+    ``ModelColumns[Model]``.
+
+    Parameters
+    ----------
+    records: iterable of DataModel or dict, optional
+        Records to add, see :meth:`append`.
+
+    Examples
+    --------
+    >>> provenances = ModelColumns[Provenance](Provenance(creator="foo") for _ in range(3))
+    >>> provenances[0], provenances.column("creator"), provenances.to_numpy("creator")
+
+    """
+
+    model: ClassVar[Type[DataModel]]
+
+    def __init__(self, records: Iterable[Union[DataModel, Dict[str, Any]]] = ()):
+        if getattr(self, "model", None) is None:
+            raise TypeError("Collection of unknown model, use ModelColumns[Model] instead.")
+
+        self._length = 0
+        self._columns: Dict[str, _Column] = {
+            name: _make_column(field.annotation) for name, field in self.model.model_fields.items()
+        }
+        self.extend(records)
+
+    def __class_getitem__(cls, model: Type[DataModel]) -> Type["ModelColumns"]:
+        return _columns_type(model)
+
+    def append(self, record: Union[DataModel, Dict[str, Any]]) -> None:
+        """Adds `record`, validated unless it is an instance of `model`."""
+        if record.__class__ is not self.model:
+            record = self.model.model_validate(record)
+
+        values = [record.__dict__[name] for name in self._columns]
+        for (name, column), value in zip(self._columns.items(), values):
+            try:
+                column.append(value)
+            except (TypeError, OverflowError):
+                # e.g. big ints or unhashable values
+                column = self._columns[name] = _ObjectColumn(column.to_list())
+                column.append(value)
+        self._length += 1
+
+    def extend(self, records: Iterable[Union[DataModel, Dict[str, Any]]]) -> None:
+        """Adds all `records`."""
+        for record in records:
+            self.append(record)
+
+    def column(self, name: str) -> List[Any]:
+        """Returns the values of field `name`."""
+        return self._columns[name].to_list()
+
+    def to_numpy(self, name: str) -> Any:
+        """Returns a copy of the values of field `name` as a numpy array, masked if the
+        field is numeric and has null values, of objects if it is not numeric."""
+        return self._columns[name].to_numpy()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size (in bytes) of the columns, excluding referenced objects."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[DataModel, List[DataModel]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"{self.__class__.__name__} index out of range.")
+        return self.model.construct_trusted(
+            **{name: column[index] for name, column in self._columns.items()}
+        )
+
+    def __iter__(self) -> Iterator[DataModel]:
+        for index in range(self._length):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._length} records)"
+
+    def __reduce__(self):
+        return _restore, (self.model, self._length, self._columns)
+
+
+@functools.lru_cache(maxsize=None)
+def _columns_type(model: Type[DataModel]) -> Type[ModelColumns]:
+    if not (isinstance(model, type) and issubclass(model, DataModel)):
+        raise TypeError(f"Model {model} is not a subclass of DataModel.")
+    name = f"ModelColumns[{model.__name__}]"
+    return type(name, (ModelColumns,), {"model": model, "__qualname__": name})
+
+
+def _restore(model: Type[DataModel], length: int, columns: Dict[str, _Column]) -> ModelColumns:
+    collection = _columns_type(model).__new__(_columns_type(model))
+    collection._length = length
+    collection._columns = columns
+    return collection
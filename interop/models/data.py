@@ -1,12 +1,59 @@
-from typing import Any, Dict, Optional, Union
+import copy
+import functools
+import os
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type, Union
 
-import numpy
-from pydantic import PositiveInt
+from pydantic import BaseModel, PositiveInt
+from pydantic_core import PydanticUndefined
 
 from ..common.decorators import classproperty
 from ..utils.data import Field
+from ..utils.hashing import model_hash
 from .root import RootModel
 
+# Validates trusted models too, see DataModel.construct_trusted
+_debug_validation = os.environ.get("INTEROP_DEBUG_VALIDATION", "0") not in ("", "0")
+
+
+def debug_validation(enabled: Optional[bool] = None) -> bool:
+    """
+    Returns whether trusted models are validated, after turning it on or off if `enabled`
+    is given. Defaults to the ``INTEROP_DEBUG_VALIDATION`` environment variable, which
+    also applies to Ray workers started with it.
+    """
+    global _debug_validation
+    if enabled is not None:
+        _debug_validation = enabled
+    return _debug_validation
+
+
+_object_setattr = object.__setattr__
+
+# Defaults that are safe to share between instances
+_IMMUTABLE = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+_Plan = Tuple[Dict[str, Any], List[Tuple[str, Callable[[], Any]]], FrozenSet[str]]
+
+
+@functools.lru_cache(maxsize=None)
+def _construct_plan(cls: Type[BaseModel]) -> _Plan:
+    # template of field values in declaration order, with immutable defaults filled in,
+    # the factories of the other defaults, and the required fields
+    template, factories, required = {}, [], set()
+    for name, field in cls.model_fields.items():
+        template[name] = field.default
+        if field.default_factory is not None:
+            factories.append((name, field.default_factory))
+        elif field.default is PydanticUndefined:
+            required.add(name)
+        elif isinstance(field.default, (dict, list, set)) and not field.default:
+            factories.append((name, type(field.default)))
+        elif isinstance(field.default, BaseModel):
+            factories.append((name, field.default.model_copy))
+        elif not isinstance(field.default, _IMMUTABLE):
+            factories.append((name, functools.partial(copy.deepcopy, field.default)))
+    return template, factories, frozenset(required)
+
 
 class DataModel(RootModel):
     """
@@ -27,13 +74,52 @@ class DataModel(RootModel):
     class ConfigDict(RootModel.ConfigDict):
         frozen: bool = True
         extra: str = "forbid"
-        json_encoders: Dict[str, Any] = {
-            numpy.ndarray: lambda v: v.flatten().tolist(),
-        }  # pragma: no cover
 
     def __init_subclass__(cls, **kwargs: Optional[Dict[str, Any]]) -> None:
         super().__init_subclass__(**kwargs)
 
+    @classmethod
+    def construct_trusted(cls, **fields: Any) -> "DataModel":
+        """
+        Builds an instance from `fields` without validation, for trusted producers of
+        already valid data. Like ``model_construct``, nested models must be given as
+        instances, not dicts, missing fields get their defaults, and unknown fields are
+        ignored, but the construction plan of each class is computed once. Validation is
+        done anyway in debug mode, see :func:`debug_validation`.
+        """
+        if _debug_validation:
+            return cls(**fields)
+
+        template, factories, required = _construct_plan(cls)
+        values = template.copy()
+        values.update(fields)  # keeps the declaration order
+        for name, factory in factories:
+            if name not in fields:
+                values[name] = factory()
+        fields_set = set(fields)
+        if len(values) > len(template) or not required <= fields_set:
+            fields_set &= template.keys()
+            values = {
+                name: value
+                for name, value in values.items()
+                if name in fields_set or (name in template and name not in required)
+            }
+
+        model = cls.__new__(cls)
+        _object_setattr(model, "__dict__", values)
+        _object_setattr(model, "__pydantic_fields_set__", fields_set)
+        _object_setattr(model, "__pydantic_extra__", None)
+        _object_setattr(model, "__pydantic_private__", None)
+        return model
+
+    def content_hash(self) -> str:
+        """
+        Returns a stable hex digest of the model fields, computed with blake2b over the
+        fields in declaration order and over the raw buffers of numpy arrays. The digest
+        is not memoized: models (and their nested models) can be mutated in place.
+        """
+        return model_hash(self)
+
     def __repr__(self) -> str:
         return f'{self.__repr_name__()}({self.__repr_str__(", ")})'
 
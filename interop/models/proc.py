@@ -1,14 +1,33 @@
-from typing import TYPE_CHECKING, Any, Dict, Optional
+import functools
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
-from pydantic import Field, NonNegativeFloat
+from pydantic import (
+    ConfigDict,
+    Field,
+    NonNegativeFloat,
+    NonNegativeInt,
+    field_validator,
+)
 
+from ..utils.blob import Blob
 from ..utils.data import provenance_stamp
 from .data import DataModel
 
 if TYPE_CHECKING:
     from pydantic.typing import ReprArgs
 
-__all__ = ["InputProc", "OutputProc"]
+__all__ = [
+    "ComputeError",
+    "FailedOperation",
+    "FrozenDict",
+    "FrozenProvenance",
+    "InputProc",
+    "LeanInputProc",
+    "LeanOutputProc",
+    "OutputProc",
+    "ResourceUsage",
+    "intern_provenance",
+]
 
 
 class Provenance(DataModel):
@@ -29,6 +48,35 @@ class Provenance(DataModel):
     )
 
 
+class ResourceUsage(DataModel):
+    """Resources consumed by a program execution, as reported by the OS (``getrusage``)."""
+
+    wall_time: Optional[NonNegativeFloat] = Field(
+        None, description="Elapsed wall clock time (in seconds)."
+    )
+    user_time: Optional[NonNegativeFloat] = Field(
+        None, description="CPU time spent in user mode (in seconds)."
+    )
+    system_time: Optional[NonNegativeFloat] = Field(
+        None, description="CPU time spent in kernel mode (in seconds)."
+    )
+    max_rss: Optional[NonNegativeInt] = Field(
+        None, description="Maximum resident set size (in bytes)."
+    )
+    block_input: Optional[NonNegativeInt] = Field(
+        None, description="Number of block input operations."
+    )
+    block_output: Optional[NonNegativeInt] = Field(
+        None, description="Number of block output operations."
+    )
+    voluntary_switches: Optional[NonNegativeInt] = Field(
+        None, description="Number of voluntary context switches e.g. waiting on I/O."
+    )
+    involuntary_switches: Optional[NonNegativeInt] = Field(
+        None, description="Number of involuntary context switches e.g. preemption."
+    )
+
+
 class ComputeError(DataModel):
     """Complete description of the error from an unsuccessful program execution."""
 
@@ -115,13 +163,20 @@ class InputProc(DataModel):
 
 class OutputProc(DataModel):
     proc_input: Optional[InputProc] = None
-    stdout: Optional[str] = Field(None, description="The standard output of the program.")
-    stderr: Optional[str] = Field(None, description="The standard error of the program.")
+    stdout: Optional[Union[str, Blob]] = Field(
+        None, description="The standard output of the program, inline or as a lazy blob."
+    )
+    stderr: Optional[Union[str, Blob]] = Field(
+        None, description="The standard error of the program, inline or as a lazy blob."
+    )
     warnings: Optional[str] = Field(None, description="Warning messages.")
     delay: Optional[NonNegativeFloat] = Field(
         5, description="How long to wait (in seconds) for filesystem write buffer"
     )
-    log: Optional[str] = Field(None, description="Logging info.")
+    log: Optional[Union[str, Blob]] = Field(
+        None, description="Logging info, inline or as a lazy blob."
+    )
+    resources: Optional[ResourceUsage] = Field(None, description=str(ResourceUsage.__doc__))
     success: bool = Field(
         ...,
         description="The success of a given programs execution. If False, other fields"
@@ -134,3 +189,90 @@ class OutputProc(DataModel):
     extras: Optional[Dict[str, Any]] = Field(
         {}, description="Extra fields that are not part of the schema."
     )
+
+
+class FrozenDict(dict):
+    """Read-only dict, shared as the empty default of lean procedure models."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} is read-only, assign a new dict instead.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenDict":
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+EMPTY_DICT = FrozenDict()
+
+
+class FrozenProvenance(Provenance):
+    """Read-only provenance, shared by the lean procedure models that intern it."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+@functools.lru_cache(maxsize=1024)
+def _interned_provenance(creator: str, version: str, routine: str) -> FrozenProvenance:
+    return FrozenProvenance(creator=creator, version=version, routine=routine)
+
+
+def intern_provenance(provenance: Optional[Provenance]) -> Optional[Provenance]:
+    """Returns a shared read-only instance with the fields of `provenance`, see
+    :class:`FrozenProvenance`."""
+    if provenance is None or provenance.__class__ is not Provenance:
+        return provenance
+    return _interned_provenance(provenance.creator, provenance.version, provenance.routine)
+
+
+def _empty_dict() -> FrozenDict:
+    return EMPTY_DICT
+
+
+def _default_provenance() -> Provenance:
+    return _interned_provenance(**provenance_stamp(__name__))
+
+
+class LeanInputProc(InputProc):
+    """
+    Procedure input sharing its defaults between instances, for workloads holding many
+    records. Empty keywords and extras are a shared :class:`FrozenDict`, and provenance
+    records are interned as :class:`FrozenProvenance`. Shared values are read-only:
+    assign new ones instead of mutating them in place.
+    """
+
+    keywords: Optional[Dict[str, Any]] = Field(
+        default_factory=_empty_dict, description="Procedure specific keywords to be used."
+    )
+    provenance: Optional[Provenance] = Field(
+        default_factory=_default_provenance, description=str(Provenance.__doc__)
+    )
+    extras: Optional[Dict[str, Any]] = Field(
+        default_factory=_empty_dict, description="Extra fields that are not part of the schema."
+    )
+
+    _intern_provenance = field_validator("provenance")(intern_provenance)
+
+
+class LeanOutputProc(OutputProc):
+    """
+    Procedure output sharing its defaults between instances, like :class:`LeanInputProc`.
+    Inputs given as dicts are validated as :class:`LeanInputProc`.
+    """
+
+    proc_input: Optional[Union[LeanInputProc, InputProc]] = Field(None, union_mode="left_to_right")
+    provenance: Optional[Provenance] = Field(
+        default_factory=_default_provenance, description=str(Provenance.__doc__)
+    )
+    extras: Optional[Dict[str, Any]] = Field(
+        default_factory=_empty_dict, description="Extra fields that are not part of the schema."
+    )
+
+    _intern_provenance = field_validator("provenance")(intern_provenance)
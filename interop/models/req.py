@@ -1,8 +1,72 @@
-from typing import Any, Optional
+from typing import Any, Literal, Optional
+
+from pydantic import ValidationError
 
 from ..models import DataModel
 from ..utils.data import Field
-from ..utils.dtypes import DirectoryPath, PositiveFloat, PositiveInt
+from ..utils.dtypes import DirectoryPath, NonNegativeFloat, PositiveFloat, PositiveInt
+
+
+class RetryPolicy(DataModel):
+    """
+    Application-level retry policy applied to each input separately, so only failing
+    inputs are re-run. Complements *ComputeReq.max_retries*, which covers worker crashes.
+    """
+
+    max_attempts: PositiveInt = Field(3, description="Max number of attempts per input.")
+    delay: NonNegativeFloat = Field(0, description="Time (in seconds) before the first retry.")
+    backoff: PositiveFloat = Field(
+        2, description="Factor by which the delay grows after every retry."
+    )
+    retry_on: Optional[list[str]] = Field(
+        None,
+        description="Names of the exception types (or of their base classes) to retry e.g. "
+        "['TimeoutError', 'OSError']. By default, all errors but validation errors are retried.",
+    )
+
+    def should_retry(self, exc: Exception, attempt: int) -> bool:
+        """Returns True if `exc`, raised by attempt number `attempt`, should be retried."""
+        if attempt >= self.max_attempts:
+            return False
+        if self.retry_on is None:
+            return not isinstance(exc, ValidationError)
+        return any(cls.__name__ in self.retry_on for cls in type(exc).__mro__)
+
+    def wait_time(self, attempt: int) -> float:
+        """Returns the time (in seconds) to wait after attempt number `attempt`."""
+        return self.delay * self.backoff ** (attempt - 1)
+
+
+class PlacementGroupReq(DataModel):
+    """
+    Gang of resource bundles reserved atomically on the cluster. Tasks scheduled into the
+    same placement group share its bundles, so communicating tasks (e.g. an MPI-style group
+    or a producer/consumer pair) can be co-located on one node to avoid cross-node object
+    transfers.
+    """
+
+    bundles: list[dict[str, NonNegativeFloat]] = Field(
+        ...,
+        min_length=1,
+        description="Resources of each bundle e.g. [{'CPU': 2}, {'CPU': 1, 'GPU': 1}].",
+    )
+    strategy: Literal["PACK", "SPREAD", "STRICT_PACK", "STRICT_SPREAD"] = Field(
+        "PACK",
+        description="How bundles are placed: PACK (as few nodes as possible), SPREAD "
+        "(as many nodes as possible), STRICT_PACK (a single node), or STRICT_SPREAD "
+        "(one node per bundle).",
+    )
+    name: Optional[str] = Field(
+        None,
+        description="Name of the placement group. Named groups are looked up before being "
+        "created, so components sharing a name share the same bundles.",
+    )
+    bundle_index: Optional[int] = Field(
+        -1, description="Index of the bundle to schedule into. Defaults to -1 (any bundle)."
+    )
+    capture_child_tasks: Optional[bool] = Field(
+        None, description="Schedule tasks spawned by the component into the same group."
+    )
 
 
 class ComputeReq(DataModel):
@@ -41,6 +105,9 @@ class ComputeReq(DataModel):
         description="specifies whether application-level errors should be retried up to"
         " *max_retries times*.",
     )
+    placement_group: Optional[PlacementGroupReq] = Field(
+        None, description="Placement group to schedule the component into."
+    )
 
 
 class ExecReq(DataModel):
@@ -56,3 +123,29 @@ class ExecReq(DataModel):
         False, description="Specifies implementation thread safety."
     )
     scratch_dir: Optional[DirectoryPath] = Field(None, description="Path to scratch dir.")
+    scratch_host: Optional[str] = Field(
+        None,
+        description="Hostname or IP address of the node whose local scratch dir holds the input "
+        "data, used as a locality hint.",
+    )
+    fail_soft: Optional[bool] = Field(
+        False,
+        description="Return a FailedOperation record with the input and traceback instead of "
+        "raising when a computation fails.",
+    )
+    retry: Optional[RetryPolicy] = Field(None, description=str(RetryPolicy.__doc__))
+    reuse_instance: Optional[bool] = Field(
+        False,
+        description="Reuse a warm component instance across remote calls in the same worker. "
+        "Only suitable for components that keep no per-call state.",
+    )
+    trusted: Optional[bool] = Field(
+        False,
+        description="Skip validation of input and output data from trusted producers, building "
+        "models from dicts with DataModel.construct_trusted. See interop.models.debug_validation.",
+    )
+    locality: Optional[bool] = Field(
+        False,
+        description="Schedule remote computations on the node that already holds their large "
+        "input objects, or else on *scratch_host*.",
+    )
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from interop.utils import execute
+from interop.utils.affinity import CoreAllocator, parse_cpulist
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Core allocation not supported on windows")
+
+
+def test_cpulist():
+    assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+
+
+def test_allocator(tmp_path):
+    allocator = CoreAllocator(cpus=range(4), lock_dir=str(tmp_path))
+    # a second allocator mimics a concurrent process sharing the same lock dir
+    other = CoreAllocator(cpus=range(4), lock_dir=str(tmp_path))
+
+    with allocator.reserve(3) as cpuset:
+        assert len(cpuset) == 3
+        with pytest.raises(TimeoutError):
+            other.acquire(2, timeout=0.1)
+
+        with other.reserve(1) as other_cpuset:
+            assert not set(cpuset.cpus) & set(other_cpuset.cpus)
+
+    with other.reserve(4) as cpuset:
+        assert cpuset.cpus == (0, 1, 2, 3)
+
+    with pytest.raises(ValueError):
+        allocator.acquire(5)
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Pinning requires Linux")
+def test_execute_pinned(tmp_path, monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "7")  # inherited, e.g. by Ray workers
+    cpu = min(os.sched_getaffinity(0))
+    allocator = CoreAllocator(cpus=[cpu], lock_dir=str(tmp_path))
+    script = "import os; print(sorted(os.sched_getaffinity(0)), os.environ['OMP_NUM_THREADS'])"
+
+    success, output = execute(["python", "-c", script], num_cpus=1, allocator=allocator)
+    assert success
+    assert output["stdout"].strip() == f"[{cpu}] 1"
+
+    # explicit variables take precedence
+    success, output = execute(
+        ["python", "-c", script],
+        num_cpus=1,
+        allocator=allocator,
+        environment={**os.environ, "OMP_NUM_THREADS": "3"},
+    )
+    assert output["stdout"].strip() == f"[{cpu}] 3"
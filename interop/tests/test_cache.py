@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from interop.utils import ExecuteCache, execute
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Shell commands not supported on windows")
+def test_execute_cache(tmp_path):
+    cache = ExecuteCache(tmp_path / "cache")
+    kwargs = {
+        "command": ["cat input.txt > output.txt; echo done"],
+        "infiles": {"input.txt": "data"},
+        "outfiles": ["output.txt"],
+        "shell": True,
+        "cache": cache,
+    }
+
+    success, output = execute(**kwargs)
+    assert success and output["proc"] is not None
+    assert cache.stats()["misses"] == 1 and cache.stats()["entries"] == 1
+
+    success, cached = execute(**kwargs)
+    assert success and cached["proc"] is None
+    assert cached["stdout"] == output["stdout"] == "done\n"
+    assert cached["outfiles"] == output["outfiles"] == {"output.txt": "data"}
+    assert cache.hits == 1
+
+    success, output = execute(**{**kwargs, "infiles": {"input.txt": "other"}})
+    assert output["proc"] is not None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+    # files of an existing scratch dir may change results
+    success, output = execute(**kwargs, scratch_exist_ok=True)
+    assert output["proc"] is not None and cache.stats()["entries"] == 2
+
+
+def test_execute_cache_evict(tmp_path, monkeypatch):
+    cache = ExecuteCache(tmp_path, max_bytes=0)
+    key = cache.key(["ls"], {"input.txt": b"data"})
+    assert key != cache.key(["ls"], {"input.txt": b"other"})
+    assert key != cache.key(["ls"], {"input.txt": b"data"}, environment={"OMP_NUM_THREADS": "1"})
+
+    # the inherited environment is part of the key
+    monkeypatch.setenv("INTEROP_TEST_VAR", "1")
+    assert key != cache.key(["ls"], {"input.txt": b"data"})
+
+    cache.put(key, {"retcode": 0})
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Shell commands not supported on windows")
+def test_execute_cache_interrupted(tmp_path):
+    cache = ExecuteCache(tmp_path)
+    command = ["sh", "-c", "sleep 2; echo done"]
+
+    # the truncated output of an interrupted run is not cached
+    execute(command, cache=cache, interupt_after=0.3)
+    success, output = execute(command, cache=cache)
+    assert success and output["proc"] is not None and output["stdout"] == "done\n"
+    assert cache.hits == 0 and cache.stats()["entries"] == 1
@@ -0,0 +1,81 @@
+import os
+import subprocess
+
+import pytest
+
+from interop.utils import ray as ray_utils
+from interop.utils.cluster import RayCluster
+from interop.utils.launcher import LocalLauncher
+
+pytestmark = pytest.mark.skipif(
+    os.name == "nt", reason="Slurm cluster creation not supported on windows"
+)
+
+
+def test_cluster_slurm_fail():
+    with pytest.raises(KeyError):
+        with RayCluster():
+            pass
+
+
+def test_cluster_lifecycle():
+    cluster = RayCluster(max_restarts=0)
+    cluster.head_node = "head"
+    cluster.procs = {
+        "head": subprocess.Popen(["sleep", "30"]),
+        "worker": subprocess.Popen(["true"]),
+    }
+    cluster.procs["worker"].wait()
+
+    assert cluster.status() == {"head": None, "worker": 0}
+    assert cluster.check() == []
+    assert cluster.failed == {"worker": 0}
+
+    head = cluster.procs["head"]
+    cluster.watch(interval=0.05)
+    cluster.shutdown(timeout=1)
+    assert head.returncode is not None
+    assert not cluster.procs
+
+    with pytest.raises(RuntimeError):
+        cluster.procs = {"head": head}
+        cluster.check()
+
+
+def test_local_hostnames():
+    launcher = LocalLauncher(3)
+    assert launcher.hostnames(launcher.nodelist()) == ["local0", "local1", "local2"]
+    assert launcher.hostnames("node[08-10,12],login") == [
+        "node08",
+        "node09",
+        "node10",
+        "node12",
+        "login",
+    ]
+
+
+class RecordingLauncher(LocalLauncher):
+    def launch(self, node, cmd, **kwargs):
+        if "--head" in cmd:
+            # reserved ports are released right before the head node starts
+            port = int(next(arg for arg in cmd if arg.startswith("--port=")).split("=")[1])
+            sock = ray_utils._bind(port)
+            assert sock is not None
+            sock.close()
+        self.commands.append(list(cmd))
+        return super().launch(node, cmd, **kwargs)
+
+
+def test_local_cluster():
+    launcher = RecordingLauncher(2)
+    launcher.commands = []
+    with RayCluster(launcher=launcher, timeout=120) as cluster:
+        assert list(cluster.status().values()) == [None, None]
+        procs = list(cluster.procs.values())
+
+    assert all(proc.returncode is not None for proc in procs)
+    head = launcher.commands[0]
+    assert f"--port={cluster.port}" in head
+    assert f"--dashboard-port={cluster.dashboard_port}" in head
+    assert cluster.dashboard_port == int(cluster.port) + 1
+    assert cluster.dashboard_url == f"http://{cluster.head_node_ip}:{cluster.dashboard_port}"
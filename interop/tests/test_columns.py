@@ -0,0 +1,64 @@
+import pickle
+import tracemalloc
+from typing import Any, Literal, Optional
+
+import numpy
+import pytest
+from pydantic import ValidationError
+
+from interop.models import DataModel, ModelColumns, Provenance, ResourceUsage
+
+
+class Record(DataModel):
+    name: str
+    count: int = 0
+    score: Optional[float] = None
+    flag: bool = False
+    kind: Literal["a", "b"] = "a"
+    data: Any = None
+
+
+def test_columns():
+    records = [Record(name=f"r{index % 3}", count=index, data=[index]) for index in range(5)]
+    columns = ModelColumns[Record](records)
+    assert ModelColumns[Record] is type(columns) and columns.model is Record
+    assert len(columns) == 5 and list(columns) == records
+    assert columns[-1] == records[-1] and columns[1:3] == records[1:3]
+    with pytest.raises(IndexError):
+        columns[5]
+
+    columns.append({"name": "x", "score": 0.5, "flag": True, "count": 2**70, "data": {}})
+    assert columns[5] == Record(name="x", score=0.5, flag=True, count=2**70, data={})
+    assert columns.column("name") == ["r0", "r1", "r2", "r0", "r1", "x"]
+    assert columns[0].name is columns[3].name  # interned
+    with pytest.raises(ValidationError):
+        columns.append({"name": 1})
+    assert len(columns) == 6
+
+    scores = columns.to_numpy("score")
+    assert scores.mask.tolist() == [True] * 5 + [False] and scores[5] == 0.5
+    assert columns.to_numpy("flag").dtype == bool
+    assert columns.to_numpy("kind").tolist() == ["a"] * 6
+
+    assert list(pickle.loads(pickle.dumps(columns))) == list(columns)
+    with pytest.raises(TypeError):
+        ModelColumns()
+    with pytest.raises(TypeError):
+        ModelColumns[dict]
+
+
+def test_columns_memory():
+    records = [Provenance(creator="foo", routine=f"r{index % 10}") for index in range(10000)]
+    tracemalloc.start()
+    columns = ModelColumns[Provenance](records)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert size < 10 * columns.nbytes and columns.nbytes < 20 * len(records)
+
+    tracemalloc.start()
+    records = [Provenance(creator="foo", routine=f"r{index % 10}") for index in range(10000)]
+    assert tracemalloc.get_traced_memory()[0] > 10 * size
+    tracemalloc.stop()
+
+    usage = ModelColumns[ResourceUsage]([{"wall_time": 1.0}, {"max_rss": 10}])
+    assert isinstance(usage.to_numpy("wall_time"), numpy.ma.MaskedArray)
@@ -1,11 +1,14 @@
+import gc
+import weakref
 from typing import Any, Dict, Type
 
 import pytest
 from pydantic import ValidationError
 
 from interop.common.components import ComponentTypes, get_models
-from interop.models import DataModel
-from interop.utils.decorators import component
+from interop.models import DataModel, FailedOperation, debug_validation
+from interop.utils.decorators import clear_registry, component
+from interop.utils.instrument import MemorySink, instrumented
 
 
 class DataFoo(DataModel):
@@ -123,3 +126,153 @@ def test_class_raise():
                 pass
 
         Component.compute(DummyModel(field=1))
+
+
+def test_fail_soft():
+    calls = []
+
+    def foo(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        calls.append(input_model.field)
+        if input_model.field < 0 or len(calls) < 3:
+            raise TimeoutError("flaky")
+        return DummyModel(field=input_model.field)
+
+    comp_foo = component(foo)
+
+    with pytest.raises(TimeoutError):
+        comp_foo.compute(DummyModel(field=1))
+
+    # retried until success
+    exec_req = {"retry": {"max_attempts": 3, "retry_on": ["OSError"]}}
+    assert comp_foo.compute(DummyModel(field=1), exec_req).field == 1
+    assert len(calls) == 3
+
+    # failures are returned in place
+    calls.clear()
+    exec_req = {"fail_soft": True, "retry": {"max_attempts": 2}}
+    failed = comp_foo.compute({"field": -1}, exec_req)
+    assert isinstance(failed, FailedOperation)
+    assert failed.input_data == {"field": -1}
+    assert failed.error.error_type == "TimeoutError"
+    assert "flaky" in failed.error.error_message
+    assert failed.extras == {"attempts": 2}
+
+    # validation errors are not retried
+    calls.clear()
+    failed = comp_foo.compute({"field": "x"}, exec_req)
+    assert failed.error.error_type == "ValidationError"
+    assert failed.extras == {"attempts": 1} and not calls
+
+
+def test_trusted():
+    def foo(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        return {"field": input_model.field}
+
+    with pytest.raises(ValidationError):
+        component(foo).compute({"field": "x"})
+
+    # trusted data is not validated
+    assert component(trusted=True)(foo).compute({"field": "x"}).field == "x"
+    assert component(foo).compute({"field": "x"}, {"trusted": True}).field == "x"
+
+    debug_validation(True)
+    try:
+        with pytest.raises(ValidationError):
+            component(trusted=True)(foo).compute({"field": "x"})
+    finally:
+        debug_validation(False)
+
+
+def test_component_registry():
+    def foo(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        return input_model
+
+    class Foo:
+        def execute(self, input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+            return input_model
+
+    for source in (foo, Foo):
+        assert component(source) is component(source)
+        Comp = component(ctype="ray", resources={"custom": 1})(source)
+        assert Comp is component(ctype="ray", resources={"custom": 1})(source)
+        assert Comp is not component(ctype="ray", resources={"custom": 2})(source)
+
+    # generated classes are rebuilt once the registry is cleared
+    Comp = component(foo)
+    clear_registry()
+    assert component(foo) is not Comp
+
+    # sources are left untouched, and collected with their components once unreferenced
+    assert not vars(foo)
+    refs = [weakref.ref(source) for source in (foo, Foo)]
+    refs += [weakref.ref(component(foo)), weakref.ref(component(Foo)), weakref.ref(Comp)]
+    del foo, Foo, Comp, source
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+
+
+@pytest.mark.parametrize("cache", ["memory", "disk"])
+def test_component_cache(cache, tmp_path):
+    calls = []
+
+    def foo(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        calls.append(input_model.field)
+        return DummyModel(field=input_model.field + kwargs.get("offset", 0))
+
+    cache = f"disk:{tmp_path}" if cache == "disk" else cache
+    comp_foo = component(cache=cache, version="1")(foo)
+
+    assert comp_foo.compute({"field": 1}).field == 1
+    assert comp_foo.compute(DummyModel(field=1)).field == 1
+    assert comp_foo.compute({"field": 1}, offset=1).field == 2
+    assert calls == [1, 1]
+    assert comp_foo._result_cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+    # a new version invalidates results
+    component(cache=cache, version="2")(foo).compute({"field": 1})
+    assert calls == [1, 1, 1]
+
+    # failures are not cached
+    with pytest.raises(ValidationError):
+        comp_foo.compute({"field": "x"})
+
+
+def test_component_kwargs():
+    def foo(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        return DummyModel(field=kwargs["instance"] + kwargs["sinks"])
+
+    # execute kwargs may have any name
+    assert component(foo).compute({"field": 0}, instance=1, sinks=1).field == 2
+    with instrumented(MemorySink()):
+        assert component(foo).compute({"field": 0}, instance=1, sinks=1).field == 2
+
+
+def test_component_cache_copies():
+    def foo(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        return DummyModel(field=input_model.field)
+
+    comp_foo = component(cache=True)(foo)
+    output = comp_foo.compute({"field": 1})
+    output.field = 2
+
+    # neither the result of the first call nor of a hit alias the cached one
+    assert comp_foo.compute({"field": 1}).field == 1
+    comp_foo.compute({"field": 1}).field = 3
+    assert comp_foo.compute({"field": 1}).field == 1
+
+
+def _make_adder(offset: int, cache: Any) -> Type:
+    def add(input_model: DummyModel, exec_req=None, **kwargs) -> DummyModel:
+        return DummyModel(field=input_model.field + offset)
+
+    return component(cache=cache)(add)
+
+
+@pytest.mark.parametrize("cache", ["memory", "disk"])
+def test_component_cache_locals(cache, tmp_path):
+    cache = f"disk:{tmp_path}" if cache == "disk" else cache
+
+    # closures sharing a qualname do not share results
+    assert _make_adder(1, cache).compute({"field": 1}).field == 2
+    assert _make_adder(2, cache).compute({"field": 1}).field == 3
+    assert _make_adder(1, cache)._cache_id == _make_adder(1, cache)._cache_id
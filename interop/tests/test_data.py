@@ -1,4 +1,16 @@
-from interop.models import DataModel
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from interop.models import (
+    DataModel,
+    InputProc,
+    LeanInputProc,
+    LeanOutputProc,
+    OutputProc,
+    Provenance,
+)
 
 
 def test_data_basic():
@@ -14,3 +26,40 @@ def test_data_serialize():
     data = DataModel()
     data.serialize(encoding="json")
     data.serialize(encoding="json", indent=4)
+
+
+def test_data_construct_trusted():
+    proc_input = InputProc.construct_trusted(id="foo", unknown=1)
+    assert proc_input == InputProc(id="foo")
+    assert proc_input.model_fields_set == {"id"} and "unknown" not in proc_input.__dict__
+    assert proc_input.keywords == {} and proc_input.keywords is not InputProc().keywords
+    assert proc_input.provenance == InputProc().provenance
+
+    output = OutputProc.construct_trusted(proc_input=proc_input, success=True)
+    assert output.proc_input is proc_input
+    assert output.model_dump() == OutputProc(proc_input=proc_input, success=True).model_dump()
+    assert "success" not in OutputProc.construct_trusted().__dict__
+    assert Provenance.construct_trusted(creator=1).creator == 1
+
+
+def test_data_lean_proc():
+    proc_input, other = LeanInputProc(), LeanInputProc(provenance={"creator": "foo"})
+    assert proc_input.keywords is LeanInputProc().keywords == {}
+    assert proc_input.provenance is LeanInputProc.construct_trusted().provenance
+    assert other.provenance is LeanInputProc(provenance=Provenance(creator="foo")).provenance
+    assert proc_input.model_dump() == InputProc().model_dump()
+    with pytest.raises(TypeError):
+        proc_input.extras["foo"] = 1
+    assert LeanInputProc(keywords={"foo": 1}).keywords == {"foo": 1}
+    # interned provenance is read-only
+    with pytest.raises(ValidationError):
+        other.provenance.version = "9"
+    with pytest.raises(ValidationError):
+        proc_input.provenance.creator = "hacked"
+    assert LeanInputProc(provenance={"creator": "foo"}).provenance.version == ""
+    assert pickle.loads(pickle.dumps(proc_input)) == proc_input
+
+    output = LeanOutputProc(success=True, proc_input={"id": "foo"})
+    assert isinstance(output.proc_input, LeanInputProc)
+    assert output.provenance is LeanOutputProc(success=False).provenance
+    assert LeanOutputProc(success=True, proc_input=InputProc()).proc_input == InputProc()
@@ -1,8 +1,12 @@
 import os
+import pickle
 
 import pytest
 
+from interop.models import OutputProc, ResourceUsage
 from interop.utils import execute
+from interop.utils.blob import FileBlob
+from interop.utils.execute import FileRef, OutputFile, disk_files, stage_file
 
 
 @pytest.mark.parametrize(
@@ -19,3 +23,94 @@ def test_io(command, intput, output):
     success, output = execute(command=command)
     assert success
     assert output["stdout"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Symlinks require privileges on windows")
+@pytest.mark.parametrize("strategy", ["hardlink", "reflink", "symlink", "copy"])
+def test_stage_file(tmp_path, strategy):
+    src = tmp_path / "src.dat"
+    src.write_bytes(b"0" * 4096)
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+
+    with disk_files({"input.dat": FileRef(src, strategy=strategy)}, {}, cwd=scratch):
+        staged = scratch / "input.dat"
+        assert staged.read_bytes() == src.read_bytes()
+        assert staged.is_symlink() == (strategy == "symlink")
+        if strategy == "hardlink":
+            assert staged.stat().st_ino == src.stat().st_ino
+
+
+def test_stage_file_fail(tmp_path):
+    with pytest.raises(ValueError):
+        FileRef(tmp_path / "src.dat", strategy="move")
+
+    with pytest.raises(FileNotFoundError):
+        stage_file(FileRef(tmp_path / "src.dat"), tmp_path / "dst.dat")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Shell commands not supported on windows")
+def test_lazy_outfiles(tmp_path):
+    results = tmp_path / "results"
+    success, output = execute(
+        command=["printf abc > out.dat; for i in 1 2 3; do echo $i > part_$i.txt; done"],
+        outfiles=["out.dat", "part_*.txt"],
+        outfiles_lazy=["out.dat"],
+        outfiles_dir=str(results),
+        as_binary=["out.dat"],
+        shell=True,
+    )
+    assert success
+
+    handle = output["outfiles"]["out.dat"]
+    assert isinstance(handle, OutputFile) and isinstance(handle, FileBlob)
+    assert handle.path == results / "out.dat"
+    assert not output["scratch_directory"].exists()
+    assert handle.read() == b"abc" and handle.size == 3
+    assert b"".join(handle.iter_chunks(chunk_size=1)) == b"abc"
+    with handle.mmap() as mm:
+        assert mm[:] == b"abc"
+
+    parts = output["outfiles"]["part_*.txt"]
+    assert parts == {f"part_{i}.txt": f"{i}\n" for i in (1, 2, 3)}
+
+
+def test_lazy_outfiles_fail():
+    with pytest.raises(ValueError):
+        execute(command=["ls"], outfiles=["out.dat"], outfiles_lazy=["out.dat"])
+
+
+def test_resources():
+    success, output = execute(command=["python", "-c", "bytearray(64 * 2**20)"])
+    assert success
+
+    resources = ResourceUsage(**output["resources"])
+    assert resources.wall_time > 0
+    if hasattr(os, "wait4"):
+        assert resources.max_rss > 64 * 2**20
+        assert resources.user_time + resources.system_time > 0
+
+    OutputProc(success=success, stdout=output["stdout"], resources=resources)
+
+
+def test_output_blobs(tmp_path):
+    script = "import sys; print('out' * 1000); print('err', file=sys.stderr)"
+    success, output = execute(command=["python", "-c", script], output_dir=str(tmp_path))
+    assert success
+    stdout, stderr = output["stdout"], output["stderr"]
+    assert isinstance(stdout, FileBlob) and stdout.size == 3001
+    assert stderr.text == "err\n" and str(stdout) == "out" * 1000 + "\n"
+    with stdout.mmap() as data:
+        assert data[:3] == b"out"
+    assert b"".join(stdout.iter_chunks(1000)) == stdout.read()
+
+    result = OutputProc(success=success, stdout=stdout, stderr=stderr)
+    assert pickle.loads(pickle.dumps(result)) == result
+    assert len(pickle.dumps(result)) < stdout.size
+    assert OutputProc.model_validate_json(result.model_dump_json()).stdout == stdout
+    assert OutputProc(**result.model_dump()).stdout is stdout
+
+    # output files are removed if the process cannot be spawned
+    with pytest.raises(FileNotFoundError):
+        execute(command=["interop-missing-command"], output_dir=str(tmp_path / "missing"))
+    assert os.listdir(tmp_path / "missing") == []
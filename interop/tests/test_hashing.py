@@ -0,0 +1,61 @@
+from typing import Any
+
+import numpy
+import pytest
+
+from interop import component
+from interop.models import DataModel, InputProc, Provenance
+from interop.utils.hashing import content_hash
+
+
+def test_content_hash():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash([1, 2]) != content_hash((1, 2))
+    assert content_hash(1) != content_hash(1.0) != content_hash("1")
+    assert content_hash({1, 2}) == content_hash({2, 1})
+
+    array = numpy.arange(6, dtype=float).reshape(2, 3)
+    assert content_hash(array) == content_hash(array.copy())
+    assert content_hash(array.T) == content_hash(numpy.ascontiguousarray(array.T))
+    assert content_hash(array) != content_hash(array.astype(int))
+    assert content_hash(array) != content_hash(array.reshape(3, 2))
+
+    model = Provenance(creator="foo")
+    assert content_hash(model) == content_hash(Provenance(creator="foo"))
+    assert content_hash(model) != content_hash(Provenance(creator="bar"))
+    assert content_hash(model) != content_hash(DataModel())
+
+    with pytest.raises(TypeError):
+        content_hash(lambda: 0)
+
+
+def test_model_content_hash():
+    class Model(DataModel):
+        data: Any = None
+        child: Provenance = Provenance(creator="foo")
+
+    model = Model(data=numpy.arange(4))
+    digest = model.content_hash()
+    assert digest == Model(data=numpy.arange(4)).content_hash()
+    assert digest != Model(data=numpy.arange(4.0)).content_hash()
+    assert model == Model(data=model.data) and model.model_dump()["data"] is model.data
+    assert digest == content_hash(model)
+
+    # not memoized, so in-place mutations of nested models change the digest
+    model.data[0] = 1
+    assert model.content_hash() != digest
+    model.data = numpy.arange(4)
+    assert model.content_hash() == digest
+    model.child.creator = "bar"
+    assert model.content_hash() != digest
+
+
+def test_cache_nested_mutation():
+    @component(cache=True)
+    def creator(input_model: InputProc, exec_req=None, **kwargs) -> DataModel:
+        return DataModel(schema_name=input_model.provenance.creator)
+
+    inp = InputProc(provenance={"creator": "a"})
+    assert creator.compute(inp).schema_name == "a"
+    inp.provenance.creator = "b"
+    assert creator.compute(inp).schema_name == "b"
@@ -0,0 +1,142 @@
+import pytest
+
+from interop import component
+from interop.models import DataModel, FailedOperation
+from interop.utils import instrument
+from interop.utils.instrument import ActorSink, MemorySink, PrometheusSink, instrumented
+
+
+def foo(input_model: DataModel, exec_req=None, **kwargs) -> DataModel:
+    if input_model.schema_name == "fail":
+        raise ValueError("failed")
+    return DataModel(schema_name=input_model.schema_name)
+
+
+def test_memory_sink():
+    Comp = component(cache=True)(foo)
+    sink = MemorySink(keep=10)
+    with instrumented(sink):
+        for _ in range(2):
+            Comp.compute({"schema_name": "bar"})
+        assert isinstance(
+            Comp.compute({"schema_name": "fail"}, {"fail_soft": True}), FailedOperation
+        )
+        with pytest.raises(ValueError):
+            Comp.compute({"schema_name": "fail"})
+    assert instrument.active_sinks() == ()
+
+    stats = sink.stats()[Comp.trace_name]
+    assert Comp.trace_name == f"{foo.__module__}.foo"
+    assert stats["calls"] == 4 and stats["errors"] == 2 and stats["remote_calls"] == 0
+    assert stats["phases"]["total"]["count"] == 4
+    # the second call is a cache hit
+    assert stats["phases"]["execute"]["count"] == 3
+    assert stats["phases"]["validate_output"]["count"] == 1
+    assert stats["bytes"]["input"] > 0 and stats["bytes"]["output"] > 0
+
+    hit, miss = sink.traces[1], sink.traces[0]
+    assert hit.attributes["cache_hit"] and not miss.attributes["cache_hit"]
+    assert [name for name, _, _ in miss.phases] == [
+        "validate_input",
+        "construct",
+        "execute",
+        "validate_output",
+    ]
+    assert sum(duration for _, _, duration in miss.phases) <= miss.duration
+
+    # disabled instrumentation records nothing
+    sink.clear()
+    Comp.compute({"schema_name": "baz"})
+    assert sink.stats() == {}
+
+
+def test_nested_traces():
+    Inner = component(foo)
+
+    @component
+    def outer(input_model: DataModel, exec_req=None, **kwargs) -> DataModel:
+        return Inner.compute(input_model)
+
+    sink = MemorySink(keep=2)
+    with instrumented(sink, payload_sizes=False):
+        outer.compute({"schema_name": "bar"})
+
+    inner, parent = sink.traces
+    assert inner.parent_id == parent.trace_id and parent.parent_id is None
+    assert inner.sizes == {}
+
+
+class FailingSink(instrument.Sink):
+    def finish(self, trace):
+        raise RuntimeError("unavailable")
+
+    def flush(self):
+        raise RuntimeError("unavailable")
+
+
+def test_failing_sink():
+    sink = MemorySink()
+    with instrumented(FailingSink(), sink):
+        # sinks do not fail computations, nor each other
+        assert component(foo).compute({"schema_name": "bar"}).schema_name == "bar"
+        with instrument.propagated(instrument.propagate("foo", None)):
+            pass
+    assert instrument.active_sinks() == () and sink.stats()
+
+
+def test_prometheus_sink(tmp_path):
+    Comp = component(foo)
+    path = tmp_path / "interop-{pid}.prom"
+    sink = PrometheusSink(str(path))
+    with instrumented(sink):
+        Comp.compute({"schema_name": "bar"})
+
+    (written,) = tmp_path.glob("interop-*.prom")
+    text = written.read_text()
+    label = f'component="{Comp.trace_name}"'
+    assert f"interop_compute_calls_total{{{label}}} 1" in text
+    assert f'interop_compute_seconds_count{{{label},phase="execute"}} 1' in text
+    assert "# TYPE interop_compute_seconds summary" in text
+
+
+def test_opentelemetry_sink():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    sink = instrument.OpenTelemetrySink(tracer_provider=provider)
+
+    Comp = component(foo)
+    with instrumented(sink):
+        Comp.compute({"schema_name": "bar"})
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    root = spans[Comp.trace_name]
+    assert spans["execute"].parent.span_id == root.context.span_id
+    assert root.attributes["interop.bytes.input"] > 0
+
+
+def test_remote_instrumentation():
+    ray = pytest.importorskip("ray")
+
+    Comp = component(ctype="ray", num_cpus=1)(foo)
+    ray.init(num_cpus=1)
+    try:
+        sink = ActorSink(name="test-instrumentation")
+        with instrumented(sink):
+            outputs = ray.get([Comp.compute_remote({"schema_name": "bar"}) for _ in range(3)])
+        assert [output.schema_name for output in outputs] == ["bar"] * 3
+
+        stats = sink.stats()[Comp.trace_name]
+        assert stats["calls"] == 3 and stats["remote_calls"] == 3
+        assert stats["phases"]["submit"]["count"] == 3
+        assert stats["phases"]["queue"]["count"] == 3
+        assert stats["phases"]["execute"]["count"] == 3
+    finally:
+        ray.shutdown()
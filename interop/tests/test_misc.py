@@ -1,5 +1,9 @@
+import subprocess
+import sys
+
 import numpy
 
+from interop.utils.lazy import LazyModule, module_available
 from interop.utils.misc import check_symmetry, get_call_method
 
 
@@ -12,3 +16,16 @@ def test_symmetry():
 
 def test_call_method():
     assert get_call_method()
+
+
+def test_lazy_imports():
+    # heavy dependencies are only imported when used
+    script = "import sys, interop; print('ray' in sys.modules, 'numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, check=True)
+    assert out.stdout.decode().split() == ["False", "False"]
+
+    json = LazyModule("json", submodules=["decoder"])
+    assert "not loaded" in repr(json)
+    assert json.loads("[1]") == [1]
+    assert "not loaded" not in repr(json)
+    assert module_available("json") and not module_available("unknown_module")
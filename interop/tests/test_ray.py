@@ -2,6 +2,8 @@ import ipaddress
 import logging
 import os
 import random
+import socket
+import subprocess
 from sys import platform
 
 import psutil
@@ -10,8 +12,26 @@ import ray
 
 import interop.utils.ray
 from interop import component
-from interop.models import DataModel
+from interop.components import component_ray
+from interop.components.component_ray import (
+    WarmCache,
+    get_warm_cache,
+    release_placement_groups,
+    submit_bounded,
+)
+from interop.models import DataModel, OutputProc
 from interop.models.req import ExecReq
+from interop.utils.blob import RayBlob
+from interop.utils.hashing import content_hash
+from interop.utils.memoize import RayCache
+
+
+class MetaFoo:
+    def execute(self, input_model: DataModel, exec_req=None, **kwargs) -> DataModel:
+        return DataModel(schema_name=str(id(self)))
+
+
+MetaComp = component(meta=True, in_model=DataModel, out_model=DataModel)(MetaFoo)
 
 
 def test_remote_execute():
@@ -67,6 +87,58 @@ def test_port():
     assert interop.utils.ray.get_port().isdigit()
 
 
+@pytest.mark.parametrize("contiguous", [True, False])
+def test_reserve_ports(contiguous):
+    reservation = interop.utils.ray.reserve_ports(3, contiguous=contiguous)
+    ports = reservation.ports
+    assert len(set(ports)) == 3
+    if contiguous:
+        assert ports == list(range(ports[0], ports[0] + 3))
+
+    # reserved ports cannot be bound until released
+    assert interop.utils.ray._bind(ports[0]) is None
+    assert reservation.release() == ports
+    sock = interop.utils.ray._bind(ports[0])
+    assert sock is not None
+    sock.close()
+
+
+def test_head_command():
+    cmd = interop.utils.ray.head_command("10.0.0.1", "6379")
+    assert not any(arg.startswith("--dashboard-port") for arg in cmd)
+
+    cmd = interop.utils.ray.head_command(
+        "10.0.0.1", "6379", dashboard_port=6380, worker_ports=[6381, 6382, 6383]
+    )
+    assert "--dashboard-port=6380" in cmd
+    assert cmd[-2:] == ["--min-worker-port=6381", "--max-worker-port=6383"]
+
+
+def test_wait_for_port():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        interop.utils.ray.wait_for_port("127.0.0.1", server.getsockname()[1], timeout=1)
+
+    port = interop.utils.ray.reserve_ports(1).release()[0]
+    with pytest.raises(TimeoutError):
+        interop.utils.ray.wait_for_port("127.0.0.1", port, timeout=0.2, interval=0.1)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Slurm cluster creation not supported on windows")
+def test_wait_for_nodes():
+    ray.init(num_cpus=1)
+    address = ray.get_runtime_context().gcs_address
+    assert len(interop.utils.ray.wait_for_nodes(address, 1, timeout=5)) == 1
+
+    failed = subprocess.Popen(["false"])
+    failed.wait()
+    with pytest.raises(RuntimeError, match="worker"):
+        interop.utils.ray.wait_for_nodes(address, 2, procs={"worker": failed}, timeout=5)
+
+    with pytest.raises(TimeoutError):
+        interop.utils.ray.wait_for_nodes(address, 2, timeout=0.5, interval=0.1)
+    ray.shutdown()
+
+
 @pytest.mark.parametrize(
     "logger,exec_req", [(None, None), (logging.Logger, {"compute_req": {"num_cpus": 1}})]
 )
@@ -77,3 +149,170 @@ def test_initialize_ray(logger: logging.Logger, exec_req: dict[str, str]):
         assert num_gpus > 0
     ray.shutdown()
     assert not ray.is_initialized()
+
+
+def test_placement_group():
+    def foo(input_model: DataModel, exec_req: ExecReq, **kwargs) -> DataModel:
+        return DataModel(schema_name=ray.get_runtime_context().get_node_id())
+
+    ray.init(num_cpus=2)
+    placement_group = {"bundles": [{"CPU": 1}, {"CPU": 1}], "strategy": "STRICT_PACK"}
+    Comp = component(ctype="ray", num_cpus=1, placement_group=placement_group)(foo)
+
+    results = ray.get([Comp.compute_remote(input_data={}) for _ in range(4)])
+    assert len({result.schema_name for result in results}) == 1
+
+    # identical specs share a single group
+    (group,) = ray.util.placement_group_table().values()
+    assert group["strategy"] == "STRICT_PACK"
+    assert len(group["bundles"]) == 2
+
+    exec_req = {"compute_req": {"placement_group": {**placement_group, "bundle_index": 1}}}
+    assert ray.get(Comp.compute_remote(input_data={}, exec_req=exec_req)).schema_name
+
+    # released groups free their bundles
+
+    assert release_placement_groups() == 1
+    (group,) = ray.util.placement_group_table().values()
+    assert group["state"] == "REMOVED"
+    ray.shutdown()
+
+    # groups of a previous session are not reused
+    ray.init(num_cpus=2)
+    try:
+        assert ray.get(Comp.compute_remote(input_data={})).schema_name
+        (group,) = ray.util.placement_group_table().values()
+        assert group["state"] == "CREATED"
+        assert release_placement_groups(placement_group) == 1
+    finally:
+        ray.shutdown()
+
+
+def test_locality():
+    def foo(input_model: DataModel, exec_req: ExecReq, **kwargs) -> DataModel:
+        assert len(kwargs["data"]) == 1 << 21
+        return DataModel(schema_name=ray.get_runtime_context().get_node_id())
+
+    ray.init(num_cpus=1)
+    node = ray.nodes()[0]
+    ref, small = ray.put(bytes(1 << 21)), ray.put(b"")
+    assert component_ray.locality_node([ref, small]) == node["NodeID"]
+    assert component_ray.locality_node([small]) is None
+    assert component_ray.node_by_host(node["NodeManagerHostname"]) == node["NodeID"]
+    assert component_ray.node_by_host("unknown-host") is None
+
+    Comp = component(ctype="ray", num_cpus=1)(foo)
+    for exec_req in [{"locality": True}, {"locality": True, "scratch_host": "unknown-host"}]:
+        result = ray.get(Comp.compute_remote(input_data={}, exec_req=exec_req, data=ref))
+        assert result.schema_name == node["NodeID"]
+    ray.shutdown()
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_submit_bounded(ordered):
+    @ray.remote(num_cpus=1)
+    def square(x):
+        return x * x
+
+    submitted = []
+
+    def submit(x):
+        submitted.append(x)
+        return square.remote(x)
+
+    ray.init(num_cpus=1)
+    results = []
+    for result in submit_bounded(submit, iter(range(10)), max_in_flight=3, ordered=ordered):
+        assert len(submitted) - len(results) <= 3
+        results.append(result)
+
+    assert sorted(results) == [x * x for x in range(10)]
+    if ordered:
+        assert results == [x * x for x in range(10)]
+
+    # bytes window: at most 2 inputs of 10 bytes in flight
+    submitted.clear()
+    results = submit_bounded(submit, range(5), max_bytes=25, sizeof=lambda x: 10)
+    for count, _ in enumerate(results, start=1):
+        assert len(submitted) - count < 2
+
+    def foo(input_model: DataModel, exec_req: ExecReq, **kwargs) -> DataModel:
+        return DataModel(schema_name="foo")
+
+    Comp = component(ctype="ray", num_cpus=1)(foo)
+    outputs = list(Comp.compute_remote_iter(({} for _ in range(8)), max_in_flight=2))
+    assert [output.schema_name for output in outputs] == ["foo"] * 8
+    ray.shutdown()
+
+
+def test_meta_warm_cache():
+    ray.init(num_cpus=1)
+    exec_req = {"compute_req": {"num_cpus": 1}, "reuse_instance": True}
+    outputs = [
+        ray.get(MetaComp.compute_remote({}, exec_req, module=__name__, component="MetaFoo"))
+        for _ in range(3)
+    ]
+    # a single worker reuses the same warm instance
+    assert len({output.schema_name for output in outputs}) == 1
+
+    @ray.remote(num_cpus=1)
+    def warm_cache_stats():
+        return get_warm_cache().stats()
+
+    # the component class and its instance are built once, in the warm cache
+    stats = ray.get(warm_cache_stats.remote())
+    assert (stats["entries"], stats["misses"], stats["hits"]) == (2, 2, 4)
+    assert MetaComp._register(exec_req) is MetaComp._register(exec_req)
+    ray.shutdown()
+
+
+def test_warm_cache():
+    cache = WarmCache(max_entries=2)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("a", lambda: 2) == 1
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)  # "b" becomes least recently used
+    cache.get("c", lambda: 3)
+    assert cache.get("b", lambda: 4) == 4
+    assert cache.stats() == {"hits": 2, "misses": 4, "entries": 2, "size": 0}
+
+    cache = WarmCache(max_bytes=10, sizeof=len)
+    cache.get("a", lambda: "x" * 6)
+    cache.get("b", lambda: "x" * 6)
+    assert len(cache) == 1 and cache.stats()["size"] == 6
+    cache.get("c", lambda: "x", sized=False)
+    assert cache.stats()["size"] == 6
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_ray_cache():
+    def foo(input_model: DataModel, exec_req: ExecReq, **kwargs) -> DataModel:
+        return DataModel(schema_name=str(kwargs["value"]))
+
+    ray.init(num_cpus=1)
+    Comp = component(ctype="ray", num_cpus=1, cache=RayCache(name="test-cache"))(foo)
+    assert ray.get(Comp.compute_remote(input_data={}, value=1)).schema_name == "1"
+
+    # computed on a worker, read from the driver
+    assert Comp._result_cache.get(content_hash(Comp._cache_id, DataModel(), {"value": 1}))
+    assert Comp.compute({}, value=1).schema_name == "1"
+    assert Comp._result_cache.stats()["hits"] == 2
+    ray.shutdown()
+
+
+def test_ray_blob():
+    ray.init(num_cpus=1)
+    try:
+        blob = RayBlob.put("out" * 1000)
+        assert blob.size == 3000 and blob.text == "out" * 1000
+        result = OutputProc(success=True, stdout=blob)
+
+        @ray.remote
+        def size(result):
+            return result.stdout.size, len(str(result.stdout))
+
+        assert ray.get(size.remote(result)) == (3000, 3000)
+        assert OutputProc.model_validate_json(result.model_dump_json()).stdout == "out" * 1000
+    finally:
+        ray.shutdown()
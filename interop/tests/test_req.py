@@ -1,6 +1,8 @@
 import os
 
-from interop.models.req import ExecReq
+import pytest
+
+from interop.models.req import ComputeReq, ExecReq
 
 
 def test_req():
@@ -13,3 +15,12 @@ def test_req():
     conf.model_dump()
     conf.json()
     ExecReq.model_validate(conf)
+
+
+@pytest.mark.parametrize(
+    "placement_group",
+    [{"bundles": []}, {"bundles": [{"CPU": 1}], "strategy": "NEAREST"}],
+)
+def test_placement_group_req(placement_group):
+    with pytest.raises(ValueError):
+        ComputeReq(placement_group=placement_group)
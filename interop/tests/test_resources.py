@@ -0,0 +1,71 @@
+import time
+
+import ray
+
+import interop.utils.ray
+from interop.utils.resources import NodeResources, ResourceSnapshot, ResourceView
+
+
+def test_snapshot():
+    nodes = {
+        "a": NodeResources("a", {"CPU": 4, "GPU": 1}, {"CPU": 1, "GPU": 1}),
+        "b": NodeResources("b", {"CPU": 8}, {"CPU": 6, "memory": 1e9}),
+    }
+    snapshot = ResourceSnapshot(nodes, time.monotonic())
+    assert snapshot.total("CPU") == 12 and snapshot.total("GPU") == 1
+    assert snapshot.total("TPU") is None
+    assert snapshot.available("CPU") == 7
+    assert snapshot.fits({"CPU": 1}) == ["a", "b"]
+    assert snapshot.best_node({"CPU": 1}) == "b"
+    assert snapshot.best_node({"CPU": 1, "GPU": 1}) == "a"
+    assert snapshot.best_node({"CPU": 16}) is None
+    assert nodes["b"].memory == 1e9 and nodes["a"].gpus == 1
+
+
+def test_resource_view(monkeypatch):
+    ray.init(num_cpus=1)
+    view = ResourceView(ttl=60)
+    snapshot = view.snapshot()
+    assert view.snapshot() is snapshot
+
+    (node,) = snapshot.nodes.values()
+    assert node.node_id == ray.get_runtime_context().get_node_id()
+    assert node.total["CPU"] == 1 and node.cpus == 1 and node.memory > 0
+    assert snapshot.fits({"CPU": 2}) == []
+
+    view.invalidate()
+    assert view.snapshot() is not snapshot
+    assert view.snapshot(max_age=0) is not snapshot
+
+    view.start(interval=0.05)
+    snapshot = view.snapshot()
+    time.sleep(0.5)
+    assert view.snapshot().timestamp > snapshot.timestamp
+    view.stop()
+
+    # the refresher survives failed queries, and reads fall back to direct ones
+    refresh, failures = view.refresh, []
+
+    def failing_refresh():
+        failures.append(1)
+        raise RuntimeError("GCS unavailable")
+
+    view.start(interval=0.05)
+    view.refresh = failing_refresh
+    time.sleep(0.3)
+    assert len(failures) > 1 and view._refresher.is_alive()
+    view.refresh = refresh
+    assert view.snapshot().age < 1
+    view.stop()
+
+    # without Ray's private state API, availability is estimated from the cluster's
+    calls, available_resources = [], ray.available_resources
+    monkeypatch.delattr("ray._private.state.available_resources_per_node")
+    monkeypatch.setattr(
+        ray, "available_resources", lambda: calls.append(1) or available_resources()
+    )
+    (node,) = view.refresh().nodes.values()
+    assert node.total["CPU"] == 1 and node.cpus == 1 and calls
+
+    assert interop.utils.ray.get_ray_res(["CPU", "TPU"]) == [1, None]
+    ray.shutdown()
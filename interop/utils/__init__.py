@@ -1,4 +1,14 @@
-from .execute import execute
+from .affinity import CoreAllocator
+from .cache import ExecuteCache
+from .execute import FileRef, OutputFile, execute
 from .misc import Logger, init_logger
 
-__all__ = ["execute", "Logger", "init_logger"]
+__all__ = [
+    "execute",
+    "FileRef",
+    "OutputFile",
+    "ExecuteCache",
+    "CoreAllocator",
+    "Logger",
+    "init_logger",
+]
@@ -0,0 +1,174 @@
+"""
+Provides a CPU core allocator that hands out disjoint sets of cores to concurrent
+external processes launched by :func:`interop.utils.execute`.
+"""
+
+import functools
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+__all__ = ["CoreAllocator", "CpuSet", "get_allocator", "thread_env"]
+
+# Environment variables controlling the size of common threading runtimes
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def thread_env(num_threads: int) -> Dict[str, str]:
+    """Returns environment variables that limit OpenMP/BLAS runtimes to `num_threads`."""
+    return {key: str(num_threads) for key in THREAD_ENV_VARS}
+
+
+def parse_cpulist(cpulist: str) -> List[int]:
+    """Parses a kernel cpu list e.g. `0-3,8,10-11`."""
+    cpus = []
+    for token in cpulist.strip().split(","):
+        if not token:
+            continue
+        start, _, stop = token.partition("-")
+        cpus.extend(range(int(start), int(stop or start) + 1))
+    return cpus
+
+
+def numa_nodes(sysfs: str = "/sys/devices/system/node") -> Dict[int, List[int]]:
+    """Returns a map of NUMA node ids to their cpus, or {} if topology is unavailable."""
+    nodes = {}
+    for path in Path(sysfs).glob("node[0-9]*"):
+        try:
+            nodes[int(path.name[4:])] = parse_cpulist((path / "cpulist").read_text())
+        except (OSError, ValueError):
+            continue
+    return nodes
+
+
+@dataclass
+class CpuSet:
+    """Cores reserved by :class:`CoreAllocator`, and the NUMA node they belong to (if any)."""
+
+    cpus: Tuple[int, ...]
+    node: Optional[int] = None
+    _fds: List[int] = field(default_factory=list, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.cpus)
+
+
+class CoreAllocator:
+    """
+    Allocates disjoint sets of cores, preferably within a single NUMA node. Cores are
+    reserved with advisory file locks in `lock_dir`, so reservations are disjoint across
+    threads as well as across processes (e.g. Ray workers) on the same machine, and are
+    released by the OS if the reserving process dies.
+
+    Parameters
+    ----------
+    cpus: Iterable[int], optional
+        Cores to allocate from. Defaults to the affinity mask of the current process.
+    lock_dir: str, optional
+        Directory holding one lock file per core. Defaults to `$TMPDIR/interop-cpus`.
+    """
+
+    def __init__(self, cpus: Optional[Iterable[int]] = None, lock_dir: Optional[str] = None):
+        if fcntl is None:  # pragma: no cover
+            raise NotImplementedError("Core allocation is not supported on windows.")
+
+        if cpus is None:
+            cpus = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else []
+        self.cpus = sorted(cpus) or list(range(os.cpu_count() or 1))
+        self.lock_dir = Path(lock_dir or Path(tempfile.gettempdir()) / "interop-cpus")
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+        # NUMA nodes restricted to the managed cores
+        self.nodes = {}
+        for node, node_cpus in sorted(numa_nodes().items()):
+            node_cpus = [cpu for cpu in node_cpus if cpu in self.cpus]
+            if node_cpus:
+                self.nodes[node] = node_cpus
+
+    def acquire(
+        self, num_cpus: int, timeout: Optional[float] = None, interval: float = 0.05
+    ) -> CpuSet:
+        """
+        Reserves `num_cpus` cores, waiting until enough cores are free.
+
+        Raises
+        ------
+        ValueError
+            If `num_cpus` exceeds the number of cores managed by the allocator.
+        TimeoutError
+            If the cores could not be reserved within `timeout` seconds.
+        """
+        if not 0 < num_cpus <= len(self.cpus):
+            raise ValueError(f"Cannot allocate {num_cpus} out of {len(self.cpus)} cores.")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            cpuset = self._try_acquire(num_cpus)
+            if cpuset is not None:
+                return cpuset
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Could not allocate {num_cpus} cores in {timeout} s.")
+            time.sleep(interval)
+
+    def release(self, cpuset: CpuSet) -> None:
+        """Releases the cores reserved in `cpuset`."""
+        while cpuset._fds:
+            os.close(cpuset._fds.pop())  # closing the fd drops its lock
+
+    @contextmanager
+    def reserve(self, num_cpus: int, timeout: Optional[float] = None) -> Iterator[CpuSet]:
+        """Reserves `num_cpus` cores for the duration of the context."""
+        cpuset = self.acquire(num_cpus, timeout=timeout)
+        try:
+            yield cpuset
+        finally:
+            self.release(cpuset)
+
+    def _try_acquire(self, num_cpus: int) -> Optional[CpuSet]:
+        # Prefer a single NUMA node, then fall back to cores spanning several nodes
+        candidates = [(node, cpus) for node, cpus in self.nodes.items() if len(cpus) >= num_cpus]
+        if all(len(cpus) < len(self.cpus) for cpus in self.nodes.values()):
+            candidates.append((None, self.cpus))
+
+        for node, cpus in candidates:
+            cpuset = CpuSet(cpus=(), node=node)
+            locked = []
+            for cpu in cpus:
+                fd = self._lock(cpu)
+                if fd is not None:
+                    locked.append(cpu)
+                    cpuset._fds.append(fd)
+                    if len(locked) == num_cpus:
+                        cpuset.cpus = tuple(locked)
+                        return cpuset
+            self.release(cpuset)
+        return None
+
+    def _lock(self, cpu: int) -> Optional[int]:
+        fd = os.open(self.lock_dir / f"cpu{cpu}.lock", os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+
+@functools.lru_cache(maxsize=None)
+def get_allocator() -> CoreAllocator:
+    """Returns the default per-process core allocator."""
+    return CoreAllocator()
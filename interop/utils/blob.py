@@ -0,0 +1,192 @@
+"""
+Provides blobs, lazy references to large program outputs (e.g. stdout) stored in a file or
+in the Ray object store, so models holding them stay cheap to copy, pickle and transfer.
+"""
+
+import abc
+import mmap
+import os
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+from pydantic_core import core_schema
+
+from .lazy import LazyModule
+
+ray = LazyModule("ray")
+
+__all__ = ["Blob", "FileBlob", "RayBlob"]
+
+
+class Blob(metaclass=abc.ABCMeta):
+    """
+    Reference to text or binary data loaded on access. Blobs are valid values of model
+    fields typed ``Union[str, Blob]``, pickled by reference, and serialized to JSON as a
+    reference (files) or as text (Ray objects).
+    """
+
+    encoding: str
+
+    @abc.abstractmethod
+    def read(self) -> bytes:  # pragma: no cover
+        """Loads the whole data in memory."""
+        ...
+
+    @property
+    @abc.abstractmethod
+    def size(self) -> int:  # pragma: no cover
+        """Size of the data (in bytes)."""
+        ...
+
+    @property
+    def text(self) -> str:
+        """Loads and decodes the whole data."""
+        return self.read().decode(self.encoding)
+
+    def iter_chunks(self, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Yields the data in chunks of at most `chunk_size` bytes."""
+        data = memoryview(self.read())
+        for start in range(0, len(data), chunk_size):
+            yield bytes(data[start : start + chunk_size])
+
+    def to_json(self) -> Union[str, Dict[str, str]]:
+        """Returns the JSON representation of the blob, its text by default."""
+        return self.text
+
+    def __str__(self) -> str:
+        return self.text
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            _validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                _serialize, info_arg=True
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: Any, handler: Any) -> Dict[str, Any]:
+        return {
+            "title": "FileBlob",
+            "type": "object",
+            "properties": {"path": {"type": "string"}, "encoding": {"type": "string"}},
+            "required": ["path"],
+        }
+
+
+class FileBlob(Blob):
+    """
+    Blob stored in a file, e.g. the stdout of :func:`interop.utils.execute` run with
+    `output_dir`. The file must outlive the blob and not be modified.
+
+    Parameters
+    ----------
+    path: str or Path
+        Path to the file.
+    encoding: str, optional
+        Encoding of text data. Default utf-8.
+    """
+
+    def __init__(self, path: Union[str, Path], encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+
+    def __fspath__(self) -> str:
+        return str(self.path)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def read(self) -> bytes:
+        return self.path.read_bytes()
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def iter_chunks(self, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        with open(self.path, "rb") as fp:
+            yield from iter(partial(fp.read, chunk_size), b"")
+
+    @contextmanager
+    def mmap(self) -> Union[mmap.mmap, bytes]:
+        """Memory-maps the file read-only. Empty files yield empty bytes."""
+        with open(self.path, "rb") as fp:
+            if os.fstat(fp.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    def to_json(self) -> Dict[str, str]:
+        return {"path": str(self.path), "encoding": self.encoding}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FileBlob) and self.to_json() == other.to_json()
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.encoding))
+
+    def __repr__(self) -> str:
+        return f"FileBlob({str(self.path)!r})"
+
+
+class RayBlob(Blob):
+    """
+    Blob stored in the Ray object store, see :meth:`put`. It is shared by all workers of
+    the job without copies on the same node, and lives as long as a reference to it.
+
+    Parameters
+    ----------
+    ref: ray.ObjectRef
+        Reference to the bytes object.
+    nbytes: int
+        Size of the data (in bytes).
+    encoding: str, optional
+        Encoding of text data. Default utf-8.
+    """
+
+    def __init__(self, ref: Any, nbytes: int, encoding: str = "utf-8"):
+        self.ref = ref
+        self.nbytes = nbytes
+        self.encoding = encoding
+
+    @classmethod
+    def put(cls, data: Union[str, bytes], encoding: str = "utf-8") -> "RayBlob":
+        """Puts `data` in the object store."""
+        if isinstance(data, str):
+            data = data.encode(encoding)
+        return cls(ray.put(data), len(data), encoding)
+
+    def read(self) -> bytes:
+        return ray.get(self.ref)
+
+    @property
+    def size(self) -> int:
+        return self.nbytes
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RayBlob) and self.ref == other.ref
+
+    def __hash__(self) -> int:
+        return hash(self.ref)
+
+    def __repr__(self) -> str:
+        return f"RayBlob({self.ref.hex()}, nbytes={self.nbytes})"
+
+
+def _validate(value: Any) -> Blob:
+    if isinstance(value, Blob):
+        return value
+    if isinstance(value, dict) and "path" in value:
+        return FileBlob(**value)
+    raise ValueError(f"Cannot convert {type(value).__name__} to a blob.")
+
+
+def _serialize(blob: Blob, info: core_schema.SerializationInfo) -> Any:
+    # kept as is in python mode, so dumps do not load the data
+    return blob.to_json() if info.mode_is_json() else blob
@@ -0,0 +1,162 @@
+"""
+Provides a content-addressed, size-bounded disk cache for :func:`interop.utils.execute`.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .execute import FileRef
+
+__all__ = ["ExecuteCache"]
+
+
+class ExecuteCache:
+    """
+    Disk cache of external command results keyed by a hash of the command, its
+    environment, and the contents of its input files. Entries store stdout,
+    stderr, the return code, and the collected output files. Least recently used
+    entries are evicted once the cache exceeds `max_bytes`.
+
+    Parameters
+    ----------
+    directory: str or Path
+        Directory in which cache entries are stored. Created if missing.
+    max_bytes: int, optional
+        Maximum size (in bytes) of all cache entries. Default 1 GiB.
+
+    Examples
+    --------
+    >>> cache = ExecuteCache("/scratch/johndoe/cache")
+    >>> success, output = execute(["command"], infiles, outfiles, cache=cache)
+    >>> cache.stats()
+    {'hits': 0, 'misses': 1, 'entries': 1, 'size': 1024}
+
+    """
+
+    suffix = ".pkl"
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 1 << 30):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        command: Union[str, List[str]],
+        infiles: Optional[Dict[str, Union[str, bytes, FileRef]]] = None,
+        outfiles: Optional[List[str]] = None,
+        *,
+        environment: Optional[Dict[str, str]] = None,
+        as_binary: Optional[List[str]] = None,
+        shell: Optional[bool] = False,
+    ) -> str:
+        """
+        Returns the hex digest identifying an execution. Files given as :class:`FileRef`
+        are hashed by content. An unset `environment` hashes as the contents of
+        ``os.environ``, inherited by the process.
+        """
+        digest = hashlib.blake2b(digest_size=32)
+
+        def update(*tokens: Any) -> None:
+            for token in tokens:
+                data = token if isinstance(token, bytes) else repr(token).encode()
+                digest.update(len(data).to_bytes(8, "little"))
+                digest.update(data)
+
+        update(command, bool(shell), sorted(outfiles or []), sorted(as_binary or []))
+        update(sorted((os.environ if environment is None else environment).items()))
+
+        for name in sorted(infiles or {}):
+            content = infiles[name]
+            update(name)
+            if isinstance(content, FileRef):
+                update(self._file_digest(content.path))
+            elif isinstance(content, str):
+                update(content.encode())
+            else:
+                update(bytes(content))
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for `key` (refreshing its recency) or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fp:
+                result = pickle.load(fp)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Atomically stores `result` for `key`, then evicts entries above `max_bytes`."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump(result, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache fits in `max_bytes`."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        for entry in self.directory.glob(f"*{self.suffix}"):
+            entry.unlink(missing_ok=True)
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters, and the number and total size of entries."""
+        sizes = [entry.stat().st_size for entry in self.directory.glob(f"*{self.suffix}")]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(sizes),
+            "size": sum(sizes),
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    @staticmethod
+    def _file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> bytes:
+        digest = hashlib.blake2b(digest_size=32)
+        with open(path, "rb") as fp:
+            for chunk in iter(lambda: fp.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.digest()
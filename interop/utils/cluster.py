@@ -0,0 +1,258 @@
+"""
+Provides a lifecycle manager for Ray clusters running on SLURM allocations.
+"""
+
+import logging
+import subprocess
+import threading
+from typing import Dict, List, Optional, Sequence, Union
+
+from . import ray as ray_utils
+from .execute import terminate_process
+from .launcher import Launcher, SlurmLauncher
+
+__all__ = ["RayCluster"]
+
+
+class RayCluster:
+    """
+    Owns the processes of a Ray cluster created on a SLURM allocation with
+    :func:`interop.utils.ray.setup_head_node` and :func:`interop.utils.ray.create_nodes`.
+    The cluster monitors the health of its nodes, re-launches dead workers, attaches
+    nodes from other (possibly heterogeneous) allocations, and tears all nodes down
+    deterministically: workers first, then the head node.
+
+    Parameters
+    ----------
+    temp_dir: str, optional
+        Path to use for Ray's temporary dir on every node.
+    timeout: float, optional
+        Max time (in seconds) to wait for nodes to be ready.
+    max_restarts: int, optional
+        Max number of times a dead worker node is re-launched. Default 3.
+    logger: logging.Logger, optional
+        Logger reporting node failures and restarts.
+    launcher: Launcher, optional
+        Launcher resolving nodes and starting processes on them. Defaults to
+        :class:`interop.utils.launcher.SlurmLauncher`.
+
+    Examples
+    --------
+    >>> with RayCluster(temp_dir="/scratch/johndoe/ray") as cluster:
+    ...     cluster.watch(interval=30)
+    ...     initialize_ray(exec_req={"address": cluster.head_node_ip})
+    ...     cluster.add_nodes("node[10-12]", jobid="1234", ray_args=["--num-gpus=4"])
+
+    """
+
+    def __init__(
+        self,
+        *,
+        temp_dir: Optional[str] = None,
+        timeout: float = 300,
+        max_restarts: int = 3,
+        logger: Optional[logging.Logger] = None,
+        launcher: Optional[Launcher] = None,
+    ):
+        self.temp_dir = temp_dir
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.logger = logger
+        self.launcher = launcher or SlurmLauncher()
+
+        self.head_node = None
+        self.head_node_ip = None
+        self.port = None
+        self.dashboard_port = None
+        self.procs: Dict[str, subprocess.Popen] = {}
+        self.restarts: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.error: Optional[Exception] = None
+
+        self._node_args: Dict[str, Dict[str, Sequence[str]]] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        """Address (ip:port) of the head node."""
+        return f"{self.head_node_ip}:{self.port}"
+
+    @property
+    def dashboard_url(self) -> Optional[str]:
+        """URL of the Ray dashboard, once the cluster is started."""
+        if self.dashboard_port is None:
+            return None
+        return f"http://{self.head_node_ip}:{self.dashboard_port}"
+
+    def start(self) -> str:
+        """Creates the head and worker nodes of the current allocation and returns the
+        cluster address."""
+        ray_utils.set_rlimit()
+        with ray_utils.reserve_head_ports() as ports:
+            self.head_node, self.head_node_ip, self.port, nodes_array = ray_utils.setup_head_node(
+                self.launcher, ports=ports
+            )
+            self.dashboard_port = ports.ports[1]
+            procs = ray_utils.create_nodes(
+                ports=ports,
+                head_node=self.head_node,
+                head_node_ip=self.head_node_ip,
+                port=self.port,
+                nodes_array=nodes_array,
+                temp_dir=self.temp_dir,
+                timeout=self.timeout,
+                launcher=self.launcher,
+            )
+        with self._lock:
+            self.procs.update(procs)
+        self._log(logging.INFO, f"Ray dashboard at {self.dashboard_url}.")
+        return self.address
+
+    def status(self) -> Dict[str, Optional[int]]:
+        """Returns the exit code of each node process, or None for running nodes."""
+        with self._lock:
+            return {node: proc.poll() for node, proc in self.procs.items()}
+
+    def check(self) -> List[str]:
+        """
+        Re-launches dead worker nodes and returns their names. Workers that exhausted
+        `max_restarts` are moved to `failed` and no longer monitored.
+
+        Raises
+        ------
+        RuntimeError
+            If the head node is dead, since the cluster cannot recover from it.
+        """
+        relaunched = []
+        with self._lock:
+            for node, code in self.status().items():
+                if code is None:
+                    continue
+                if node == self.head_node:
+                    raise RuntimeError(f"Ray head node {node} exited with code {code}.")
+
+                if self.restarts.get(node, 0) >= self.max_restarts:
+                    self._log(logging.ERROR, f"Worker node {node} failed with code {code}.")
+                    self.failed[node] = code
+                    del self.procs[node]
+                    continue
+
+                self._log(logging.WARNING, f"Re-launching worker node {node} (code {code}).")
+                self.restarts[node] = self.restarts.get(node, 0) + 1
+                self._launch_worker(node, **self._node_args.get(node, {}))
+                relaunched.append(node)
+        return relaunched
+
+    def watch(self, interval: float = 30) -> threading.Thread:
+        """
+        Checks the health of the nodes every `interval` seconds in a daemon thread. The
+        thread stops on shutdown or if the head node dies, in which case the error is
+        stored in `error`.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.check()
+                except Exception as exc:
+                    self.error = exc
+                    self._log(logging.ERROR, str(exc))
+                    return
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=run, name="RayClusterWatcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def add_nodes(
+        self,
+        nodes: Union[str, Sequence[str]],
+        *,
+        jobid: Optional[str] = None,
+        srun_args: Sequence[str] = (),
+        ray_args: Sequence[str] = (),
+        wait: bool = True,
+    ) -> List[str]:
+        """
+        Attaches worker nodes, e.g. from a later or heterogeneous job allocation.
+
+        Parameters
+        ----------
+        nodes: str or Sequence[str]
+            SLURM node list (e.g. `node[10-12]`) or node names.
+        jobid: str, optional
+            SLURM job id of the allocation owning `nodes`, if different from the current one.
+        srun_args: Sequence[str], optional
+            Additional args passed to `srun`.
+        ray_args: Sequence[str], optional
+            Additional args passed to `ray start` e.g. ``["--num-gpus=4"]``.
+        wait: bool, optional
+            Wait for the new nodes to register with the cluster.
+
+        Returns
+        -------
+        list[str]
+            Names of the attached nodes.
+        """
+        if self.head_node is None:
+            raise RuntimeError("Cluster must be started before attaching nodes.")
+
+        if isinstance(nodes, str):
+            nodes = self.launcher.hostnames(nodes)
+        srun_args = [*srun_args, f"--jobid={jobid}"] if jobid else list(srun_args)
+
+        with self._lock:
+            new_procs = {}
+            for node in nodes:
+                self._node_args[node] = {"srun_args": srun_args, "ray_args": list(ray_args)}
+                new_procs[node] = self._launch_worker(node, **self._node_args[node])
+            num_nodes = len(self.procs)
+
+        if wait:
+            ray_utils.wait_for_nodes(
+                self.address, num_nodes, procs=new_procs, timeout=self.timeout
+            )
+        return list(nodes)
+
+    def shutdown(self, timeout: int = 15) -> None:
+        """Stops monitoring and terminates the worker nodes, then the head node."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+        with self._lock:
+            workers = [node for node in self.procs if node != self.head_node]
+            for node in reversed(workers):
+                self._terminate(self.procs.pop(node), timeout)
+            if self.head_node in self.procs:
+                self._terminate(self.procs.pop(self.head_node), timeout)
+        self.launcher.cleanup(self.temp_dir)
+
+    def __enter__(self) -> "RayCluster":
+        if self.head_node is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def _launch_worker(
+        self, node: str, *, srun_args: Sequence[str] = (), ray_args: Sequence[str] = ()
+    ) -> subprocess.Popen:
+        cmd = ray_utils.worker_command(self.address, temp_dir=self.temp_dir, ray_args=ray_args)
+        self.procs[node] = self.launcher.launch(node, cmd, srun_args=srun_args)
+        return self.procs[node]
+
+    @staticmethod
+    def _terminate(proc: subprocess.Popen, timeout: int) -> None:
+        terminate_process(proc, timeout=timeout)
+        proc.wait()
+
+    def _log(self, level: int, msg: str) -> None:
+        if self.logger:
+            self.logger.log(level, msg)
@@ -1,13 +1,29 @@
 import functools
 import importlib
 import inspect
+import marshal
+import threading
 import types
-from typing import Any, Callable, ClassVar, Dict, Tuple, Type, Union, get_type_hints
+import weakref
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_type_hints,
+)
 
 from ..common.components import ComponentTypes
 from ..components import ComponentRay, ComponentRoot, MetaComponentRay
 from ..components.component_ray import compute_remote
 from ..models import DataModel, ExecReq
+from .hashing import content_hash
+from .memoize import MemoryCache, make_cache
 
 
 def singleton(func: Callable) -> Callable:
@@ -22,6 +38,63 @@ def singleton(func: Callable) -> Callable:
     return wrapper
 
 
+# Per-process registry of generated components, keyed by source function or class, then
+# by decorator kwargs, so that each component class is built once per process (worker)
+# while in use. Components reference their source, so the registry holds both weakly,
+# lest a source and its components never be collected.
+_components: "weakref.WeakKeyDictionary[Any, weakref.WeakValueDictionary]" = (
+    weakref.WeakKeyDictionary()
+)
+_components_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converts (nested) dicts, lists and sets into hashable tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+def registered(build: Callable) -> Callable:
+    """
+    Caches components built by `build(source, **kwargs)` in a per-process registry, as
+    long as they are referenced. Components built with unhashable kwargs, or from
+    sources that cannot be weakly referenced, are not cached.
+    """
+
+    # name of the source arg e.g. `execute` or `cls`
+    name = next(iter(inspect.signature(build).parameters))
+
+    @functools.wraps(build)
+    def wrapper(*args, **kwargs) -> Type:
+        source = args[0] if args else kwargs.pop(name)
+        key = _freeze(kwargs)
+        try:
+            hash(key)
+            weakref.ref(source)
+        except TypeError:
+            return build(source, **kwargs)
+
+        with _components_lock:
+            built = _components.setdefault(source, weakref.WeakValueDictionary())
+            Component = built.get(key)
+            if Component is None:
+                Component = built[key] = build(source, **kwargs)
+            return Component
+
+    return wrapper
+
+
+def clear_registry() -> None:
+    """Removes all components from the per-process registry."""
+    with _components_lock:
+        _components.clear()
+
+
 def _comp_adapter(func_or_cls: Union[Callable, Type], **kwargs) -> Type:
     if inspect.isfunction(func_or_cls):
         # check for cython via ray._private.inspect_util.is_cython?
@@ -55,6 +128,44 @@ def _get_hint(execute: Callable, model_type: str, Model: Type[DataModel] = None)
     return Model
 
 
+# Decorator kwargs that are not compute requirements
+COMPONENT_OPTIONS = ("ctype", "in_model", "out_model", "meta", "cache", "version", "trusted")
+
+
+def _set_options(Component: Type[ComponentRoot], source: Union[Callable, Type], **kwargs) -> None:
+    Component._trusted = bool(kwargs.get("trusted"))
+    Component._result_cache = make_cache(kwargs.get("cache"))
+    Component._cache_id = f"{source.__module__}.{_cache_name(source, Component._result_cache)}"
+    Component._cache_id += f":{kwargs.get('version')}"
+
+
+def _cache_name(source: Union[Callable, Type], cache: Optional[Any]) -> str:
+    """
+    Returns the qualified name of `source` in cache keys. Local functions and classes
+    (e.g. closures) may share their qualname, so their name also includes a digest of
+    their code and closure values, or their id if the cache is private to the process.
+
+    Raises
+    ------
+    ValueError
+        If the cache is shared by processes, e.g. "ray" or "disk:...", but the local
+        `source` cannot be hashed.
+    """
+    if cache is None or "<locals>" not in source.__qualname__:
+        return source.__qualname__
+    try:
+        cells = tuple(cell.cell_contents for cell in source.__closure__ or ())
+        digest = content_hash(marshal.dumps(source.__code__), cells, source.__defaults__)
+    except (AttributeError, TypeError, ValueError) as exc:
+        if isinstance(cache, MemoryCache):
+            return f"{source.__qualname__}@{id(source):x}"
+        raise ValueError(
+            f"Cannot share the results of local {source.__qualname__}: define it at module "
+            "level, or use an in-process cache."
+        ) from exc
+    return f"{source.__qualname__}@{digest}"
+
+
 def _split_kwargs(
     execute: Callable,
     **kwargs,
@@ -62,9 +173,7 @@ def _split_kwargs(
     ComponentType = getattr(ComponentTypes, kwargs.get("ctype", "default"), None)
     InModel = kwargs.get("in_model", None)
     OutModel = kwargs.get("out_model", None)
-    compute_req = {
-        key: kwargs[key] for key in kwargs if key not in ["ctype", "in_model", "out_model", "meta"]
-    }
+    compute_req = {key: kwargs[key] for key in kwargs if key not in COMPONENT_OPTIONS}
 
     if ComponentType is None:
         raise NotImplementedError(f"Component type {ComponentType} not supported.")
@@ -82,6 +191,7 @@ def check_reserved_keyword(cls):
         "input",
         "output",
         "compute_remote",  # need to generalize
+        "compute_remote_iter",
     ]:
         if hasattr(cls, attribute):
             raise AttributeError(f"Class {cls.__name__} already defines attribute `{attribute}`.")
@@ -102,10 +212,11 @@ def meta_as_comp(cls: Type, **kwargs) -> Type:
         "__module__": cls.__module__,
         "__qualname__": cls.__qualname__,
         "__doc__": cls.__doc__,
-        "_from_meta": functools.partial(class_as_comp, **kwargs),
+        # not registered: built components are bounded by the warm cache of the worker
+        "_from_meta": functools.partial(class_as_comp.__wrapped__, **kwargs),
         "input": InModel,
         "output": OutModel,
-        "__annotations__": {"input": ClassVar(InModel), "output": ClassVar(OutModel)},
+        "__annotations__": {"input": ClassVar[InModel], "output": ClassVar[OutModel]},
     }
     MetaMetaComp, _, _ = types.prepare_class(
         f"MetaComponent({cls.__name__})",
@@ -117,6 +228,7 @@ def meta_as_comp(cls: Type, **kwargs) -> Type:
     return MetaComp
 
 
+@registered
 def class_as_comp(cls: Type, **kwargs) -> Type[ComponentRoot]:
     # Should we allow overriding existing components?
     # check_reserved_keyword(cls)
@@ -163,10 +275,13 @@ def class_as_comp(cls: Type, **kwargs) -> Type[ComponentRoot]:
         ), f"ComponentType {ComponentType} does not support remote compute"
         exec_req = ExecReq(compute_req=compute_req)
         NewClass._compute_remote = compute_remote(NewClass, exec_req)
+        NewClass._exec_req = exec_req
 
+    _set_options(NewClass, cls, **kwargs)
     return NewClass
 
 
+@registered
 def func_as_comp(execute: Callable, **kwargs) -> Type:
     ComponentType, InModel, OutModel, compute_req = _split_kwargs(execute, **kwargs)
 
@@ -203,6 +318,9 @@ def func_as_comp(execute: Callable, **kwargs) -> Type:
             assert issubclass(ComponentType, ComponentRay)
             exec_req = ExecReq(compute_req=compute_req)
             Component._compute_remote = compute_remote(Component, exec_req)
+            Component._exec_req = exec_req
+
+        _set_options(Component, execute, **kwargs)
         return Component
 
     return wrapper(**kwargs)
@@ -219,6 +337,16 @@ def component(*args, **kwargs) -> Type:
         An immutable input data class that defines the required and optional fields for execution.
     out_model: DataModel, optional
         An immutable output data class that defines the required and optional fields.
+    cache: bool, str or ResultCache, optional
+        Memoizes results by content hash of the validated input, execute kwargs, and
+        component identity. Either True or "memory" (in-process LRU), "ray" (shared by
+        the workers of a Ray job), "disk:<directory>", or a
+        :class:`interop.utils.memoize.ResultCache`. Only for pure components.
+    version: str, optional
+        Component version, part of the cache key. Bump it when results change.
+    trusted: bool, optional
+        Skips validation of input and output data, e.g. for internal components fed by
+        other components. See :meth:`DataModel.construct_trusted` and ``ExecReq.trusted``.
 
     Returns
     -------
@@ -1,6 +1,5 @@
-from typing import Any, Dict
+from typing import Any
 
-import numpy
 from pydantic.types import (
     DirectoryPath,
     FilePath,
@@ -10,7 +9,7 @@ from pydantic.types import (
     PositiveInt,
 )
 
-__all__ = [
+__all__ = [  # noqa: F822 (NumpyArray is resolved lazily)
     "PositiveFloat",
     "NonNegativeInt",
     "NumpyArray",
@@ -27,44 +26,10 @@ NUMPY_FLOAT = "f8"
 NUMPY_UNI = "U4"
 
 
-class _TypedArray(numpy.ndarray):  # pragma: no cover
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.model_validate
+def __getattr__(name: str) -> Any:
+    # NumpyArray subclasses numpy.ndarray, so numpy is only imported once it is used
+    if name == "NumpyArray":
+        from .arrays import NumpyArray
 
-    @classmethod
-    def validate(cls, v):
-        try:
-            v = numpy.asarray(v, dtype=cls._dtype)
-        except ValueError:
-            raise ValueError("Could not cast {} to NumPy Array!".format(v))
-
-        return v
-
-    @classmethod
-    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
-        dt = cls._dtype
-        if dt is int or numpy.issubdtype(dt, numpy.integer):
-            items = {"type": "number", "multipleOf": 1.0}
-        elif dt is float or numpy.issubdtype(dt, numpy.floating):
-            items = {"type": "number"}
-        elif dt is str or numpy.issubdtype(dt, numpy.string_):
-            items = {"type": "string"}
-        elif dt is bool or numpy.issubdtype(dt, numpy.bool_):
-            items = {"type": "boolean"}
-        else:  # assume array otherwise
-            items = {"type": "array"}
-        field_schema.update(type="array", items=items)
-
-
-class _ArrayMeta(type):  # pragma: no cover
-    def __getitem__(cls, dtype):
-        return type("NumpyArray", (_TypedArray,), {"_dtype": dtype})
-
-
-class NumpyArray(numpy.ndarray, metaclass=_ArrayMeta):
-    # NumpyArray[dtype] calls metaclass.__getitem__(cls, dtype)
-    # In contrast, NumpyArray.getitem(dtype) calls class.__getitem__(cls, dtype).
-    # For this reason, __getitem__ is defined in _ArrayMeta. This way we can
-    # define numpy array types: NumpyArray[int], etc.
-    pass
+        return NumpyArray
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,11 +9,283 @@ import subprocess
 import sys
 import tempfile
 import time
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
 from threading import Thread
-from typing import Any, BinaryIO, Dict, List, Optional, TextIO, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from .affinity import CoreAllocator, CpuSet, get_allocator, thread_env
+from .blob import FileBlob
+
+if TYPE_CHECKING:
+    from .cache import ExecuteCache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Linux ioctl request code for cloning a file's extents (see ioctl_ficlone(2))
+FICLONE = 0x40049409
+
+STAGING_STRATEGIES = ("hardlink", "reflink", "symlink", "copy")
+
+
+@dataclass(frozen=True)
+class FileRef:
+    """
+    Reference to an existing file on disk to be staged in the scratch directory
+    without loading its contents in memory.
+
+    Parameters
+    ----------
+    path: str or Path
+        Path to the source file.
+    strategy: str, optional
+        One of `hardlink`, `reflink`, `symlink`, or `copy` (default `hardlink`).
+        A reflink shares the data blocks of the source file on copy-on-write
+        filesystems (btrfs, xfs) and otherwise falls back to an in-kernel copy.
+    fallback: bool, optional
+        Copy the file if a hardlink or reflink cannot be created (e.g. across
+        filesystems). Default True.
+
+    Note that hardlinked and symlinked files share their data with the source,
+    so commands must not modify them in place.
+    """
+
+    path: Union[str, Path]
+    strategy: str = "hardlink"
+    fallback: bool = True
+
+    def __post_init__(self):
+        if self.strategy not in STAGING_STRATEGIES:
+            raise ValueError(
+                f"Staging strategy {self.strategy} not supported. Use one of"
+                f" {STAGING_STRATEGIES}."
+            )
+
+
+class OutputFile(FileBlob):
+    """
+    Lazy handle to an output file collected by :func:`disk_files`. Contents are
+    only loaded in memory on request, so large outputs can be memory-mapped,
+    streamed in chunks, or moved elsewhere without being read. See :class:`FileBlob`.
+
+    Parameters
+    ----------
+    path: str or Path
+        Path to the output file.
+    binary: bool, optional
+        Whether `read` and `iter_chunks` return bytes instead of str. Default False.
+    encoding: str, optional
+        Encoding of text files. Default utf-8.
+    """
+
+    def __init__(self, path: Union[str, Path], binary: bool = False, encoding: str = "utf-8"):
+        super().__init__(path, encoding)
+        self.binary = binary
+
+    def __repr__(self) -> str:
+        return f"OutputFile({str(self.path)!r}, binary={self.binary})"
+
+    @property
+    def text(self) -> str:
+        return super().read().decode(self.encoding)
+
+    def read(self) -> Union[str, bytes]:
+        """Loads the whole file in memory."""
+        return super().read() if self.binary else self.text
+
+    def iter_chunks(self, chunk_size: int = 1 << 20) -> Iterator[Union[str, bytes]]:
+        """Yields the file contents in chunks of at most `chunk_size` bytes (characters)."""
+        if self.binary:
+            yield from super().iter_chunks(chunk_size)
+            return
+        with open(self.path, encoding=self.encoding) as fp:
+            yield from iter(partial(fp.read, chunk_size), "")
+
+    def move(self, directory: Union[str, Path]) -> "OutputFile":
+        """
+        Atomically moves the file into `directory` and updates the handle path.
+        Across filesystems, the file is first copied to a temporary file in
+        `directory` and then renamed, so readers never see a partial file.
+        """
+        dst = Path(directory) / self.path.name
+        try:
+            os.replace(self.path, dst)
+        except OSError:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{self.path.name}.")
+            os.close(fd)
+            try:
+                shutil.copyfile(self.path, tmp)
+                os.replace(tmp, dst)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            os.unlink(self.path)
+        self.path = dst
+        return self
+
+
+def _move_lazy(outfiles: Dict[str, Any], directory: Union[str, Path]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for value in outfiles.values():
+        values = value.values() if isinstance(value, dict) else [value]
+        for handle in values:
+            if isinstance(handle, OutputFile):
+                handle.move(directory)
+
+
+def _expand_globs(cwd: Path, patterns: List[str]) -> List[str]:
+    return [
+        fpath.name if "*" in pattern else pattern
+        for pattern in patterns
+        for fpath in cwd.glob(pattern)
+    ]
+
+
+def _copy_file_range(src: Path, dst: Path) -> None:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass
+
+        if not hasattr(os, "copy_file_range"):
+            shutil.copyfileobj(fsrc, fdst)
+            return
+
+        remaining = os.fstat(fsrc.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def stage_file(ref: FileRef, dst: Union[str, Path]) -> Path:
+    """
+    Stages a file reference at `dst` according to its staging strategy.
+
+    Parameters
+    ----------
+    ref: FileRef
+        Source file reference.
+    dst: str or Path
+        Destination path. Must not exist.
+
+    Returns
+    -------
+    Path
+        Destination path.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the source file does not exist.
+    OSError
+        If staging fails and `ref.fallback` is False.
+    """
+    src, dst = Path(ref.path).resolve(), Path(dst)
+    if not src.is_file():
+        raise FileNotFoundError(f"Staged file {src} does not exist.")
+
+    try:
+        if ref.strategy == "hardlink":
+            os.link(src, dst)
+        elif ref.strategy == "symlink":
+            os.symlink(src, dst)
+        elif ref.strategy == "reflink":
+            _copy_file_range(src, dst)
+        else:
+            shutil.copyfile(src, dst)
+    except OSError:
+        if not ref.fallback or ref.strategy in ("symlink", "copy"):
+            raise
+        if dst.exists():
+            dst.unlink()
+        shutil.copyfile(src, dst)
+
+    return dst
+
+
+class RusagePopen(subprocess.Popen):
+    """
+    Popen subclass that reaps the child with ``os.wait4`` to record its resource usage
+    (``rusage``) and the wall time elapsed between spawning and reaping it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.rusage = None
+        self.start_time = time.perf_counter()
+        self.end_time = None
+        super().__init__(*args, **kwargs)
+
+    def _wait4(self, pid: int, wait_flags: int) -> Tuple[int, int]:
+        pid, sts, rusage = os.wait4(pid, wait_flags)
+        if pid == self.pid:
+            self.rusage = rusage
+            self.end_time = time.perf_counter()
+        return pid, sts
+
+    # Popen.wait reaps the child with _try_wait, while Popen.poll goes through
+    # _internal_poll, so both are routed to os.wait4 when available.
+    def _try_wait(self, wait_flags):
+        if not hasattr(os, "wait4"):  # pragma: no cover
+            return super()._try_wait(wait_flags)
+        try:
+            return self._wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return self.pid, 0
+
+    def _internal_poll(self, *args, **kwargs):
+        if hasattr(os, "wait4"):
+            kwargs["_waitpid"] = self._wait4
+        return super()._internal_poll(*args, **kwargs)
+
+    def resources(self) -> Dict[str, Any]:
+        """
+        Returns the wall time (s), user/system CPU time (s), max resident set size (bytes),
+        block I/O operations, and context switches of the reaped child. Fields other than
+        wall time are None if the child was not reaped through ``os.wait4``.
+        """
+        end_time = self.end_time or time.perf_counter()
+        usage = {"wall_time": end_time - self.start_time}
+        if self.rusage is None:
+            return {**usage, **{key: None for key in _RUSAGE_FIELDS}}
+
+        # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+        rss_unit = 1 if sys.platform == "darwin" else 1024
+        usage.update({key: getattr(self.rusage, field) for key, field in _RUSAGE_FIELDS.items()})
+        usage["max_rss"] *= rss_unit
+        return usage
+
+
+_RUSAGE_FIELDS = {
+    "user_time": "ru_utime",
+    "system_time": "ru_stime",
+    "max_rss": "ru_maxrss",
+    "block_input": "ru_inblock",
+    "block_output": "ru_oublock",
+    "voluntary_switches": "ru_nvcsw",
+    "involuntary_switches": "ru_nivcsw",
+}
 
 
 def terminate_process(proc: Any, timeout: int = 15) -> None:  # pragma: no cover
@@ -34,12 +306,55 @@ def terminate_process(proc: Any, timeout: int = 15) -> None:  # pragma: no cover
             proc.kill()
 
 
+def _read_from_buffer(
+    buffer: BinaryIO, storage: BinaryIO, sysio: TextIO, pass_output_forward: bool
+) -> None:
+    for r in iter(partial(buffer.read, 1024), b""):
+        storage.write(r)
+        if pass_output_forward:
+            sysio.write(r.decode())
+
+
+def _output_storage(output_dir: Optional[str], name: str) -> BinaryIO:
+    if output_dir is None:
+        return io.BytesIO()
+    os.makedirs(output_dir, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=output_dir, prefix=f"{name}-", delete=False)
+
+
+def _discard_output(storage: BinaryIO) -> None:
+    storage.close()
+    if not isinstance(storage, io.BytesIO):
+        with suppress(FileNotFoundError):
+            os.unlink(storage.name)
+
+
+def _spawn(
+    args: List[str], popen_kwargs: Dict[str, Any], stdout: BinaryIO, stderr: BinaryIO
+) -> "RusagePopen":
+    # removes the output files if the process cannot be spawned
+    try:
+        return RusagePopen(args, **popen_kwargs)
+    except BaseException:
+        _discard_output(stdout)
+        _discard_output(stderr)
+        raise
+
+
+def _output_value(storage: BinaryIO) -> Union[str, FileBlob]:
+    if isinstance(storage, io.BytesIO):
+        return storage.getvalue().decode()
+    storage.close()
+    return FileBlob(storage.name)
+
+
 @contextmanager  # pragma: no cover
 def popen(
     args: List[str],
     append_prefix: bool = False,
     popen_kwargs: Optional[Dict[str, Any]] = None,
     pass_output_forward: bool = False,
+    output_dir: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Opens a background task
@@ -55,6 +370,9 @@ def popen(
             Any keyword arguments to use when launching the process
         pass_output_forward: bool
             Whether to pass the stdout and stderr forward to the system's stdout and stderr
+        output_dir: str, optional
+            Directory to which the stdout and stderr are written, in which case they are
+            returned as :class:`interop.utils.blob.FileBlob` instead of strings
     Returns
     -------
         exe: dict
@@ -63,6 +381,7 @@ def popen(
                 <li>proc: Popen object describing the background task</li>
                 <li>stdout: String value of the standard output of the task</li>
                 <li>stdeer: String value of the standard error of the task</li>
+                <li>resources: Resource usage of the task, see RusagePopen.resources</li>
             </ul>
     """
     args = list(args)
@@ -85,16 +404,17 @@ def popen(
         # Allow using CTRL_C_EVENT / CTRL_BREAK_EVENT
         popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
 
-    # Route the standard error and output
-    popen_kwargs["stdout"] = subprocess.PIPE
-    popen_kwargs["stderr"] = subprocess.PIPE
+    # Prepare BytesIO objects or files to store the stdout and stderr
+    stdout = _output_storage(output_dir, "stdout")
+    stderr = _output_storage(output_dir, "stderr")
 
-    # Prepare StringIO objects to store the stdout and stderr
-    stdout = io.BytesIO()
-    stderr = io.BytesIO()
+    # Route the standard error and output, straight to files unless forwarded
+    direct = output_dir is not None and not pass_output_forward
+    popen_kwargs["stdout"] = stdout if direct else subprocess.PIPE
+    popen_kwargs["stderr"] = stderr if direct else subprocess.PIPE
 
     # Ready the output
-    ret = {"proc": subprocess.Popen(args, **popen_kwargs)}
+    ret = {"proc": _spawn(args, popen_kwargs, stdout, stderr)}
 
     # Spawn threads that will read from the stderr/stdout
     #  The PIPE uses a buffer with finite capacity. The underlying
@@ -102,16 +422,16 @@ def popen(
     #  because the buffer is full. These threads continuously read
     #  from the buffers to ensure that they do not fill.
     #
-    def read_from_buffer(buffer: BinaryIO, storage: io.BytesIO, sysio: TextIO):
-        for r in iter(partial(buffer.read, 1024), b""):
-            storage.write(r)
-            if pass_output_forward:
-                sysio.write(r.decode())
-
-    stdout_reader = Thread(target=read_from_buffer, args=(ret["proc"].stdout, stdout, sys.stdout))
-    stdout_reader.start()
-    stderr_reader = Thread(target=read_from_buffer, args=(ret["proc"].stderr, stderr, sys.stderr))
-    stderr_reader.start()
+    readers = []
+    if not direct:
+        streams = (ret["proc"].stdout, stdout, sys.stdout), (
+            ret["proc"].stderr,
+            stderr,
+            sys.stderr,
+        )
+        for stream in streams:
+            readers.append(Thread(target=_read_from_buffer, args=(*stream, pass_output_forward)))
+            readers[-1].start()
 
     # Yield control back to the main thread
     try:
@@ -125,12 +445,13 @@ def popen(
             terminate_process(ret["proc"])
         finally:
             # Wait for the reader threads to finish
-            stdout_reader.join()
-            stderr_reader.join()
+            for reader in readers:
+                reader.join()
 
             # Retrieve the standard output for the process
-            ret["stdout"] = stdout.getvalue().decode()
-            ret["stderr"] = stderr.getvalue().decode()
+            ret["stdout"] = _output_value(stdout)
+            ret["stderr"] = _output_value(stderr)
+            ret["resources"] = ret["proc"].resources()
 
 
 @contextmanager  # pragma: no cover
@@ -153,8 +474,7 @@ def environ_context(config: Any = None, env: Optional[Dict[str, str]] = None) ->
 
     temporary_env = {}
     if config:
-        temporary_env["OMP_NUM_THREADS"] = str(config.ncores)
-        temporary_env["MKL_NUM_THREADS"] = str(config.ncores)
+        temporary_env.update(thread_env(config.ncores))
 
     if env:
         temporary_env.update(env)
@@ -173,10 +493,14 @@ def environ_context(config: Any = None, env: Optional[Dict[str, str]] = None) ->
 
 def execute(
     command: List[str],
-    infiles: Optional[Dict[str, str]] = None,
+    infiles: Optional[Dict[str, Union[str, bytes, FileRef]]] = None,
     outfiles: Optional[List[str]] = None,
     *,
     outfiles_track: Optional[List[str]] = None,
+    outfiles_lazy: Optional[List[str]] = None,
+    outfiles_dir: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    collect_workers: Optional[int] = None,
     as_binary: Optional[List[str]] = None,
     scratch_name: Optional[str] = None,
     scratch_directory: Optional[str] = None,
@@ -189,17 +513,23 @@ def execute(
     environment: Optional[Dict[str, str]] = None,
     shell: Optional[bool] = False,
     exit_code: Optional[int] = 0,
+    cache: Optional["ExecuteCache"] = None,
+    num_cpus: Optional[int] = None,
+    allocator: Optional[CoreAllocator] = None,
 ) -> Tuple[bool, Dict[str, Any]]:  # pragma: no cover
     """
     Runs a process in the background until complete.
-    Returns True if exit code <= exit_code (default 0)
+    Returns True if exit code <= exit_code (default 0), and a dict with the
+    `proc`, `stdout`, `stderr`, `outfiles`, `scratch_directory`, and the
+    `resources` consumed by the process (see :class:`interop.models.ResourceUsage`).
 
     Parameters
     ----------
     command : list of str
-    infiles : Dict[str] = str
+    infiles : Dict[str] = str or FileRef
         Input file names (names, not full paths) and contents.
-        to be written in scratch dir. May be {}.
+        to be written in scratch dir. May be {}. Contents given as a
+        :class:`FileRef` are staged from disk instead of written from memory.
     outfiles : List[str] = None
         Output file names to be collected after execution into
         values. May be {}.
@@ -208,6 +538,18 @@ def execute(
         For specified filename in `outfiles_track`, the file path instead of contents
         is stored in `outfiles`. To ensure tracked files are not deleted after execution,
         you must set `scratch_messy=True`.
+    outfiles_lazy: List[str], optional
+        Keys of `outfiles` to collect as :class:`OutputFile` handles that load contents
+        on demand. Requires either `outfiles_dir` or `scratch_messy=True`.
+    outfiles_dir: str, optional
+        Directory to which files in `outfiles_lazy` are atomically moved before the
+        scratch directory is removed.
+    output_dir: str, optional
+        Directory to which the stdout and stderr of the process are streamed. They are
+        then returned as :class:`interop.utils.blob.FileBlob` handles loading contents
+        on access, instead of strings, and the run is not cached.
+    collect_workers: int, optional
+        Number of threads used to collect the files matching a glob key in `outfiles`.
     as_binary : List[str] = None
         Keys of `infiles` or `outfiles` to be treated as bytes.
     scratch_name : str, optional
@@ -232,11 +574,27 @@ def execute(
         Run command through the shell.
     exit_code: int, optional
         The exit code above which the process is considered failure.
+    cache: ExecuteCache, optional
+        Cache of previous results. On a hit, no process is spawned and the returned
+        ``proc`` and ``scratch_directory`` are None. Only successful runs that exit on
+        their own are stored, not runs interrupted or killed by a signal. Runs with
+        `outfiles_track` or `outfiles_lazy` are never cached since their outputs live
+        on disk, nor runs with `scratch_exist_ok` since their inputs may.
+        See :class:`interop.utils.cache.ExecuteCache`.
+    num_cpus: int, optional
+        Number of cores to run on, typically ``exec_req.compute_req.num_cpus``. Sets the
+        OpenMP/BLAS thread env vars (unless given in `environment`) and, where supported,
+        pins the process to a set of cores disjoint from other concurrent executions.
+    allocator: CoreAllocator, optional
+        Allocator reserving cores for `num_cpus`. Defaults to the per-process allocator.
+        See :class:`interop.utils.affinity.CoreAllocator`.
 
     Raises
     ------
     FileExistsError
         If any file in `blocking` is present
+    ValueError
+        If `outfiles_lazy` is set but lazy outputs would be deleted with the scratch dir
 
     Examples
     --------
@@ -251,9 +609,7 @@ def execute(
     if infiles is None:
         infiles = {}
 
-    if outfiles is None:
-        outfiles = []
-    outfiles = {k: None for k in outfiles}
+    outfiles = _format_outfiles(outfiles, outfiles_lazy, outfiles_dir, scratch_messy)
 
     # Check for blocking files
     if blocking_files is not None:
@@ -261,6 +617,26 @@ def execute(
             if os.path.isfile(fl):
                 raise FileExistsError("Existing file can interfere with execute operation.", fl)
 
+    cache_key, cached = _cache_lookup(
+        cache,
+        command,
+        infiles,
+        outfiles,
+        # files left in an existing scratch dir are not part of the key
+        track=bool(outfiles_track or outfiles_lazy or output_dir or scratch_exist_ok),
+        environment=environment,
+        as_binary=as_binary,
+        shell=shell,
+    )
+    if cached is not None:
+        retcode = cached.pop("retcode")
+        return retcode <= exit_code, {
+            "proc": None,
+            "scratch_directory": None,
+            "resources": None,
+            **cached,
+        }
+
     # Format popen
     popen_kwargs = {}
     if environment is not None:
@@ -282,21 +658,116 @@ def execute(
             cwd=scrdir,
             as_binary=as_binary,
             outfiles_track=outfiles_track,
+            outfiles_lazy=outfiles_lazy,
+            collect_workers=collect_workers,
         ) as extrafiles:
-            with popen(command, popen_kwargs=popen_kwargs) as proc:
+            with pin_cpus(num_cpus, popen_kwargs, allocator=allocator) as cpuset, popen(
+                command, popen_kwargs=popen_kwargs, output_dir=output_dir
+            ) as proc:
+                set_affinity(proc["proc"], cpuset)
                 # Wait for the subprocess to complete or the timeout to expire
+                interrupted = False
                 if interupt_after is None:
                     proc["proc"].wait(timeout=timeout)
                 else:
                     time.sleep(interupt_after)
+                    interrupted = proc["proc"].poll() is None
                     terminate_process(proc["proc"])
             retcode = proc["proc"].poll()
+        if outfiles_dir is not None:
+            _move_lazy(extrafiles, outfiles_dir)
         proc["outfiles"] = extrafiles
     proc["scratch_directory"] = scrdir
 
+    # interrupted or killed runs have truncated outputs
+    if retcode <= exit_code and retcode >= 0 and not interrupted:
+        _cache_store(cache, cache_key, retcode, proc)
+
     return retcode <= exit_code, proc
 
 
+@contextmanager
+def pin_cpus(
+    num_cpus: Optional[int],
+    popen_kwargs: Dict[str, Any],
+    *,
+    allocator: Optional[CoreAllocator] = None,
+) -> Optional[CpuSet]:
+    """
+    Updates `popen_kwargs` so that the child process runs `num_cpus` threads, and reserves
+    cores for the duration of the context. Yields the reserved cores, to which the child is
+    pinned with :func:`set_affinity` once spawned, or None if `num_cpus` is None or pinning
+    is not supported on this platform. Thread variables of an explicit environment
+    (``popen_kwargs["env"]``) take precedence over the computed ones, not inherited ones.
+    """
+    if num_cpus is None:
+        yield None
+        return
+
+    env = popen_kwargs.get("env")
+    if env is None:
+        popen_kwargs["env"] = {**os.environ, **thread_env(num_cpus)}
+    else:
+        popen_kwargs["env"] = {**thread_env(num_cpus), **env}
+
+    if not hasattr(os, "sched_setaffinity") or fcntl is None:  # pragma: no cover
+        yield None
+        return
+
+    allocator = allocator or get_allocator()
+    with allocator.reserve(min(num_cpus, len(allocator.cpus))) as cpuset:
+        yield cpuset
+
+
+def set_affinity(proc: subprocess.Popen, cpuset: Optional[CpuSet]) -> None:
+    """
+    Pins the running process `proc` to `cpuset`, if any. Done after spawning rather than in
+    ``preexec_fn``, which is unsafe in the presence of threads.
+    """
+    if cpuset is None:
+        return
+    try:
+        os.sched_setaffinity(proc.pid, cpuset.cpus)
+    except ProcessLookupError:  # pragma: no cover
+        pass  # already exited
+
+
+def _format_outfiles(
+    outfiles: Optional[List[str]],
+    outfiles_lazy: Optional[List[str]],
+    outfiles_dir: Optional[str],
+    scratch_messy: bool,
+) -> Dict[str, None]:
+    if outfiles_lazy and outfiles_dir is None and not scratch_messy:
+        raise ValueError("Lazy outfiles require either outfiles_dir or scratch_messy=True.")
+    return {k: None for k in outfiles or []}
+
+
+_CACHED_KEYS = ("stdout", "stderr", "outfiles")
+
+
+def _cache_lookup(
+    cache: Optional["ExecuteCache"],
+    command: List[str],
+    infiles: Dict[str, Union[str, bytes, FileRef]],
+    outfiles: Dict[str, None],
+    *,
+    track: bool,
+    **kwargs: Optional[Dict[str, Any]],
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    if cache is None or track:
+        return None, None
+    cache_key = cache.key(command, infiles, list(outfiles), **kwargs)
+    return cache_key, cache.get(cache_key)
+
+
+def _cache_store(
+    cache: Optional["ExecuteCache"], cache_key: Optional[str], retcode: int, proc: Dict[str, Any]
+) -> None:
+    if cache_key is not None:
+        cache.put(cache_key, {"retcode": retcode, **{key: proc[key] for key in _CACHED_KEYS}})
+
+
 @contextmanager  # pragma: no cover
 def temporary_directory(
     child: str = None,
@@ -367,19 +838,22 @@ def temporary_directory(
 
 @contextmanager
 def disk_files(
-    infiles: Dict[str, Union[str, bytes]],
+    infiles: Dict[str, Union[str, bytes, FileRef]],
     outfiles: Dict[str, None],
     *,
     cwd: Optional[str] = None,
     as_binary: Optional[List[str]] = None,
     outfiles_track: Optional[List[str]] = None,
-) -> Dict[str, Union[str, bytes, Path]]:  # pragma: no cover
+    outfiles_lazy: Optional[List[str]] = None,
+    collect_workers: Optional[int] = None,
+) -> Dict[str, Union[str, bytes, Path, OutputFile]]:  # pragma: no cover
     """Write and collect files.
     Parameters
     ----------
-    infiles : Dict[str] = str
+    infiles : Dict[str] = str or FileRef
         Input file names (names, not full paths) and contents.
-        to be written in scratch dir. May be {}.
+        to be written in scratch dir. May be {}. A :class:`FileRef`
+        is staged with :func:`stage_file` without reading its contents.
     outfiles : Dict[str] = None
         Output file names to be collected after execution into
         values. May be {}.
@@ -391,9 +865,14 @@ def disk_files(
         Keys of `outfiles` to keep track of (i.e. file contents not loaded in memory).
         For specified filename in `outfiles_track`, the file path instead of contents
         is stored in `outfiles`.
+    outfiles_lazy: List[str], optional
+        Keys of `outfiles` (glob patterns allowed) to collect as :class:`OutputFile`
+        handles instead of loading their contents in memory.
+    collect_workers: int, optional
+        Number of threads used to collect the files matching a glob key in `outfiles`.
     Yields
     ------
-    Dict[str, Union[str, bytes, Path]]
+    Dict[str, Union[str, bytes, Path, OutputFile]]
         outfiles with RHS filled in.
     """
     if cwd is None:
@@ -405,40 +884,48 @@ def disk_files(
     assert set(as_binary) <= (set(infiles) | set(outfiles))
 
     outfiles_track = outfiles_track or []
+    outfiles_lazy = outfiles_lazy or []
 
     try:
         for fl, content in infiles.items():
-            omode = "wb" if fl in as_binary else "w"
             filename = lwd / fl
+            if isinstance(content, FileRef):
+                stage_file(content, filename)
+                continue
+            omode = "wb" if fl in as_binary else "w"
             with open(filename, omode) as fp:
                 fp.write(content)
 
         yield outfiles
 
     finally:
-        outfiles_track = [
-            fpath.name if "*" in track else track
-            for track in outfiles_track
-            for fpath in lwd.glob(track)
-        ]
+        outfiles_track = _expand_globs(lwd, outfiles_track)
+        outfiles_lazy = _expand_globs(lwd, outfiles_lazy)
+
+        def collect(filename: Path, name: str, omode: str) -> Union[str, bytes, Path, OutputFile]:
+            if name in outfiles_track:
+                return filename
+            if name in outfiles_lazy:
+                return OutputFile(filename, binary=omode == "rb")
+            with open(filename, omode) as fp:
+                return fp.read()
+
         for fl in outfiles.keys():
             filename = lwd / fl
             omode = "rb" if fl in as_binary else "r"
             try:
-                with open(filename, omode) as fp:
-                    if fl not in outfiles_track:
-                        outfiles[fl] = fp.read()
-                    else:
-                        outfiles[fl] = filename
+                outfiles[fl] = collect(filename, fl, omode)
             except OSError:
                 if "*" in fl:
-                    gfls = {}
-                    for gfl in lwd.glob(fl):
-                        with open(gfl, omode) as fp:
-                            if gfl.name not in outfiles_track:
-                                gfls[gfl.name] = fp.read()
-                            else:
-                                gfls[gfl.name] = gfl
+                    gpaths = [gfl for gfl in lwd.glob(fl) if gfl.is_file()]
+                    if len(gpaths) > 1:
+                        with ThreadPoolExecutor(max_workers=collect_workers) as pool:
+                            contents = list(
+                                pool.map(lambda gfl: collect(gfl, gfl.name, omode), gpaths)
+                            )
+                    else:
+                        contents = [collect(gfl, gfl.name, omode) for gfl in gpaths]
+                    gfls = {gfl.name: content for gfl, content in zip(gpaths, contents)}
                     if not gfls:
                         gfls = None
                     outfiles[fl] = gfls
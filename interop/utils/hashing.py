@@ -0,0 +1,120 @@
+"""
+Provides stable content hashes of data models and plain Python values, used as keys
+for caching and deduplicating computations.
+"""
+
+import enum
+import hashlib
+import pickle
+import sys
+from typing import Any
+
+from pydantic import BaseModel
+
+__all__ = ["content_hash", "model_hash", "update_hash"]
+
+
+def content_hash(*values: Any, digest_size: int = 16) -> str:
+    """
+    Returns a hex digest of `values` that is stable across processes and runs. Models
+    are hashed field by field in declaration order (along with their class), dicts
+    regardless of insertion order, and numpy arrays over their raw buffers.
+
+    Raises
+    ------
+    TypeError
+        If a value is neither a model, a container, a numpy array, a primitive, nor
+        picklable.
+    """
+    digest = hashlib.blake2b(digest_size=digest_size)
+    for value in values:
+        update_hash(digest, value)
+    return digest.hexdigest()
+
+
+def model_hash(model: BaseModel, digest_size: int = 16) -> str:
+    """Returns the hex digest of the fields of `model`, see :meth:`DataModel.content_hash`."""
+    digest = hashlib.blake2b(digest_size=digest_size)
+    _update_model(digest, model)
+    return digest.hexdigest()
+
+
+def _update_bytes(digest: "hashlib._Hash", tag: bytes, data: bytes) -> None:
+    # tag and length prefix make the encoding unambiguous
+    digest.update(tag)
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+
+
+def update_hash(digest: "hashlib._Hash", value: Any) -> None:
+    """Feeds the canonical encoding of `value` into `digest`."""
+    if value is None or isinstance(value, (bool, int, float, complex, enum.Enum)):
+        _update_bytes(digest, b"V", f"{type(value).__qualname__}:{value!r}".encode())
+    elif isinstance(value, str):
+        _update_bytes(digest, b"S", value.encode())
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _update_bytes(digest, b"B", bytes(value))
+    elif isinstance(value, BaseModel):
+        _update_model(digest, value)
+    elif isinstance(value, (dict, list, tuple, set, frozenset)):
+        _update_container(digest, value)
+    elif _is_array(value):
+        _update_array(digest, value)
+    else:
+        try:
+            data = pickle.dumps(value, protocol=4)
+        except Exception as exc:
+            raise TypeError(f"Cannot hash object of type {type(value).__name__}.") from exc
+        _update_bytes(digest, b"P", data)
+
+
+# Exact types whose repr is canonical, hashed in bulk inside lists and tuples
+_SCALARS = frozenset({type(None), bool, int, float, str})
+
+
+def _update_container(digest: "hashlib._Hash", value: Any) -> None:
+    if isinstance(value, (list, tuple)) and all(type(item) in _SCALARS for item in value):
+        tag = b"l" if isinstance(value, list) else b"t"
+        _update_bytes(digest, tag, repr(list(value)).encode())
+    elif isinstance(value, dict):
+        items = sorted((content_hash(key), item) for key, item in value.items())
+        _update_bytes(digest, b"D", len(items).to_bytes(8, "little"))
+        for key, item in items:
+            digest.update(key.encode())
+            update_hash(digest, item)
+    elif isinstance(value, (set, frozenset)):
+        _update_bytes(digest, b"E", "".join(sorted(content_hash(item) for item in value)).encode())
+    else:
+        tag = b"L" if isinstance(value, list) else b"T"
+        _update_bytes(digest, tag, len(value).to_bytes(8, "little"))
+        for item in value:
+            update_hash(digest, item)
+
+
+def _update_model(digest: "hashlib._Hash", model: BaseModel) -> None:
+    cls = type(model)
+    _update_bytes(digest, b"M", f"{cls.__module__}.{cls.__qualname__}".encode())
+    for name in cls.model_fields:
+        digest.update(name.encode())
+        update_hash(digest, getattr(model, name))
+
+    extra = model.__pydantic_extra__
+    if extra:
+        update_hash(digest, extra)
+
+
+def _is_array(value: Any) -> bool:
+    # value cannot be an array unless numpy was imported
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _update_array(digest: "hashlib._Hash", array: Any) -> None:
+    import numpy
+
+    if array.dtype.hasobject:
+        update_hash(digest, array.tolist())
+        return
+
+    _update_bytes(digest, b"A", f"{array.dtype.str}:{array.shape}".encode())
+    digest.update(memoryview(numpy.ascontiguousarray(array)).cast("B"))
@@ -0,0 +1,561 @@
+"""
+Provides instrumentation of component computations: per-phase timers, call counts and
+payload sizes, exported to pluggable sinks. Until a sink is enabled (see :func:`enable`),
+:meth:`ComponentRoot.compute` only checks for one, so disabled instrumentation is nearly free.
+
+Examples
+--------
+>>> sink = MemorySink()
+>>> with instrumented(sink):
+...     Comp.compute(input_data)
+>>> sink.stats()[Comp.trace_name]["phases"]["execute"]["total"]
+
+"""
+
+import abc
+import logging
+import os
+import pickle
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .lazy import LazyModule, module_available
+
+ray = LazyModule("ray")
+
+__all__ = [
+    "ActorSink",
+    "MemorySink",
+    "OpenTelemetrySink",
+    "PrometheusSink",
+    "Sink",
+    "Trace",
+    "disable",
+    "enable",
+    "instrumented",
+]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Trace:
+    """
+    Measurements of one component call. Phases are (name, offset, duration) tuples in
+    seconds, offsets being relative to the start of the call. Remote calls start with a
+    ``queue`` phase, the time from submission to start on the worker.
+    """
+
+    component: str
+    trace_id: str = field(default_factory=lambda: os.urandom(8).hex())
+    parent_id: Optional[str] = None
+    remote: bool = False
+    start_time: int = field(default_factory=time.time_ns)  # wall clock (ns)
+    duration: float = 0.0
+    phases: List[Tuple[str, float, float]] = field(default_factory=list)
+    sizes: Dict[str, int] = field(default_factory=dict)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    carrier: Dict[str, str] = field(default_factory=dict)  # OpenTelemetry context
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+    _mark: float = field(default=0.0, repr=False)
+
+    def mark(self) -> None:
+        """Starts a phase, see :meth:`lap`."""
+        self._mark = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        """Records the time since the last mark or lap as phase `name`, and starts the next
+        phase. Cheaper than :meth:`phase` for consecutive phases."""
+        now = time.perf_counter()
+        self.phases.append((name, self._mark - self._start, now - self._mark))
+        self._mark = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the enclosed block as phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self._start, time.perf_counter() - start))
+
+    def record_size(self, name: str, value: Any) -> None:
+        """Records the pickled size of `value` if payload sizes are measured."""
+        if _measure_sizes():
+            size = payload_size(value)
+            if size is not None:
+                self.sizes[name] = size
+
+
+@dataclass
+class _Context:
+    # instrumentation state propagated to remote calls
+    sinks: Tuple["Sink", ...]
+    payload_sizes: bool
+    parent_id: Optional[str]
+    submitted: int
+    carrier: Dict[str, str]
+
+
+class _State(threading.local):
+    def __init__(self):
+        self.trace: Optional[Trace] = None
+        self.context: Optional[_Context] = None
+
+
+_state = _State()
+
+# Sinks enabled in this process, and whether payload sizes are measured
+_sinks: Tuple["Sink", ...] = ()
+_payload_sizes = True
+# Number of remote calls running with a propagated context, so that disabled
+# instrumentation costs a global lookup
+_propagated = 0
+_propagated_lock = threading.Lock()
+
+
+def enable(*sinks: "Sink", payload_sizes: bool = True) -> None:
+    """Adds `sinks` to the sinks of this process, measuring payload sizes unless disabled."""
+    global _sinks, _payload_sizes
+    _sinks = _sinks + tuple(sink for sink in sinks if sink not in _sinks)
+    _payload_sizes = payload_sizes
+
+
+def disable(*sinks: "Sink") -> None:
+    """Flushes and removes `sinks`, or all sinks by default."""
+    global _sinks
+    removed = sinks or _sinks
+    _sinks = tuple(sink for sink in _sinks if sink not in removed)
+    _notify(removed, "flush")
+
+
+@contextmanager
+def instrumented(*sinks: "Sink", payload_sizes: bool = True) -> Iterator[Tuple["Sink", ...]]:
+    """Enables `sinks` in the enclosed block."""
+    enable(*sinks, payload_sizes=payload_sizes)
+    try:
+        yield sinks
+    finally:
+        disable(*sinks)
+
+
+def active_sinks() -> Tuple["Sink", ...]:
+    """Returns the sinks of the current call, empty if instrumentation is disabled."""
+    if not _propagated:
+        return _sinks
+    context = _state.context
+    return _sinks if context is None else context.sinks
+
+
+def _measure_sizes() -> bool:
+    context = _state.context
+    return _payload_sizes if context is None else context.payload_sizes
+
+
+def current_trace() -> Optional[Trace]:
+    """Returns the trace of the innermost instrumented call in this thread."""
+    return _state.trace if _sinks or _propagated else None
+
+
+@contextmanager
+def tracing(component: str, sinks: Tuple["Sink", ...], input_data: Any = None) -> Iterator[Trace]:
+    """Traces the enclosed call of `component` and exports it to `sinks`."""
+    parent, context = _state.trace, _state.context
+    trace = Trace(component, remote=context is not None)
+    if parent is not None:
+        trace.parent_id = parent.trace_id
+    elif context is not None:
+        # first call on the worker
+        trace.parent_id = context.parent_id
+        trace.carrier = context.carrier
+        queue = max(trace.start_time - context.submitted, 0) / 1e9
+        trace.phases.append(("queue", -queue, queue))
+
+    trace.record_size("input", input_data)
+    _notify(sinks, "start", trace)
+    _state.trace = trace
+    try:
+        yield trace
+    except BaseException as exc:
+        trace.attributes["error"] = type(exc).__name__
+        raise
+    finally:
+        _state.trace = parent
+        trace.duration = time.perf_counter() - trace._start
+        _notify(sinks, "finish", trace)
+
+
+def propagate(component: str, input_data: Any = None) -> Optional[_Context]:
+    """
+    Returns the instrumentation context to pass to a remote call of `component`, or None
+    if instrumentation is disabled. The submission is traced as a ``submit`` phase.
+    """
+    sinks = active_sinks()
+    if not sinks:
+        return None
+
+    with tracing(component, sinks, input_data) as trace:
+        trace.attributes["submit"] = True
+        with trace.phase("submit"):
+            carrier = {}
+            if "opentelemetry" in sys.modules:
+                from opentelemetry import propagate as otel_propagate
+
+                otel_propagate.inject(carrier)
+            return _Context(
+                tuple(sink for sink in sinks if sink.propagates),
+                _measure_sizes(),
+                trace.trace_id,
+                time.time_ns(),
+                carrier,
+            )
+
+
+@contextmanager
+def propagated(context: Optional[_Context]) -> Iterator[None]:
+    """Restores the instrumentation `context` of the caller in a remote call."""
+    if context is None:
+        yield
+        return
+
+    global _propagated
+    with _propagated_lock:
+        _propagated += 1
+    previous, _state.context = _state.context, context
+    try:
+        yield
+    finally:
+        _state.context = previous
+        with _propagated_lock:
+            _propagated -= 1
+        _notify(context.sinks, "flush")
+
+
+def payload_size(value: Any) -> Optional[int]:
+    """Returns the pickled size of `value` (in bytes), counting out-of-band buffers such as
+    numpy arrays without copying them, or None if it cannot be pickled."""
+    buffers = []
+    try:
+        data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    except Exception:
+        return None
+    return len(data) + sum(buffer.raw().nbytes for buffer in buffers)
+
+
+# Sinks unpickled in this process (e.g. a Ray worker), shared by all remote calls
+_restored: Dict[Tuple[Any, ...], "Sink"] = {}
+_restored_lock = threading.Lock()
+
+
+def _restore_sink(cls: type, *args: Any) -> "Sink":
+    with _restored_lock:
+        sink = _restored.get((cls, *args))
+        if sink is None:
+            sink = _restored[(cls, *args)] = cls(*args)
+        return sink
+
+
+def _notify(sinks: Tuple["Sink", ...], method: str, *args: Any) -> None:
+    # instrumentation must not fail computations
+    for sink in sinks:
+        try:
+            getattr(sink, method)(*args)
+        except Exception:
+            logger.exception("Instrumentation sink %r failed.", sink)
+
+
+class Sink(metaclass=abc.ABCMeta):
+    """
+    Interface of instrumentation sinks. Sinks with `propagates` set are copied to Ray
+    workers (by pickling their parameters) to export the traces of remote calls, once per
+    worker, and flushed at the end of each remote call.
+    """
+
+    propagates: bool = True
+
+    def start(self, trace: Trace) -> None:
+        """Called when an instrumented call starts."""
+
+    @abc.abstractmethod
+    def finish(self, trace: Trace) -> None:  # pragma: no cover
+        """Called with the complete trace of an instrumented call."""
+        ...
+
+    def flush(self) -> None:
+        """Exports buffered measurements."""
+
+
+class MemorySink(Sink):
+    """
+    In-memory registry aggregating traces of this process by component and phase, see
+    :meth:`stats`. Remote calls are recorded by the workers, so use an
+    :class:`ActorSink` to collect them as well.
+
+    Parameters
+    ----------
+    keep: int, optional
+        Number of most recent traces kept in `traces`. Default 0.
+    """
+
+    propagates = False
+
+    def __init__(self, keep: int = 0):
+        self.keep = keep
+        self.traces: Deque[Trace] = deque(maxlen=keep)
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def finish(self, trace: Trace) -> None:
+        with self._lock:
+            self._add(trace)
+            if self.keep:
+                self.traces.append(trace)
+
+    def _add(self, trace: Trace) -> None:
+        stats = self._stats.setdefault(
+            trace.component,
+            {"calls": 0, "remote_calls": 0, "errors": 0, "bytes": {}, "phases": {}},
+        )
+        if not trace.attributes.get("submit"):
+            stats["calls"] += 1
+            stats["remote_calls"] += trace.remote
+            stats["errors"] += "error" in trace.attributes
+            _accumulate(stats["phases"], "total", trace.duration)
+        for name, _, duration in trace.phases:
+            _accumulate(stats["phases"], name, duration)
+        for name, size in trace.sizes.items():
+            stats["bytes"][name] = stats["bytes"].get(name, 0) + size
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns, by component, the number of calls (local and remote), errors, the total
+        payload sizes (in bytes) by name (e.g. input, output), and the count, total, min
+        and max time (in seconds) by phase. The ``total`` phase is the whole call.
+        """
+        with self._lock:
+            return {
+                component: {
+                    **stats,
+                    "bytes": dict(stats["bytes"]),
+                    "phases": {name: dict(phase) for name, phase in stats["phases"].items()},
+                }
+                for component, stats in self._stats.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.traces.clear()
+
+    def __reduce__(self):
+        return self.__class__, (self.keep,)
+
+
+def _accumulate(phases: Dict[str, Dict[str, float]], name: str, duration: float) -> None:
+    phase = phases.get(name)
+    if phase is None:
+        phases[name] = {"count": 1, "total": duration, "min": duration, "max": duration}
+        return
+    phase["count"] += 1
+    phase["total"] += duration
+    phase["min"] = min(phase["min"], duration)
+    phase["max"] = max(phase["max"], duration)
+
+
+class PrometheusSink(MemorySink):
+    """
+    Writes aggregated traces in the Prometheus text format to `path`, e.g. in the
+    directory of the node exporter textfile collector, at most every `interval` seconds
+    and on :meth:`flush`. Each process writes its own file, as `path` is formatted with
+    the ``pid`` and ``host`` of the process.
+
+    Parameters
+    ----------
+    path: str, optional
+        File path template. Default ``interop-{host}-{pid}.prom``.
+    interval: float, optional
+        Min time (in seconds) between writes. Default 10.
+    """
+
+    propagates = True
+
+    def __init__(self, path: str = "interop-{host}-{pid}.prom", interval: float = 10.0):
+        super().__init__()
+        self.path = path
+        self.interval = interval
+        self._written = time.monotonic()
+
+    def finish(self, trace: Trace) -> None:
+        super().finish(trace)
+        if time.monotonic() - self._written > self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        path = self.path.format(pid=os.getpid(), host=socket.gethostname())
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fp:
+            fp.write(self.render())
+        os.replace(tmp, path)
+        self._written = time.monotonic()
+
+    def render(self) -> str:
+        """Returns the aggregated traces in the Prometheus text format."""
+        lines = [
+            "# HELP interop_compute_calls_total Component calls.",
+            "# TYPE interop_compute_calls_total counter",
+            "# HELP interop_compute_errors_total Failed component calls.",
+            "# TYPE interop_compute_errors_total counter",
+            "# HELP interop_compute_seconds Time spent in component call phases.",
+            "# TYPE interop_compute_seconds summary",
+            "# HELP interop_compute_payload_bytes_total Pickled size of component payloads.",
+            "# TYPE interop_compute_payload_bytes_total counter",
+        ]
+        for component, stats in sorted(self.stats().items()):
+            label = f'component="{_escape(component)}"'
+            lines.append(f"interop_compute_calls_total{{{label}}} {stats['calls']}")
+            lines.append(f"interop_compute_errors_total{{{label}}} {stats['errors']}")
+            for name, phase in sorted(stats["phases"].items()):
+                labels = f'{label},phase="{name}"'
+                lines.append(f"interop_compute_seconds_sum{{{labels}}} {phase['total']!r}")
+                lines.append(f"interop_compute_seconds_count{{{labels}}} {phase['count']}")
+            for name, size in sorted(stats["bytes"].items()):
+                labels = f'{label},payload="{name}"'
+                lines.append(f"interop_compute_payload_bytes_total{{{labels}}} {size}")
+        return "\n".join(lines) + "\n"
+
+    def __reduce__(self):
+        return _restore_sink, (self.__class__, self.path, self.interval)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Registry(MemorySink):
+    """Ray actor aggregating the traces sent by :class:`ActorSink` instances."""
+
+    def finish_all(self, traces: List[Trace]) -> None:
+        for trace in traces:
+            self.finish(trace)
+
+
+class ActorSink(Sink):
+    """
+    Aggregates the traces of all processes of a Ray job, local and remote, in a named
+    actor. Traces are sent in batches of `batch_size`, and on :meth:`flush` (e.g. at
+    the end of each remote call).
+
+    Parameters
+    ----------
+    name: str, optional
+        Name of the registry actor. Sinks with the same name share their traces.
+    batch_size: int, optional
+        Number of traces sent at once. Default 64.
+    """
+
+    propagates = True
+
+    def __init__(self, name: str = "interop-instrumentation", batch_size: int = 64):
+        self.name = name
+        self.batch_size = batch_size
+        self._pending: List[Trace] = []
+        self._lock = threading.Lock()
+        self._registry = None
+
+    def finish(self, trace: Trace) -> None:
+        with self._lock:
+            self._pending.append(trace)
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            traces, self._pending = self._pending, []
+        if traces:
+            ray.get(self._get_registry().finish_all.remote(traces))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Flushes pending traces and returns the job-wide stats, see MemorySink.stats."""
+        self.flush()
+        return ray.get(self._get_registry().stats.remote())
+
+    def _get_registry(self) -> Any:
+        if self._registry is None:
+            actor = ray.remote(num_cpus=0)(_Registry).options(name=self.name, get_if_exists=True)
+            self._registry = actor.remote()
+        return self._registry
+
+    def __reduce__(self):
+        return _restore_sink, (self.__class__, self.name, self.batch_size)
+
+
+class OpenTelemetrySink(Sink):
+    """
+    Exports each call as an OpenTelemetry span with a child span per phase, using the
+    tracer provider configured in each process. Spans of remote calls are children of
+    the span of their submission. Requires ``opentelemetry-api``.
+
+    Parameters
+    ----------
+    tracer: str, optional
+        Name of the tracer. Default interop.
+    tracer_provider: opentelemetry.trace.TracerProvider, optional
+        Provider of the tracer in this process. Default global tracer provider.
+    """
+
+    propagates = True
+
+    def __init__(self, tracer: str = "interop", tracer_provider: Any = None):
+        if not module_available("opentelemetry"):
+            raise ModuleNotFoundError("OpenTelemetry not installed, install opentelemetry-api.")
+        self.tracer = tracer
+        self.tracer_provider = tracer_provider
+        self._spans: Dict[str, Tuple[Any, Any]] = {}
+
+    def start(self, trace: Trace) -> None:
+        from opentelemetry import context, propagate
+        from opentelemetry import trace as otel_trace
+
+        parent = propagate.extract(trace.carrier) if trace.carrier else None
+        span = self._get_tracer().start_span(
+            trace.component, context=parent, start_time=trace.start_time
+        )
+        token = context.attach(otel_trace.set_span_in_context(span))
+        self._spans[trace.trace_id] = (span, token)
+
+    def finish(self, trace: Trace) -> None:
+        from opentelemetry import context
+        from opentelemetry import trace as otel_trace
+
+        span, token = self._spans.pop(trace.trace_id)
+        context.detach(token)
+
+        tracer = self._get_tracer()
+        parent = otel_trace.set_span_in_context(span)
+        for name, offset, duration in trace.phases:
+            start = trace.start_time + int(offset * 1e9)
+            child = tracer.start_span(name, context=parent, start_time=start)
+            child.end(end_time=start + int(duration * 1e9))
+
+        span.set_attribute("interop.remote", trace.remote)
+        for name, size in trace.sizes.items():
+            span.set_attribute(f"interop.bytes.{name}", size)
+        for name, value in trace.attributes.items():
+            span.set_attribute(f"interop.{name}", value)
+        span.end(end_time=trace.start_time + int(trace.duration * 1e9))
+
+    def _get_tracer(self) -> Any:
+        from opentelemetry import trace as otel_trace
+
+        return otel_trace.get_tracer(self.tracer, tracer_provider=self.tracer_provider)
+
+    def __reduce__(self):
+        # remote calls use the tracer provider of the worker
+        return _restore_sink, (self.__class__, self.tracer)
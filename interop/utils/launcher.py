@@ -0,0 +1,157 @@
+"""
+Provides launchers that resolve the nodes of an allocation and start processes on them.
+Ray cluster creation in :mod:`interop.utils.ray` goes through a launcher, so SLURM can
+be swapped for a local stand-in to test and benchmark cluster bring-up on one machine.
+"""
+
+import abc
+import os
+import re
+import subprocess
+from typing import Dict, Optional, Sequence
+
+__all__ = ["Launcher", "LocalLauncher", "SlurmLauncher", "srun_command"]
+
+
+def srun_command(node: str, *args: str, srun_args: Sequence[str] = ()) -> list[str]:
+    """Returns a command running `args` as a single SLURM task on `node`."""
+    return ["srun", "--nodes=1", "--ntasks=1", *srun_args, "-w", node, *args]
+
+
+class Launcher(metaclass=abc.ABCMeta):
+    """Interface resolving the nodes of an allocation and launching tasks on them."""
+
+    @abc.abstractmethod
+    def nodelist(self) -> str:  # pragma: no cover
+        """Returns the (compressed) node list of the current allocation."""
+        ...
+
+    @abc.abstractmethod
+    def hostnames(self, nodelist: str) -> list[str]:  # pragma: no cover
+        """Expands a node list e.g. `node[01-03]` into node names."""
+        ...
+
+    @abc.abstractmethod
+    def node_ip(self, node: str) -> str:  # pragma: no cover
+        """Returns the IP address of `node`."""
+        ...
+
+    @abc.abstractmethod
+    def launch(
+        self, node: str, cmd: Sequence[str], *, srun_args: Sequence[str] = ()
+    ) -> subprocess.Popen:  # pragma: no cover
+        """Starts `cmd` on `node` in the background and returns its process."""
+        ...
+
+    def cleanup(self, temp_dir: Optional[str] = None) -> None:
+        """Removes local state left behind by the cluster once all nodes are stopped."""
+
+
+class SlurmLauncher(Launcher):
+    """Launcher for SLURM allocations based on `scontrol` and `srun`."""
+
+    def nodelist(self) -> str:
+        try:
+            return os.environ["SLURM_JOB_NODELIST"]
+        except KeyError:
+            raise KeyError(
+                "Env variable SLURM_JOB_NODELIST is undefined. Are you running from within SLURM?"
+            )
+
+    def hostnames(self, nodelist: str) -> list[str]:
+        out = subprocess.run(["scontrol", "show", "hostnames", nodelist], capture_output=True)
+        return out.stdout.decode("utf-8").strip("\n").split("\n")
+
+    def node_ip(self, node: str) -> str:
+        proc = subprocess.run(srun_command(node, "hostname", "--ip-address"), capture_output=True)
+
+        stderr = proc.stderr.decode("utf-8")
+        if stderr:
+            raise RuntimeError(stderr)
+
+        return proc.stdout.decode("utf-8").strip()
+
+    def launch(
+        self, node: str, cmd: Sequence[str], *, srun_args: Sequence[str] = ()
+    ) -> subprocess.Popen:
+        return subprocess.Popen(srun_command(node, *cmd, srun_args=srun_args))
+
+
+class LocalLauncher(Launcher):
+    """
+    Emulates a SLURM allocation of `num_nodes` nodes on localhost: every node resolves
+    to 127.0.0.1 and tasks run as local processes. Each `ray start` gets `ray_args`
+    appended so that several small Ray nodes fit on one machine.
+
+    Parameters
+    ----------
+    num_nodes: int, optional
+        Number of simulated nodes, named `local0`, `local1`, etc.
+    ray_args: Sequence[str], optional
+        Args appended to every `ray start` command. By default, each node gets one CPU
+        and a 75 MB object store.
+    head_args: Sequence[str], optional
+        Args appended to the `ray start --head` command. By default, the dashboard is
+        disabled.
+    env: dict[str, str], optional
+        Environment of the launched processes. Defaults to the current environment with
+        Ray token authentication disabled, which is only suitable on a trusted machine.
+    """
+
+    prefix = "local"
+
+    def __init__(
+        self,
+        num_nodes: int = 2,
+        *,
+        ray_args: Sequence[str] = ("--num-cpus=1", "--object-store-memory=78643200"),
+        head_args: Sequence[str] = ("--include-dashboard=false",),
+        env: Optional[Dict[str, str]] = None,
+    ):
+        self.num_nodes = num_nodes
+        self.ray_args = list(ray_args)
+        self.head_args = list(head_args)
+        self.env = env if env is not None else {**os.environ, "RAY_AUTH_MODE": "disabled"}
+
+    def nodelist(self) -> str:
+        return f"{self.prefix}[0-{self.num_nodes - 1}]"
+
+    def hostnames(self, nodelist: str) -> list[str]:
+        names = []
+        for prefix, ranges, name in re.findall(r"([^,\[]+)\[([^\]]+)\]|([^,\[\]]+)", nodelist):
+            if name:
+                names.append(name)
+                continue
+            for token in ranges.split(","):
+                start, _, stop = token.partition("-")
+                width = len(start)
+                names.extend(
+                    f"{prefix}{index:0{width}d}"
+                    for index in range(int(start), int(stop or start) + 1)
+                )
+        return names
+
+    def node_ip(self, node: str) -> str:
+        return "127.0.0.1"
+
+    def launch(
+        self, node: str, cmd: Sequence[str], *, srun_args: Sequence[str] = ()
+    ) -> subprocess.Popen:
+        cmd = list(cmd)
+        if cmd[:2] == ["ray", "start"]:
+            cmd.extend(self.ray_args)
+            if "--head" in cmd:
+                cmd.extend(self.head_args)
+        return subprocess.Popen(
+            cmd, env=self.env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def cleanup(self, temp_dir: Optional[str] = None) -> None:
+        # A terminated head node leaves its address behind, which later `ray.init()`
+        # calls on this machine would try to connect to
+        root = os.environ.get("RAY_TMPDIR") or os.environ.get("TMPDIR") or "/tmp"
+        for path in {temp_dir, os.path.join(root, "ray")} - {None}:
+            try:
+                os.remove(os.path.join(path, "ray_current_cluster"))
+            except OSError:
+                pass
@@ -0,0 +1,63 @@
+"""
+Provides lazily imported modules, so heavy optional dependencies (e.g. Ray) are only
+imported when first used rather than on ``import interop``.
+"""
+
+import importlib
+import importlib.util
+import types
+from typing import Any, Optional, Sequence
+
+__all__ = ["LazyModule", "module_available"]
+
+
+def module_available(name: str) -> bool:
+    """Returns True if module `name` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """
+    Proxy for module `name` that imports it, along with `submodules`, on first attribute
+    access.
+
+    Parameters
+    ----------
+    name: str
+        Name of the module to import.
+    submodules: Sequence[str], optional
+        Submodules to import along with the module e.g. ``["util.scheduling_strategies"]``.
+
+    Examples
+    --------
+    >>> ray = LazyModule("ray", submodules=["dag"])
+    >>> ray.is_initialized()  # imports ray and ray.dag
+    False
+
+    """
+
+    def __init__(self, name: str, submodules: Sequence[str] = ()):
+        super().__init__(name)
+        self._submodules = tuple(submodules)
+        self._module: Optional[types.ModuleType] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            module = importlib.import_module(self.__name__)
+            for submodule in self._submodules:
+                importlib.import_module(f"{self.__name__}.{submodule}")
+            self._module = module
+        return self._module
@@ -0,0 +1,196 @@
+"""
+Provides result caches used to memoize components, see ``@component(cache=...)``.
+"""
+
+import abc
+import copy
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .cache import ExecuteCache
+from .lazy import LazyModule
+
+ray = LazyModule("ray")
+
+__all__ = ["DiskCache", "MemoryCache", "RayCache", "ResultCache", "make_cache"]
+
+
+class ResultCache(metaclass=abc.ABCMeta):
+    """
+    Interface of component result caches, keyed by content hashes. Caches are copied to
+    Ray workers by pickling their parameters, not their contents.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value cached for `key`, or None."""
+        value = self._get(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    @abc.abstractmethod
+    def put(self, key: str, value: Any) -> None:  # pragma: no cover
+        """Stores `value` for `key`."""
+        ...
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Returns hit/miss counters and the hit rate of this process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[Any]:  # pragma: no cover
+        ...
+
+    @abc.abstractmethod
+    def __reduce__(self):  # pragma: no cover
+        ...
+
+
+class MemoryCache(ResultCache):
+    """
+    In-process LRU cache holding at most `max_entries` results. Results are copied in
+    and out, so callers may mutate the outputs they get without altering cached ones.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            value = self._entries[key]
+        return copy.deepcopy(value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __reduce__(self):
+        return self.__class__, (self.max_entries,)
+
+
+class DiskCache(ResultCache):
+    """
+    Local disk cache of pickled results in `directory`, evicting least recently used
+    entries beyond `max_bytes`. See :class:`interop.utils.ExecuteCache`.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 1 << 30):
+        super().__init__()
+        self.store = ExecuteCache(directory, max_bytes=max_bytes)
+
+    def put(self, key: str, value: Any) -> None:
+        self.store.put(key, value)
+
+    def _get(self, key: str) -> Optional[Any]:
+        return self.store.get(key)
+
+    def __reduce__(self):
+        return self.__class__, (self.store.directory, self.store.max_bytes)
+
+
+class _Registry:
+    """
+    Ray actor mapping keys to results in LRU order. Results are put in the object store
+    by the actor, which owns them.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.refs: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[list]:
+        if key not in self.refs:
+            return None
+        self.refs.move_to_end(key)
+        return [self.refs[key]]  # nested, so the ref is not resolved by Ray
+
+    def put(self, key: str, value: Any) -> None:
+        import ray
+
+        self.refs[key] = ray.put(value)
+        self.refs.move_to_end(key)
+        while len(self.refs) > self.max_entries:
+            self.refs.popitem(last=False)
+
+
+class RayCache(ResultCache):
+    """
+    Cache shared by all workers of a Ray job. Results live in the object store, owned by
+    a named registry actor so they outlive the worker that computed them.
+
+    Parameters
+    ----------
+    name: str, optional
+        Name of the registry actor. Caches with the same name share their results.
+    max_entries: int, optional
+        Max number of results kept by the registry. Default 4096.
+    """
+
+    def __init__(self, name: str = "interop-result-cache", max_entries: int = 4096):
+        super().__init__()
+        self.name = name
+        self.max_entries = max_entries
+        self._registry = None
+
+    def put(self, key: str, value: Any) -> None:
+        ray.get(self._get_registry().put.remote(key, value))
+
+    def _get(self, key: str) -> Optional[Any]:
+        refs = ray.get(self._get_registry().get.remote(key))
+        return None if refs is None else ray.get(refs[0])
+
+    def _get_registry(self) -> Any:
+        if self._registry is None:
+            actor = ray.remote(num_cpus=0)(_Registry).options(name=self.name, get_if_exists=True)
+            self._registry = actor.remote(self.max_entries)
+        return self._registry
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.max_entries)
+
+
+def make_cache(cache: Union[bool, str, ResultCache, None]) -> Optional[ResultCache]:
+    """
+    Returns the result cache described by `cache`: a :class:`ResultCache`, True or
+    "memory" (in-process LRU), "ray" (shared through the Ray object store), or a
+    directory path prefixed by "disk:" e.g. ``"disk:/scratch/johndoe/cache"``.
+    """
+    if cache is None or cache is False:
+        return None
+    if isinstance(cache, ResultCache):
+        return cache
+    if cache is True or cache == "memory":
+        return MemoryCache()
+    if cache == "ray":
+        return RayCache()
+    if isinstance(cache, str) and cache.startswith("disk:"):
+        return DiskCache(cache[len("disk:") :])
+    raise ValueError(f"Unsupported component cache: {cache!r}.")
@@ -1,11 +1,15 @@
 import inspect
 import logging
-from typing import Any, Optional, Type, Union
+from typing import TYPE_CHECKING, Any, Optional, Type, Union
 
-import numpy
 from pydantic import ValidationError
 
-from interop.utils.dtypes import NUMPY_FLOAT, NumpyArray
+from interop.utils.dtypes import NUMPY_FLOAT
+
+if TYPE_CHECKING:
+    import numpy
+
+    from interop.utils.dtypes import NumpyArray
 
 
 def valid_error(cls: Type[Any], *, msg: Optional[str] = None) -> ValidationError:
@@ -14,7 +18,7 @@ def valid_error(cls: Type[Any], *, msg: Optional[str] = None) -> ValidationError
 
 
 def check_symmetry(
-    matrix: NumpyArray[numpy.dtype(NUMPY_FLOAT)],
+    matrix: "NumpyArray[numpy.dtype(NUMPY_FLOAT)]",
     rtol: Optional[float] = 1e-05,
     atol: Optional[float] = 1e-08,
 ) -> bool:
@@ -36,6 +40,8 @@ def check_symmetry(
         True if matrix is symmetric, False otherwise.
 
     """
+    import numpy
+
     return numpy.allclose(matrix, matrix.T, rtol=rtol, atol=atol)
 
 
@@ -1,20 +1,28 @@
 import logging
 import os
+import random
+import socket
 
 if os.name != "nt":
     import resource
 else:
     resource = None
 import subprocess
-import tempfile
 from ipaddress import IPv4Address, ip_address
-from time import sleep
-from typing import Any, List, Optional
-
-import ray
+from time import monotonic, sleep
+from typing import Any, List, Optional, Sequence, Union
 
 from interop.models.req import ExecReq
 
+from .execute import terminate_process
+from .launcher import Launcher, SlurmLauncher
+from .lazy import LazyModule
+from .resources import get_resource_view
+
+ray = LazyModule("ray")
+
+logger = logging.getLogger(__name__)
+
 
 def validIPAddress(ip: str) -> str:
     """
@@ -75,44 +83,160 @@ def set_rlimit() -> None:
     resource.setrlimit(resource.RLIMIT_NOFILE, (hard_lim, hard_lim))
 
 
-def get_port() -> str:
+def used_ports(proc_net: str = "/proc/net") -> set[int]:
+    """
+    Returns the local TCP ports in use (any state) as listed in ``/proc/net/tcp`` and
+    ``/proc/net/tcp6``, or an empty set if those files are unavailable (e.g. on macOS).
+    """
+    ports = set()
+    for name in ("tcp", "tcp6"):
+        try:
+            with open(os.path.join(proc_net, name)) as fp:
+                next(fp, None)  # header
+                for line in fp:
+                    # fields: sl local_address rem_address st ...
+                    local_address = line.split()[1]
+                    ports.add(int(local_address.rsplit(":", 1)[1], 16))
+        except (OSError, IndexError, ValueError):
+            continue
+    return ports
+
+
+class PortReservation:
+    """
+    Ports held by bound (not listening) sockets so no other process can claim them.
+    Call :meth:`release` right before the ports are bound by their consumer (e.g. Ray).
+    """
+
+    def __init__(self, sockets: list[socket.socket]):
+        self._sockets = sockets
+        self.ports = [sock.getsockname()[1] for sock in sockets]
+
+    def release(self) -> list[int]:
+        """Closes the reserving sockets and returns the reserved ports."""
+        while self._sockets:
+            self._sockets.pop().close()
+        return self.ports
+
+    def __enter__(self) -> "PortReservation":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+
+def _bind(port: int, host: str = "") -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.bind((host, port))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def reserve_ports(
+    num_ports: int = 1,
+    *,
+    low: int = 49152,
+    high: int = 65535,
+    contiguous: bool = False,
+    max_attempts: int = 1000,
+) -> PortReservation:
     """
-    Returns an unreserved port number. This executes the following bash
-    script:
+    Reserves free ports in [low, high] by binding sockets to them in-process.
 
-    .. code-block:: bash
+    Parameters
+    ----------
+    num_ports: int, optional
+        Number of ports to reserve e.g. 3 for the head, dashboard, and worker ports.
+    low: int, optional
+        Lowest port number. Defaults to the start of the dynamic port range.
+    high: int, optional
+        Highest port number.
+    contiguous: bool, optional
+        Reserve consecutive ports.
+    max_attempts: int, optional
+        Maximum number of candidate ports (or port ranges) to try.
 
-       $ port=`comm -23 <(seq 49152 65535) <(ss -tan | awk '{print $4}' | cut -d':' \\
-       $ -f2 | grep "[0-9]\\{1,5\\}" | sort | uniq) | shuf | head -n 1`
+    Returns
+    -------
+    PortReservation
+        Reservation whose `ports` remain held until released.
 
-    `Source <https://roivant.atlassian.net/wiki/spaces/~865930246/pages/2610397223/ray+on+neo>`_
+    Raises
+    ------
+    RuntimeError
+        If not enough free ports could be found.
+    """
+    in_use = used_ports()
+    rng = random.SystemRandom()
+    sockets = []
+    for _ in range(max_attempts):
+        if contiguous:
+            start = rng.randint(low, high - num_ports + 1)
+            candidates = range(start, start + num_ports)
+        else:
+            candidates = [rng.randint(low, high)]
+
+        if any(port in in_use for port in candidates):
+            continue
+
+        bound = [_bind(port) for port in candidates]
+        if all(bound):
+            sockets.extend(bound)
+            in_use.update(candidates)
+        else:
+            for sock in filter(None, bound):
+                sock.close()
+
+        if len(sockets) == num_ports:
+            return PortReservation(sockets)
+
+    for sock in sockets:
+        sock.close()
+    raise RuntimeError(f"Could not reserve {num_ports} free ports in [{low}, {high}].")
+
+
+def get_port() -> str:
+    """
+    Returns an unreserved port number in the dynamic port range [49152, 65535]. The port
+    is released on return, so use :func:`reserve_ports` to hold it until it is bound.
 
     Returns
     -------
     str
         Port number
     """
-    stdout1 = pipe_process(["seq", "49152", "65535"])
-    stdout2 = pipe_process(["ss", "-tan"])
-    stdout3 = pipe_process(["awk", '"{print $4}"'], stdin=stdout2)
-    stdout4 = pipe_process(["cut", "-d", ":", "-f2"], stdin=stdout3)
-    stdout5 = pipe_process(["grep", "[0-9]\\{1,5\\}"], stdin=stdout4)
-    stdout6 = pipe_process(["sort"], stdin=stdout5)
-    stdout7 = pipe_process(["uniq"], stdin=stdout6)
+    with reserve_ports(1) as reservation:
+        return str(reservation.ports[0])
 
-    with tempfile.NamedTemporaryFile(delete=True) as tmp1:
-        tmp1.write(stdout1)
-        with tempfile.NamedTemporaryFile(delete=True) as tmp2:
-            tmp2.write(stdout7)
-            stdout8 = pipe_process(["comm", "-23", tmp1.name, tmp2.name])
 
-    stdout9 = pipe_process(["shuf"], stdin=stdout8)
-    return pipe_process(["head", "-n", "1"], stdin=stdout9).decode("utf-8").strip()
+def reserve_head_ports(num_worker_ports: int = 0) -> PortReservation:
+    """
+    Reserves consecutive ports for a Ray head node: the GCS port, the dashboard port, and
+    `num_worker_ports` ports for the workers of the head node, see :func:`head_command`.
+    """
+    return reserve_ports(2 + num_worker_ports, contiguous=True)
 
 
-def setup_head_node() -> tuple[str, str, str, list[str]]:
+def setup_head_node(
+    launcher: Optional[Launcher] = None, *, ports: Optional[PortReservation] = None
+) -> tuple[str, str, str, list[str]]:
     """Sets up Ray head node, and returns info required to create a Ray cluster.
 
+    Parameters
+    ----------
+    launcher: Launcher, optional
+        Launcher resolving the allocated nodes. Defaults to :class:`SlurmLauncher`.
+    ports: PortReservation, optional
+        Ports of the head node (see :func:`reserve_head_ports`), the first one being the
+        returned port. Pass it to :func:`create_nodes` as well, so the ports are held
+        until the head node starts. By default, a free port is picked and released.
+
     Returns
     -------
     tuple[str, str, str, list[str]]
@@ -127,66 +251,134 @@ def setup_head_node() -> tuple[str, str, str, list[str]]:
         If head node ip address is not a valid IPv4
 
     """
-
-    try:
-        slurm_job_nodelist = os.environ["SLURM_JOB_NODELIST"]
-    except KeyError:
-        raise KeyError(
-            "Env variable SLURM_JOB_NODELIST is undefined. Are you running from within SLURM?"
-        )
-
-    out = subprocess.run(
-        ["scontrol", "show", "hostnames", slurm_job_nodelist], capture_output=True
-    )
-    nodes_array = out.stdout.decode("utf-8").strip("\n").split("\n")
+    launcher = launcher or SlurmLauncher()
+    nodes_array = launcher.hostnames(launcher.nodelist())
 
     head_node = nodes_array[0]
-
-    proc = subprocess.run(
-        ["srun", "--nodes=1", "--ntasks=1", "-w", head_node, "hostname", "--ip-address"],
-        capture_output=True,
-    )
-
-    stderr = proc.stderr.decode("utf-8")
-    if stderr:
-        raise RuntimeError(stderr)
-
-    head_node_ip = proc.stdout.decode("utf-8").strip()
+    head_node_ip = launcher.node_ip(head_node)
     assert validIPAddress(head_node_ip) == "IPv4"
 
-    port = get_port()
+    port = str(ports.ports[0]) if ports is not None else get_port()
 
     return head_node, head_node_ip, port, nodes_array
 
 
-def create_nodes(
-    *, head_node: str, head_node_ip: str, port: str, nodes_array: list[str], temp_dir: str = None
+def wait_for_port(
+    host: str,
+    port: Union[str, int],
+    *,
+    timeout: float = 300,
+    interval: float = 0.5,
+    proc: Optional[subprocess.Popen] = None,
 ) -> None:
     """
-    Creates head + worker nodes.
+    Waits until a TCP connection to `host:port` succeeds e.g. until the GCS server of
+    a Ray head node accepts connections.
+
+    Raises
+    ------
+    RuntimeError
+        If `proc` (the process expected to open the port) exits first.
+    TimeoutError
+        If the port does not accept connections within `timeout` seconds.
+    """
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, int(port)), timeout=interval) as sock:
+                # a local port in the ephemeral range can end up connected to itself
+                if sock.getsockname() != sock.getpeername():
+                    return
+        except OSError:
+            pass
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"Process {proc.args} exited with code {proc.returncode}.")
+        if monotonic() > deadline:
+            raise TimeoutError(f"{host}:{port} not reachable after {timeout} s.")
+        sleep(interval)
+
+
+def wait_for_nodes(
+    address: str,
+    num_nodes: int,
+    *,
+    procs: Optional[dict[str, subprocess.Popen]] = None,
+    timeout: float = 300,
+    interval: float = 1.0,
+) -> list[dict[str, Any]]:
+    """
+    Waits until `num_nodes` alive nodes are registered with the Ray cluster at `address`.
 
     Parameters
     ----------
-    head_node: str
-        Head node ID/name
-    head_node_ip: str
-        Valid IPv4 address of head node
-    port: str
-        Port number
-    nodes_array: Optional[list[str]], optional
-        List of all available nodes
-    temp_dir: Optional[str], optional
-        Path to use for temporary dir
+    address: str
+        Address (ip:port) of the head node GCS server.
+    num_nodes: int
+        Expected number of nodes, including the head node.
+    procs: dict[str, subprocess.Popen], optional
+        Processes starting the nodes, keyed by node name. A process exiting before
+        the cluster is ready is reported as a failed node.
+    timeout: float, optional
+        Max time (in seconds) to wait for.
+    interval: float, optional
+        Polling interval (in seconds).
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Alive nodes as returned by ``ray.nodes()``.
 
+    Raises
+    ------
+    RuntimeError
+        If any node process exits before the cluster is ready.
+    TimeoutError
+        If the nodes do not register within `timeout` seconds.
     """
-    ip_head = f"{head_node_ip}:{port}"
+    procs = procs or {}
+    connected = ray.is_initialized()
+    if not connected:
+        ray.init(address=address, log_to_driver=False)
 
+    deadline = monotonic() + timeout
+    try:
+        while True:
+            alive = [node for node in ray.nodes() if node["Alive"]]
+            if len(alive) >= num_nodes:
+                return alive
+
+            failed = {
+                name: proc.returncode for name, proc in procs.items() if proc.poll() is not None
+            }
+            if failed:
+                raise RuntimeError(f"Ray nodes exited before joining (exit codes): {failed}")
+
+            if monotonic() > deadline:
+                hostnames = {node["NodeManagerHostname"].split(".")[0] for node in alive}
+                pending = [name for name in procs if name.split(".")[0] not in hostnames]
+                raise TimeoutError(
+                    f"Only {len(alive)} out of {num_nodes} nodes registered after {timeout} s."
+                    f" Pending nodes: {pending or 'unknown'}"
+                )
+            sleep(interval)
+    finally:
+        if not connected:
+            ray.shutdown()
+
+
+def head_command(
+    head_node_ip: str,
+    port: str,
+    *,
+    dashboard_port: Optional[int] = None,
+    worker_ports: Sequence[int] = (),
+    temp_dir: Optional[str] = None,
+) -> list[str]:
+    """
+    Returns the command starting a Ray head node, with its dashboard on `dashboard_port`
+    (Ray's default otherwise) and its workers on the range of `worker_ports`, if given.
+    """
     cmd = [
-        "srun",
-        "--nodes=1",
-        "--ntasks=1",
-        "-w",
-        head_node,
         "ray",
         "start",
         "--head",
@@ -195,59 +387,147 @@ def create_nodes(
         "--block",
         "--include-dashboard=true",
         "--dashboard-host=0.0.0.0",
-        "--dashboard-port=8080",
     ]
+    if dashboard_port is not None:
+        cmd.append(f"--dashboard-port={dashboard_port}")
+    if worker_ports:
+        cmd += [f"--min-worker-port={min(worker_ports)}", f"--max-worker-port={max(worker_ports)}"]
 
     if temp_dir is not None:
         cmd.append(f"--temp-dir={temp_dir}")
+    return cmd
 
-    subprocess.Popen(cmd)
-    sleep(10)
-
-    # number of nodes other than the head node
-    num_nodes = len(nodes_array)
-
-    # launch worker nodes
-    for i in range(1, num_nodes):
-        node_i = nodes_array[i]
-        cmd_node = [
-            "srun",
-            "--nodes=1",
-            "--ntasks=1",
-            "-w",
-            node_i,
-            "ray",
-            "start",
-            "--address",
-            ip_head,
-            "--block",
-        ]
-
-        if temp_dir is not None:
-            cmd_node.append(f"--temp-dir={temp_dir}")
-
-        subprocess.Popen(cmd_node)
-        sleep(5)
-
-
-def create_cluster(temp_dir: Optional[str] = None) -> str:
-    """Creates a Ray cluster on SLURM and returns IP address of its head node."""
-    set_rlimit()
-    head_node, head_node_ip, port, nodes_array = setup_head_node()
-    create_nodes(
-        head_node=head_node,
-        head_node_ip=head_node_ip,
-        port=port,
-        nodes_array=nodes_array,
+
+def worker_command(
+    address: str, *, temp_dir: Optional[str] = None, ray_args: Sequence[str] = ()
+) -> list[str]:
+    """
+    Returns the command starting a Ray worker node that joins the cluster at `address`.
+    Use `ray_args` e.g. ``["--num-gpus=4"]`` to describe heterogeneous nodes.
+    """
+    cmd = ["ray", "start", "--address", address, "--block", *ray_args]
+
+    if temp_dir is not None:
+        cmd.append(f"--temp-dir={temp_dir}")
+    return cmd
+
+
+def create_nodes(
+    *,
+    head_node: str,
+    head_node_ip: str,
+    port: str,
+    nodes_array: list[str],
+    temp_dir: str = None,
+    timeout: float = 300,
+    launcher: Optional[Launcher] = None,
+    ports: Optional[PortReservation] = None,
+) -> dict[str, subprocess.Popen]:
+    """
+    Creates head + worker nodes. Workers are launched concurrently as soon as the head
+    node accepts connections, then this function waits for all nodes to register.
+
+    Parameters
+    ----------
+    head_node: str
+        Head node ID/name
+    head_node_ip: str
+        Valid IPv4 address of head node
+    port: str
+        Port number
+    nodes_array: Optional[list[str]], optional
+        List of all available nodes
+    temp_dir: Optional[str], optional
+        Path to use for temporary dir
+    timeout: float, optional
+        Max time (in seconds) to wait for each of the head node and the worker nodes
+        to be ready.
+    launcher: Launcher, optional
+        Launcher starting processes on the nodes. Defaults to :class:`SlurmLauncher`.
+    ports: PortReservation, optional
+        Reserved ports of the head node, see :func:`setup_head_node`, released right
+        before the head node starts. The URL of the dashboard, on the second port, is
+        logged once the head node is up.
+
+    Returns
+    -------
+    dict[str, subprocess.Popen]
+        The processes running each node, keyed by node name.
+
+    Raises
+    ------
+    RuntimeError
+        If any node process exits before joining the cluster, in which case all
+        launched node processes are terminated.
+    TimeoutError
+        If the nodes are not ready within `timeout` seconds.
+
+    """
+    ip_head = f"{head_node_ip}:{port}"
+
+    launcher = launcher or SlurmLauncher()
+
+    reserved = ports.ports if ports is not None else []
+    dashboard_port = reserved[1] if len(reserved) > 1 else None
+    cmd = head_command(
+        head_node_ip,
+        port,
+        dashboard_port=dashboard_port,
+        worker_ports=reserved[2:],
         temp_dir=temp_dir,
     )
+    if ports is not None:
+        ports.release()
+    procs = {head_node: launcher.launch(head_node, cmd)}
+    try:
+        wait_for_port(head_node_ip, port, timeout=timeout, proc=procs[head_node])
+        if dashboard_port is not None:
+            logger.info(
+                "Ray dashboard of %s at http://%s:%s", ip_head, head_node_ip, dashboard_port
+            )
+
+        # launch worker nodes concurrently
+        for node_i in nodes_array[1:]:
+            procs[node_i] = launcher.launch(node_i, worker_command(ip_head, temp_dir=temp_dir))
+
+        wait_for_nodes(ip_head, len(nodes_array), procs=procs, timeout=timeout)
+    except BaseException:
+        # do not leave a partial cluster behind
+        for proc in reversed(procs.values()):
+            terminate_process(proc)
+            proc.wait()
+        launcher.cleanup(temp_dir)
+        raise
+    return procs
+
+
+def create_cluster(temp_dir: Optional[str] = None, launcher: Optional[Launcher] = None) -> str:
+    """Creates a Ray cluster on SLURM and returns IP address of its head node. The URL of
+    its dashboard is logged, see :func:`create_nodes`."""
+    set_rlimit()
+    with reserve_head_ports() as ports:
+        head_node, head_node_ip, port, nodes_array = setup_head_node(launcher, ports=ports)
+        create_nodes(
+            launcher=launcher,
+            ports=ports,
+            head_node=head_node,
+            head_node_ip=head_node_ip,
+            port=port,
+            nodes_array=nodes_array,
+            temp_dir=temp_dir,
+        )
     assert validIPAddress(head_node_ip) != "Invalid"
     return head_node_ip
 
 
-def get_ray_res(keys: List[str]) -> List[Any]:
-    compute_resources = ray.cluster_resources()
-    return [compute_resources.get(key) for key in keys]
+def get_ray_res(keys: List[str], max_age: Optional[float] = None) -> List[Any]:
+    """
+    Returns the cluster totals of resources `keys` (None for missing resources) from the
+    cached snapshot of :func:`interop.utils.resources.get_resource_view`, refreshed when
+    older than `max_age` seconds (default: the view's TTL).
+    """
+    snapshot = get_resource_view().snapshot(max_age)
+    return [snapshot.total(key) for key in keys]
 
 
 def initialize_ray_res(exec_req: ExecReq, logger: Optional[logging.Logger] = None) -> None:
@@ -288,6 +568,7 @@ def initialize_ray(
     logger: Optional[logging.Logger] = None, exec_req: Optional[ExecReq] = None
 ) -> tuple[int, int]:
     if ray.is_initialized():
+        # reuse the existing connection
         if logger:
             logger.info("Ray already initialized. Nothing to do ...")
         return get_ray_res(["CPU", "GPU"])
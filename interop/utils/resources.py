@@ -0,0 +1,198 @@
+"""
+Provides a cached view of the resources of the Ray cluster the driver is connected to,
+so schedulers can make placement decisions without querying the GCS on every call.
+"""
+
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .lazy import LazyModule
+
+ray = LazyModule("ray")
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["NodeResources", "ResourceSnapshot", "ResourceView", "get_resource_view"]
+
+
+@dataclass(frozen=True)
+class NodeResources:
+    """Total and available resources (e.g. CPU, GPU, memory in bytes) of a node."""
+
+    node_id: str
+    total: Dict[str, float] = field(default_factory=dict)
+    available: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def cpus(self) -> float:
+        """Available CPUs."""
+        return self.available.get("CPU", 0.0)
+
+    @property
+    def gpus(self) -> float:
+        """Available GPUs."""
+        return self.available.get("GPU", 0.0)
+
+    @property
+    def memory(self) -> float:
+        """Available memory (in bytes)."""
+        return self.available.get("memory", 0.0)
+
+    def fits(self, request: Dict[str, float]) -> bool:
+        """Returns True if the node has enough available resources for `request`."""
+        return all(self.available.get(key, 0.0) >= amount for key, amount in request.items())
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """Resources of all live nodes at a point in time (``time.monotonic``)."""
+
+    nodes: Dict[str, NodeResources]
+    timestamp: float
+    address: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """Time (in seconds) since the snapshot was taken."""
+        return time.monotonic() - self.timestamp
+
+    def total(self, key: str) -> Optional[float]:
+        """Returns the cluster total of resource `key`, or None if no node has it."""
+        amounts = [node.total[key] for node in self.nodes.values() if key in node.total]
+        return sum(amounts) if amounts else None
+
+    def available(self, key: str) -> float:
+        """Returns the amount of resource `key` available in the cluster."""
+        return sum(node.available.get(key, 0.0) for node in self.nodes.values())
+
+    def fits(self, request: Dict[str, float]) -> List[str]:
+        """Returns the ids of the nodes that can fit `request` e.g. ``{"CPU": 4}``."""
+        return [node_id for node_id, node in self.nodes.items() if node.fits(request)]
+
+    def best_node(self, request: Dict[str, float]) -> Optional[str]:
+        """Returns the id of the node fitting `request` with the most available CPUs."""
+        node_ids = self.fits(request)
+        return max(node_ids, key=lambda node_id: self.nodes[node_id].cpus, default=None)
+
+
+class ResourceView:
+    """
+    Cached view of cluster resources. Snapshots older than `ttl` are refreshed on access,
+    or ahead of time by a background thread (see :meth:`start`), in which case reads never
+    wait on the GCS. A new snapshot is taken whenever the driver connects to another cluster.
+
+    Parameters
+    ----------
+    ttl: float, optional
+        Max age (in seconds) of a snapshot returned by :meth:`snapshot`. Default 5.
+
+    Examples
+    --------
+    >>> view = ResourceView(ttl=2).start()
+    >>> node_id = view.snapshot().best_node({"CPU": 4, "GPU": 1})
+
+    """
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._snapshot: Optional[ResourceSnapshot] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def snapshot(self, max_age: Optional[float] = None) -> ResourceSnapshot:
+        """Returns a snapshot at most `max_age` (default `ttl`) seconds old."""
+        max_age = self.ttl if max_age is None else max_age
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or snapshot.age > max_age
+            or snapshot.address != ray.get_runtime_context().gcs_address
+        ):
+            snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self) -> ResourceSnapshot:
+        """Queries the cluster resources and returns the new snapshot."""
+        with self._lock:
+            address = ray.get_runtime_context().gcs_address
+            totals = {node["NodeID"]: node["Resources"] for node in ray.nodes() if node["Alive"]}
+            available = _available_per_node(totals)
+            nodes = {
+                node_id: NodeResources(node_id, total, available.get(node_id, {}))
+                for node_id, total in totals.items()
+            }
+            self._snapshot = ResourceSnapshot(nodes, time.monotonic(), address)
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drops the current snapshot, e.g. after scheduling work."""
+        self._snapshot = None
+
+    def start(self, interval: Optional[float] = None) -> "ResourceView":
+        """Refreshes the snapshot every `interval` (default `ttl`) seconds in a daemon
+        thread, until :meth:`stop` is called or Ray is shut down. Failed refreshes are
+        logged and drop the snapshot, so that reads query the cluster instead."""
+        if self._refresher is not None and self._refresher.is_alive():
+            return self
+
+        interval = self.ttl if interval is None else interval
+
+        def run():
+            while not self._stop.wait(interval):
+                if not ray.is_initialized():
+                    return
+                try:
+                    self.refresh()
+                except Exception:
+                    # reads query the GCS directly until a refresh succeeds
+                    logger.exception("Failed to refresh the cluster resources.")
+                    self.invalidate()
+
+        self._stop.clear()
+        self.refresh()
+        self._refresher = threading.Thread(target=run, name="ResourceView", daemon=True)
+        self._refresher.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops background refreshes."""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+
+def _available_per_node(totals: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    # Ray has no public API for per node availability, so it falls back to the cluster
+    # availability, split between nodes in proportion to their totals
+    try:
+        from ray._private import state
+
+        return state.available_resources_per_node()
+    except (ImportError, AttributeError):
+        logger.debug("Per node resources unavailable, estimated from cluster resources.")
+
+    cluster_total: Dict[str, float] = {}
+    for total in totals.values():
+        for key, amount in total.items():
+            cluster_total[key] = cluster_total.get(key, 0.0) + amount
+    available = ray.available_resources()
+    return {
+        node_id: {
+            key: amount * available.get(key, 0.0) / cluster_total[key]
+            for key, amount in total.items()
+            if cluster_total[key]
+        }
+        for node_id, total in totals.items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_resource_view() -> ResourceView:
+    """Returns the default per-process resource view."""
+    return ResourceView()
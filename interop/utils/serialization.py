@@ -4,20 +4,27 @@ Adopted from https://github.com/MolSSI/cmselemental
 """
 
 import json
+import sys
 from typing import Any, Dict, Optional, Union
 
-import numpy
 from pydantic.json import pydantic_encoder
 
+from .blob import Blob
+
 
 class JSONArrayEncoder(json.JSONEncoder):  # pragma: no cover
     def default(self, obj: Any) -> Any:
+        if isinstance(obj, Blob):
+            return obj.to_json()
+
         try:
             return pydantic_encoder(obj)
         except TypeError:
             pass
 
-        if isinstance(obj, numpy.ndarray):
+        # obj cannot be an array unless numpy was imported
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(obj, numpy.ndarray):
             if obj.shape:
                 return obj.ravel().tolist()
             else: